@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+"""
+Measure how many events are left and how long it takes to consume one second
+of input from an 8 kHz mouse, read with and without motion coalescing. The
+events are fed through a pipe, so no device is needed.
+
+    python benchmarks/bench_coalesce.py [window_ms]
+"""
+
+import os
+import struct
+import sys
+import time
+
+from evdev import ecodes
+from evdev.eventio import EventIO
+
+RATE = 8000
+
+
+class PipeIO(EventIO):
+    def __init__(self):
+        self.fd, self.wfd = os.pipe()
+        os.set_blocking(self.fd, False)
+
+
+def mouse_second():
+    # REL_X/REL_Y pairs at 8 kHz with a click every 100 ms.
+    pack = struct.Struct("llHHi").pack
+    events = []
+    for i in range(RATE):
+        usec = i * 1000000 // RATE
+        events.append(pack(0, usec, ecodes.EV_REL, ecodes.REL_X, 1))
+        events.append(pack(0, usec, ecodes.EV_REL, ecodes.REL_Y, -1))
+        if i % (RATE // 10) == 0:
+            events.append(pack(0, usec, ecodes.EV_KEY, ecodes.BTN_LEFT, 1))
+        events.append(pack(0, usec, ecodes.EV_SYN, ecodes.SYN_REPORT, 0))
+    return b"".join(events)
+
+
+def run(data, name, coalesce):
+    io = PipeIO()
+    got = 0
+    elapsed = 0.0
+    # Feed the pipe in chunks that fit in its buffer.
+    chunk = 48 * 1024
+    for offset in range(0, len(data), chunk):
+        os.write(io.wfd, data[offset : offset + chunk])
+        start = time.perf_counter()
+        for event in io.read(max_events=1024, drain=True, coalesce=coalesce):
+            got += 1
+        elapsed += time.perf_counter() - start
+    os.close(io.fd)
+    os.close(io.wfd)
+    print(f"{name:>24}: {got:8} events {elapsed * 1000:8.2f} ms")
+
+
+def main(window_ms):
+    data = mouse_second()
+    run(data, "no coalescing", None)
+    run(data, "within frames", 0)
+    run(data, f"{window_ms} ms window", window_ms / 1000)
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 8)
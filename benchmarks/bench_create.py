@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+"""
+Measure how long it takes to create and destroy uinput devices, enabling
+their capabilities one code at a time from Python (as UInput used to) and
+with the single _uinput.enable_events() call that UInput makes now. Needs
+write access to /dev/uinput.
+
+    python benchmarks/bench_create.py [num_devices]
+"""
+
+import sys
+import time
+
+from evdev import _uinput, ecodes
+
+KEYBOARD = {ecodes.EV_KEY: list(ecodes.keys), ecodes.EV_REP: [], ecodes.EV_MSC: [ecodes.MSC_SCAN]}
+MOUSE = {ecodes.EV_KEY: [ecodes.BTN_LEFT, ecodes.BTN_RIGHT, ecodes.BTN_MIDDLE], ecodes.EV_REL: [0, 1, 8]}
+
+
+def per_code(fd, events):
+    for etype, codes in events.items():
+        if not codes:
+            _uinput.enable_type(fd, etype)
+        for code in codes:
+            _uinput.enable(fd, etype, code)
+
+
+def bulk(fd, events):
+    _uinput.enable_events(fd, events)
+
+
+def run(name, events, enable, count):
+    start = time.perf_counter()
+    for i in range(count):
+        fd = _uinput.open("/dev/uinput")
+        enable(fd, events)
+        _uinput.setup(fd, f"py-evdev-bench-{i}", 1, 1, 1, ecodes.BUS_USB, [], 0)
+        _uinput.create(fd)
+        _uinput.close(fd)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>24}: {elapsed / count * 1000:8.3f} ms/device")
+
+
+def main(count):
+    for label, events in ("keyboard", KEYBOARD), ("mouse", MOUSE):
+        run(f"{label}, per code", events, per_code, count)
+        run(f"{label}, bulk", events, bulk, count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+"""
+Measure how fast evemu event logs are converted to and from packed events by
+evdev.evemu, against splitting and formatting lines in Python.
+
+    python benchmarks/bench_evemu.py [num_events]
+"""
+
+import io
+import struct
+import sys
+import time
+
+from evdev import ecodes, evemu
+from evdev.eventio import EventBatch
+
+event_struct = struct.Struct("llHHi")
+
+
+def make_batch(count):
+    # A touchpad reporting at 125 Hz.
+    events = []
+    for i in range(count // 3):
+        sec, usec = divmod(i * 8000, 1000000)
+        events.append(event_struct.pack(sec, usec, ecodes.EV_ABS, ecodes.ABS_X, 3000 + i % 500))
+        events.append(event_struct.pack(sec, usec, ecodes.EV_ABS, ecodes.ABS_Y, 2000 - i % 300))
+        events.append(event_struct.pack(sec, usec, ecodes.EV_SYN, ecodes.SYN_REPORT, 0))
+    return EventBatch(b"".join(events))
+
+
+def format_python(batch):
+    return "".join("E: %d.%06d %04x %04x %d\n" % (e.sec, e.usec, e.type, e.code, e.value) for e in batch).encode()
+
+
+def parse_python(text):
+    pack = event_struct.pack
+    events = []
+    for line in text.splitlines():
+        if line.startswith(b"E:"):
+            _, time, etype, code, value = line.split()[:5]
+            sec, usec = time.split(b".")
+            events.append(pack(int(sec), int(usec), int(etype, 16), int(code, 16), int(value)))
+    return b"".join(events)
+
+
+def timed(name, func, size):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>16}: {elapsed * 1000:10.2f} ms {size / elapsed / 1e6:10.1f} MB/s of text")
+    return result
+
+
+def main(count):
+    batch = make_batch(count)
+    text = format_python(batch)
+    print(f"{count} events, {len(text) / 1e6:.1f} MB of text")
+
+    timed("python format", lambda: format_python(batch), len(text))
+    output = io.BytesIO()
+    timed("evemu format", lambda: evemu.write_events(output, batch), len(text))
+    assert output.getvalue() == text
+
+    timed("python parse", lambda: parse_python(text), len(text))
+    batches = timed("evemu parse", lambda: list(evemu.read_events(io.BytesIO(text))), len(text))
+    assert b"".join(bytes(batch) for batch in batches) == bytes(batch)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3_000_000)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""
+Compare a consumer that only cares about key presses reading every event of
+a busy device against one that masks out the rest with set_event_mask().
+Needs write access to /dev/uinput.
+
+    python benchmarks/bench_mask.py [num_frames]
+"""
+
+import sys
+import time
+from select import select
+
+from evdev import InputDevice, UInput, ecodes
+
+
+def inject(ui, count):
+    # A frame of pointer motion with a scancode, and a key press every 16 frames.
+    for i in range(count):
+        ui.write(ecodes.EV_MSC, ecodes.MSC_SCAN, i)
+        ui.write(ecodes.EV_REL, ecodes.REL_X, 1)
+        if i % 16 == 0:
+            ui.write(ecodes.EV_KEY, ecodes.KEY_A, 1)
+            ui.write(ecodes.EV_KEY, ecodes.KEY_A, 0)
+        ui.syn()
+
+
+def consume(device):
+    reads = keys = 0
+    while select([device], [], [], 0.1)[0]:
+        batch = device.read_batch()
+        reads += 1
+        keys += batch.types.count(ecodes.EV_KEY)
+    return reads, keys
+
+
+def run(ui, device, count, name):
+    # Inject and consume in chunks that fit in the kernel event queue.
+    chunk = 64
+    elapsed = 0.0
+    reads = keys = 0
+    for _ in range(count // chunk):
+        inject(ui, chunk)
+        start = time.perf_counter()
+        r, k = consume(device)
+        # Leave out the final select() that waited for the timeout.
+        elapsed += time.perf_counter() - start - 0.1
+        reads += r
+        keys += k
+    print(f"{name:>10}: {keys} key events in {reads} reads, {elapsed * 1000:8.2f} ms")
+
+
+def main(count):
+    caps = {
+        ecodes.EV_KEY: [ecodes.KEY_A],
+        ecodes.EV_REL: [ecodes.REL_X],
+        ecodes.EV_MSC: [ecodes.MSC_SCAN],
+    }
+    with UInput(caps, name="py-evdev-bench") as ui:
+        time.sleep(0.5)
+        device = InputDevice(ui.device.path)
+        try:
+            run(ui, device, count, "unmasked")
+            device.set_event_mask({ecodes.EV_KEY: None})
+            run(ui, device, count, "masked")
+        finally:
+            device.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8192)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""
+Compare reading from many devices with evdev.merge() against one
+async_read_loop() task per device feeding an asyncio.Queue. Needs write
+access to /dev/uinput.
+
+    python benchmarks/bench_merge.py [num_devices] [events_per_device]
+"""
+
+import asyncio
+import sys
+import time
+
+from evdev import UInput, ecodes, merge
+
+
+def inject(uinputs, count):
+    # Alternate REL_X moves and SYN_REPORTs, which the kernel will not filter
+    # out as duplicates the way it would repeated key presses.
+    for i in range(count // 2):
+        for ui in uinputs:
+            ui.write(ecodes.EV_REL, ecodes.REL_X, 1)
+            ui.syn()
+
+
+async def read_tasks(devices, total):
+    queue = asyncio.Queue()
+
+    async def forward(device):
+        async for event in device.async_read_loop():
+            queue.put_nowait((device, event))
+
+    tasks = [asyncio.create_task(forward(device)) for device in devices]
+    got = 0
+    while got < total:
+        await queue.get()
+        got += 1
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def read_merged(devices, total):
+    merged = merge(devices)
+    got = 0
+    async for device, batch in merged:
+        got += len(batch)
+        if got >= total:
+            break
+    merged.close()
+
+
+def run(uinputs, devices, count, name, read):
+    # Inject and consume in chunks that fit in the kernel event queue.
+    chunk = 256
+    elapsed = 0.0
+    for _ in range(count // chunk):
+        inject(uinputs, chunk)
+        start = time.perf_counter()
+        asyncio.run(read(devices, chunk * len(devices)))
+        elapsed += time.perf_counter() - start
+    total = count // chunk * chunk * len(devices)
+    print(f"{name:>16}: {total / elapsed:12.0f} events/s")
+
+
+def main(num_devices, count):
+    caps = {ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y], ecodes.EV_KEY: [ecodes.BTN_LEFT]}
+    uinputs = [UInput(caps, name=f"py-evdev-bench-{i}") for i in range(num_devices)]
+    try:
+        time.sleep(0.5)
+        devices = [ui.device for ui in uinputs]
+        print(f"{num_devices} devices")
+        run(uinputs, devices, count, "task per device", read_tasks)
+        run(uinputs, devices, count, "merge()", read_merged)
+    finally:
+        for ui in uinputs:
+            ui.close()
+
+
+if __name__ == "__main__":
+    num_devices = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    main(num_devices, int(sys.argv[2]) if len(sys.argv) > 2 else 10_240)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+"""
+Compare the throughput of the different read paths on a uinput loopback
+device. Needs write access to /dev/uinput.
+
+    python benchmarks/bench_read.py [num_events]
+"""
+
+import sys
+import time
+from select import select
+
+from evdev import UInput, ecodes
+from evdev.eventio import EVENT_SIZE
+
+
+BATCH = 64
+
+
+def inject(ui, count):
+    # Alternate REL_X moves and SYN_REPORTs, which the kernel will not filter
+    # out as duplicates the way it would repeated key presses.
+    for i in range(count // 2):
+        ui.write(ecodes.EV_REL, ecodes.REL_X, 1)
+        ui.syn()
+
+
+def consume(device, count, read):
+    got = 0
+    while got < count:
+        select([device], [], [])
+        got += read(device)
+
+
+def read_objects(device):
+    return len(list(device.read()))
+
+
+def read_into(device, buffer=bytearray(EVENT_SIZE * BATCH)):
+    return device.read_into(buffer)
+
+
+def read_array(device):
+    return len(device.read_array(BATCH))
+
+
+def run(ui, count, name, read):
+    # Inject and consume in chunks that fit in the kernel event queue.
+    chunk = 512
+    elapsed = 0.0
+    for _ in range(count // chunk):
+        inject(ui, chunk)
+        start = time.perf_counter()
+        consume(ui.device, chunk, read)
+        elapsed += time.perf_counter() - start
+    print(f"{name:>12}: {count / elapsed:12.0f} events/s")
+
+
+def main(count):
+    caps = {ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y], ecodes.EV_KEY: [ecodes.BTN_LEFT]}
+    with UInput(caps, name="py-evdev-bench") as ui:
+        time.sleep(0.5)
+        run(ui, count, "read()", read_objects)
+        run(ui, count, "read_into()", read_into)
+        try:
+            run(ui, count, "read_array()", read_array)
+        except ImportError:
+            print("read_array(): numpy is not installed")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
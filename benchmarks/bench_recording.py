@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Compare storing a recording of events by pickling InputEvent objects against
+the evdev.recording format in its raw and delta encodings, in file size and in
+the time it takes to write the file, open it and sum the values of its events.
+The delta encoded recording is also decoded block by block, to show how much
+faster than real time it can be replayed.
+
+    python benchmarks/bench_recording.py [num_events]
+"""
+
+import math
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import time
+
+from evdev import ecodes
+from evdev.device import DeviceInfo
+from evdev.eventio import EventBatch
+from evdev.recording import DeviceDescription, Recording, RecordingWriter
+
+description = DeviceDescription("bench", "", "", DeviceInfo(3, 1, 1, 1), {ecodes.EV_REL: [0, 1]}, {}, [])
+
+
+def make_batch(count):
+    # A mouse at 1 kHz, moving in a slow circle.
+    pack = struct.Struct("llHHi").pack
+    events = []
+    for i in range(count // 3):
+        sec, usec = divmod(i * 1000, 1000000)
+        events.append(pack(sec, usec, ecodes.EV_REL, ecodes.REL_X, round(8 * math.cos(i / 500))))
+        events.append(pack(sec, usec, ecodes.EV_REL, ecodes.REL_Y, round(8 * math.sin(i / 500))))
+        events.append(pack(sec, usec, ecodes.EV_SYN, ecodes.SYN_REPORT, 0))
+    return EventBatch(b"".join(events))
+
+
+def timed(name, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{name:>24}: {(time.perf_counter() - start) * 1000:10.2f} ms")
+    return result
+
+
+def main(count):
+    batch = make_batch(count)
+    events = list(batch)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickled = os.path.join(tmp, "session.pickle")
+        recorded = os.path.join(tmp, "session.evrec")
+        compressed = os.path.join(tmp, "session-delta.evrec")
+
+        def write_pickle():
+            with open(pickled, "wb") as file:
+                pickle.dump(events, file, pickle.HIGHEST_PROTOCOL)
+
+        def read_pickle():
+            with open(pickled, "rb") as file:
+                return sum(event.value for event in pickle.load(file))
+
+        def write_recording():
+            with RecordingWriter(recorded, description) as writer:
+                writer.write(batch)
+
+        def read_recording():
+            with Recording(recorded) as recording:
+                return sum(recording.events.values)
+
+        def write_delta():
+            with RecordingWriter(compressed, description, encoding="delta") as writer:
+                writer.write(batch)
+
+        def read_delta():
+            with Recording(compressed) as recording:
+                return sum(recording.events.values)
+
+        def decode_delta():
+            with Recording(compressed) as recording:
+                return sum(len(events) for events in recording.batches())
+
+        timed("pickle write", write_pickle)
+        timed("pickle read", read_pickle)
+        timed("recording write", write_recording)
+        timed("recording read", read_recording)
+        timed("delta write", write_delta)
+        timed("delta read", read_delta)
+
+        start = time.perf_counter()
+        decode_delta()
+        elapsed = time.perf_counter() - start
+        duration = batch[-1].timestamp() - batch[0].timestamp()
+        print(f"{'delta decode':>24}: {len(batch) / elapsed:10.0f} events/s, {duration / elapsed:.0f}x real time")
+
+        raw_size = os.path.getsize(recorded)
+        print(f"{'pickle size':>24}: {os.path.getsize(pickled):10} bytes")
+        print(f"{'recording size':>24}: {raw_size:10} bytes")
+        delta_size = os.path.getsize(compressed)
+        print(f"{'delta size':>24}: {delta_size:10} bytes ({raw_size / delta_size:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+Compare replaying two seconds of 1 kHz mouse input with time.sleep() between
+per-event writes against evdev.replay, in how late the frames are written.
+The events are written to a pipe, so no device is needed.
+
+    python benchmarks/bench_replay.py [seconds]
+"""
+
+import os
+import sys
+import threading
+import time
+
+from evdev import _uinput, ecodes
+from evdev.eventio import EventIO
+from evdev.events import InputEvent
+from evdev.replay import replay
+
+RATE = 1000
+
+
+class PipeIO(EventIO):
+    def __init__(self):
+        self.rfd, self.fd = os.pipe()
+        # Keep the pipe from filling up.
+        self.reader = threading.Thread(target=self.drain, daemon=True)
+        self.reader.start()
+
+    def drain(self):
+        while os.read(self.rfd, 65536):
+            pass
+
+
+def mouse(seconds):
+    for i in range(seconds * RATE):
+        sec, usec = divmod(i * 1000000 // RATE, 1000000)
+        yield InputEvent(sec, usec, ecodes.EV_REL, ecodes.REL_X, 1)
+        yield InputEvent(sec, usec, ecodes.EV_REL, ecodes.REL_Y, -1)
+        yield InputEvent(sec, usec, ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+
+
+def replay_sleep(io, events):
+    # The naive approach: sleep for the gap between frames, then write.
+    lateness = []
+    start = time.monotonic_ns()
+    previous = None
+    for event in events:
+        if event.type == ecodes.EV_SYN:
+            lateness.append(time.monotonic_ns() - start - event.timestamp_ns())
+        ns = event.timestamp_ns()
+        if previous is not None and ns > previous:
+            time.sleep((ns - previous) / 1e9)
+        previous = ns
+        _uinput.write(io.fd, event.type, event.code, event.value)
+    lateness.sort()
+    return lateness[len(lateness) // 2], lateness[len(lateness) * 99 // 100], lateness[-1]
+
+
+def main(seconds):
+    io = PipeIO()
+    events = list(mouse(seconds))
+
+    p50, p99, worst = replay_sleep(io, events)
+    print(f"{'time.sleep()':>16}: p50 {p50 / 1000:10.1f} us  p99 {p99 / 1000:10.1f} us  max {worst / 1000:10.1f} us")
+
+    stats = replay(io, events)
+    p50, p99, worst = stats.lateness_p50_ns, stats.lateness_p99_ns, stats.lateness_max_ns
+    print(f"{'replay()':>16}: p50 {p50 / 1000:10.1f} us  p99 {p99 / 1000:10.1f} us  max {worst / 1000:10.1f} us")
+
+    stats = replay(io, events, speed=None)
+    print(f"{'replay(None)':>16}: {stats.events / stats.duration:12.0f} events/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+"""
+Measure how the throughput of DeviceReader scales with the number of worker
+threads, with events injected into several uinput devices from a separate
+thread, and how the throughput of writing to one shared uinput device scales
+with the number of writer threads. Needs write access to /dev/uinput.
+
+    python benchmarks/bench_threads.py [num_devices] [events_per_device]
+"""
+
+import sys
+import threading
+import time
+
+from evdev import UInput, ecodes
+from evdev.reader import DeviceReader
+
+
+def inject(uinputs, count):
+    # Alternate REL_X moves and SYN_REPORTs, which the kernel will not filter
+    # out as duplicates the way it would repeated key presses.
+    for i in range(count // 2):
+        for ui in uinputs:
+            ui.write(ecodes.EV_REL, ecodes.REL_X, 1)
+            ui.syn()
+
+
+def run(uinputs, count, workers):
+    total = count // 2 * 2 * len(uinputs)
+    got = 0
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def handle(device, batch):
+        nonlocal got
+        # Look at every event, as a consumer that filters or forwards would.
+        count = len(batch.codes)
+        with lock:
+            got += count
+            if got >= total:
+                done.set()
+
+    devices = [ui.device for ui in uinputs]
+    with DeviceReader(devices, handle, workers=workers):
+        start = time.perf_counter()
+        injector = threading.Thread(target=inject, args=(uinputs, count))
+        injector.start()
+        injector.join()
+        done.wait(10)
+        elapsed = time.perf_counter() - start
+
+    print(f"{workers:>3} workers: {got / elapsed:12.0f} events/s")
+
+
+def run_writers(ui, count, writers):
+    def write():
+        for i in range(count // 2):
+            ui.write(ecodes.EV_REL, ecodes.REL_X, 1)
+            ui.syn()
+
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # The device is not read from, so let the kernel discard the events.
+    print(f"{writers:>3} writers: {count // 2 * 2 * writers / elapsed:12.0f} events/s")
+
+
+def main(num_devices, count):
+    caps = {ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y], ecodes.EV_KEY: [ecodes.BTN_LEFT]}
+    uinputs = [UInput(caps, name=f"py-evdev-bench-{i}") for i in range(num_devices)]
+    try:
+        time.sleep(0.5)
+        gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+        print(f"{num_devices} devices, GIL {'enabled' if gil else 'disabled'}")
+        workers = 1
+        while workers <= num_devices:
+            run(uinputs, count, workers)
+            workers *= 2
+
+        writers = 1
+        while writers <= num_devices:
+            run_writers(uinputs[0], count * 20, writers)
+            writers *= 2
+    finally:
+        for ui in uinputs:
+            ui.close()
+
+
+if __name__ == "__main__":
+    num_devices = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    main(num_devices, int(sys.argv[2]) if len(sys.argv) > 2 else 512)
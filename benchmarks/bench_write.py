@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+"""
+Measure the per-event overhead of injecting events with EventIO.write(),
+write_many() and write_frame(). The events are written to /dev/null, which
+leaves only the cost of getting them from Python to the write() syscall, so
+no uinput device is needed.
+
+    python benchmarks/bench_write.py [num_events]
+"""
+
+import os
+import sys
+import time
+
+from evdev import ecodes
+from evdev.eventio import EventIO
+
+
+class NullIO(EventIO):
+    def __init__(self):
+        self.fd = os.open("/dev/null", os.O_RDWR)
+        self.path = "/dev/null"
+        self.writable = True
+
+
+def timed(name, count, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>24}: {count / elapsed:12.0f} events/s {elapsed / count * 1e9:8.0f} ns/event")
+
+
+def main(count):
+    io = NullIO()
+    write = io.write
+
+    def taps():
+        # A key tap - down, SYN, up, SYN - one event at a time.
+        for i in range(count // 4):
+            write(ecodes.EV_KEY, ecodes.KEY_A, 1)
+            write(ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+            write(ecodes.EV_KEY, ecodes.KEY_A, 0)
+            write(ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+
+    down, up = [(ecodes.EV_KEY, ecodes.KEY_A, 1)], [(ecodes.EV_KEY, ecodes.KEY_A, 0)]
+    tap = down + [(ecodes.EV_SYN, ecodes.SYN_REPORT, 0)] + up + [(ecodes.EV_SYN, ecodes.SYN_REPORT, 0)]
+
+    def frames():
+        for i in range(count // 4):
+            io.write_frame(down)
+            io.write_frame(up)
+
+    def many():
+        for i in range(count // 4):
+            io.write_many(tap)
+
+    timed("write()", count, taps)
+    if hasattr(io, "write_frame"):
+        timed("write_frame()", count, frames)
+        timed("write_many()", count, many)
+    os.close(io.fd)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
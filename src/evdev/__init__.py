@@ -17,6 +17,20 @@ from .device import (
     InputDevice as InputDevice,
 )
 
+from .deviceset import (
+    DeviceSet as DeviceSet,
+)
+
+from .eventio import (
+    EventBatch as EventBatch,
+    EventDispatcher as EventDispatcher,
+    EventFilter as EventFilter,
+)
+
+from .eventio_async import (
+    merge as merge,
+)
+
 from .events import (
     AbsEvent as AbsEvent,
     InputEvent as InputEvent,
@@ -26,6 +40,14 @@ from .events import (
     event_factory as event_factory,
 )
 
+from .reader import (
+    DeviceReader as DeviceReader,
+)
+
+from .state import (
+    DeviceState as DeviceState,
+)
+
 from .uinput import (
     UInput as UInput,
     UInputError as UInputError,
@@ -1,8 +1,13 @@
 import contextlib
 import os
-from typing import Generic, Iterator, Literal, NamedTuple, TypeVar, overload
+import threading
+import time
+from typing import Generic, Iterable, Iterator, Literal, NamedTuple, TypeVar, overload
 
 from . import _input, ecodes, ff, util
+from .eventio import EVENT_SIZE, EventBatch, EventFilter, pack_events
+from .events import InputEvent
+from .state import DeviceState
 
 try:
     from .eventio_async import EvdevError, EventIO
@@ -11,6 +16,26 @@ except ImportError:
 
 _AnyStr = TypeVar("_AnyStr", str, bytes)
 
+# The clocks that the kernel can timestamp events with (see EVIOCSCLOCKID).
+_CLOCKS = {
+    "realtime": time.CLOCK_REALTIME,
+    "monotonic": time.CLOCK_MONOTONIC,
+    "boottime": time.CLOCK_BOOTTIME,
+}
+
+
+# The event types whose codes can be masked with EVIOCSMASK.
+_MASK_TYPES = (
+    ecodes.EV_KEY,
+    ecodes.EV_REL,
+    ecodes.EV_ABS,
+    ecodes.EV_MSC,
+    ecodes.EV_SW,
+    ecodes.EV_LED,
+    ecodes.EV_SND,
+    ecodes.EV_FF,
+)
+
 
 class AbsInfo(NamedTuple):
     """Absolute axis information.
@@ -107,9 +132,33 @@ class InputDevice(EventIO, Generic[_AnyStr]):
     A linux input device from which input events can be read.
     """
 
-    __slots__ = ("path", "fd", "info", "name", "phys", "uniq", "_rawcapabilities", "version", "ff_effects_count")
-
-    def __init__(self, dev: _AnyStr | os.PathLike[_AnyStr], readonly: bool = False):
+    __slots__ = (
+        "path",
+        "fd",
+        "info",
+        "name",
+        "phys",
+        "uniq",
+        "_rawcapabilities",
+        "version",
+        "ff_effects_count",
+        "state",
+        "clock",
+        "writable",
+        "_resync",
+        "_absinfo",
+        "_lock",
+        "_pending",
+    )
+
+    def __init__(
+        self,
+        dev: _AnyStr | os.PathLike[_AnyStr],
+        readonly: bool = False,
+        resync: bool = False,
+        track_state: bool = False,
+        clock: str | int | None = None,
+    ):
         """
         Arguments
         ---------
@@ -117,6 +166,22 @@ class InputDevice(EventIO, Generic[_AnyStr]):
           Path to input device
         readonly : bool
           Open in read-only mode (``O_RDONLY``) without attempting ``O_RDWR`` first.
+        resync : bool
+          Recover from ``SYN_DROPPED`` automatically. Events that follow a
+          ``SYN_DROPPED`` are discarded and replaced by synthetic events that
+          bring the key, LED, switch, absolute axis and multitouch slot state
+          up to date, as libevdev does. Applies to all read methods and
+          their async variants.
+        track_state : bool
+          Keep a :class:`DeviceState <evdev.state.DeviceState>` in :attr:`state`
+          that is updated from the events as they are read. :func:`active_keys()`,
+          :func:`leds()` and :func:`absinfo()` are then answered from it without
+          issuing ioctls. The state is loaded from the kernel when the device
+          is opened and reloaded after a ``SYN_DROPPED``. Implied by ``resync``.
+        clock : str|int|None
+          The clock to timestamp events with - ``"realtime"`` (the kernel's
+          default), ``"monotonic"``, ``"boottime"`` or a ``time.CLOCK_*``
+          constant. See :func:`set_clock()`.
         """
 
         #: Path to input device.
@@ -128,12 +193,25 @@ class InputDevice(EventIO, Generic[_AnyStr]):
             if readonly:
                 raise OSError
             fd = os.open(dev, os.O_RDWR | os.O_NONBLOCK)
+            writable = True
         except OSError:
             fd = os.open(dev, os.O_RDONLY | os.O_NONBLOCK)
+            writable = False
 
         #: A non-blocking file descriptor to the device file.
         self.fd: int = fd
 
+        #: Whether the device was opened in read-write mode, which :func:`write()`
+        #: and :func:`set_led()` require.
+        self.writable: bool = writable
+
+        #: The ``time.CLOCK_*`` clock that events are timestamped with.
+        self.clock: int = time.CLOCK_REALTIME
+
+        if clock is not None:
+            # Switch clocks before any events are queued, which would be discarded.
+            self.set_clock(clock)
+
         # Returns (bustype, vendor, product, version, name, phys, capabilities).
         info_res = _input.ioctl_devinfo(self.fd)
 
@@ -158,6 +236,29 @@ class InputDevice(EventIO, Generic[_AnyStr]):
         #: The number of force feedback effects the device can keep in its memory.
         self.ff_effects_count = _input.ioctl_EVIOCGEFFECTS(self.fd)
 
+        # Keeps reads and the state updates that follow them in order when the
+        # device is shared between threads.
+        self._lock = threading.Lock()
+
+        #: A :class:`DeviceState <evdev.state.DeviceState>` mirroring the state of
+        #: the device if it was opened with ``track_state`` or ``resync``, otherwise ``None``.
+        self.state: DeviceState | None = None
+
+        # Whether the events that follow a SYN_DROPPED are replaced with the
+        # changes in state that they would have described.
+        self._resync = resync
+
+        # The events of a tracked read that did not fit into what the caller
+        # asked for, such as the synthetic events of a resync read with read_one().
+        self._pending: EventBatch | None = None
+
+        # The limits of the absolute axes, which are only refreshed by set_absinfo().
+        self._absinfo: dict[int, AbsInfo] = {}
+
+        if resync or track_state:
+            self.state = DeviceState.from_device(self)
+            self._absinfo = dict(self._capabilities(absinfo=True).get(ecodes.EV_ABS, []))
+
     def __del__(self) -> None:
         if hasattr(self, "fd") and self.fd is not None:
             try:
@@ -165,6 +266,95 @@ class InputDevice(EventIO, Generic[_AnyStr]):
             except (OSError, ImportError, AttributeError):
                 pass
 
+    def read_batch(
+        self,
+        max_events: int = 64,
+        drain: bool = False,
+        filter: EventFilter | None = None,
+        coalesce: float | None = None,
+    ) -> EventBatch:
+        if self.state is None:
+            return super().read_batch(max_events, drain, filter, coalesce)
+
+        # The state has to see every event, so filter only once it is updated.
+        with self._lock:
+            batch = self._read_batch_tracked(max_events, drain)
+        if filter is not None:
+            batch = filter.apply(batch)
+        if coalesce is not None:
+            batch = _input.coalesce(batch, coalesce)
+        return batch
+
+    def read_one(self) -> InputEvent | None:
+        if self.state is None:
+            return super().read_one()
+
+        with self._lock:
+            try:
+                batch = self._read_batch_tracked(1, False)
+            except BlockingIOError:
+                return None
+            if len(batch) > 1:
+                self._pending = batch[1:]
+        return batch[0]
+
+    def read_frames(self, max_events: int = 64, drain: bool = False) -> Iterator[EventBatch]:
+        if self.state is None:
+            yield from super().read_frames(max_events, drain)
+            return
+
+        with self._lock:
+            batch = self._read_batch_tracked(max_events, drain)
+            frames, self._partial_frame = _input.split_frames(batch, self._partial_frame)
+        yield from frames
+
+    def read_into(self, buffer) -> int:
+        if self.state is None:
+            return super().read_into(buffer)
+
+        view = memoryview(buffer).cast("B")
+        max_events = len(view) // EVENT_SIZE
+        if max_events == 0:
+            raise ValueError("buffer is too small to hold an input event")
+
+        with self._lock:
+            batch = self._read_batch_tracked(max_events, False)
+            if len(batch) > max_events:
+                batch, self._pending = batch[:max_events], batch[max_events:]
+        view[: len(batch) * EVENT_SIZE] = batch
+        return len(batch)
+
+    def _read_batch_tracked(self, max_events: int, drain: bool) -> EventBatch:
+        # Events that were read and tracked but not returned come first.
+        if self._pending is not None:
+            batch, self._pending = self._pending[:max_events], self._pending[max_events:]
+            if not len(self._pending):
+                self._pending = None
+            return batch
+
+        batch = super().read_batch(max_events, drain)
+        index = self.state.update_batch(batch)
+        if index is None:
+            return batch
+
+        if not self._resync:
+            # The rest of the batch predates the state reported by the kernel.
+            self.state.load(self.fd)
+            return batch
+
+        # The events that follow a SYN_DROPPED, including those still queued
+        # in the kernel, describe an incomplete state. Discard them and report
+        # the difference to the actual state of the device in their place.
+        try:
+            _input.device_read_batch(self.fd, max_events, True)
+        except BlockingIOError:
+            pass
+
+        dropped = batch[index]
+        changes = self.state.sync(self.fd)
+        changes.append((ecodes.EV_SYN, ecodes.SYN_REPORT, 0))
+        return EventBatch(bytes(batch[: index + 1]) + bytes(pack_events(changes, dropped.sec, dropped.usec)))
+
     def _capabilities(self, absinfo: bool = True):
         res = {}
 
@@ -272,7 +462,10 @@ class InputDevice(EventIO, Generic[_AnyStr]):
         [('LED_NUML', 0), ('LED_CAPSL', 1), ('LED_MISC', 8), ('LED_MAIL', 9)]
 
         """
-        leds = _input.ioctl_EVIOCG_bits(self.fd, ecodes.EV_LED)
+        if self.state is not None:
+            leds = self.state.active(ecodes.EV_LED)
+        else:
+            leds = _input.ioctl_EVIOCG_bits(self.fd, ecodes.EV_LED)
         if verbose:
             return util.resolve_ecodes(ecodes.LED, leds)
 
@@ -313,6 +506,110 @@ class InputDevice(EventIO, Generic[_AnyStr]):
             finally:
                 self.fd = -1
 
+    def set_clock(self, clock: str | int) -> None:
+        """
+        Select the clock that the kernel timestamps events with using
+        ``EVIOCSCLOCKID``. ``clock`` is ``"realtime"``, ``"monotonic"``,
+        ``"boottime"`` or one of the corresponding ``time.CLOCK_*`` constants.
+
+        Timestamps from the default realtime clock jump when the system time
+        is adjusted. Those from the monotonic clock can be compared with
+        :func:`time.monotonic_ns` and those from the boottime clock with
+        ``time.clock_gettime_ns(time.CLOCK_BOOTTIME)``.
+
+        Events that are already queued when the clock changes are discarded
+        and reported with a ``SYN_DROPPED``.
+        """
+
+        clockid = _CLOCKS.get(clock) if isinstance(clock, str) else clock
+        if clockid is None:
+            raise ValueError("unknown clock %r; expected one of %s" % (clock, ", ".join(map(repr, _CLOCKS))))
+        _input.ioctl_EVIOCSCLOCKID(self.fd, clockid)
+        self.clock = clockid
+
+    def set_event_mask(self, mask: dict[int, Iterable[int] | None] | None) -> None:
+        """
+        Select the events that the kernel queues for this file descriptor
+        using ``EVIOCSMASK``. ``mask`` maps event types to the codes to receive,
+        or to ``None`` to receive all codes of a type. All other events are
+        dropped by the kernel before they are queued, so they cause neither
+        wakeups nor reads. ``EV_SYN`` events are always received. If ``mask``
+        is ``None``, all events are received again.
+
+        Example
+        -------
+
+        >>> device.set_event_mask({ecodes.EV_KEY: [ecodes.KEY_A, ecodes.KEY_B]})
+        >>> device.set_event_mask({ecodes.EV_KEY: None, ecodes.EV_SW: None})
+
+        The mask only applies to this file descriptor - other readers of the
+        device still receive all events. The :attr:`state` of a device opened
+        with ``track_state`` or ``resync`` is not updated for masked events.
+        """
+
+        if mask is None:
+            _input.ioctl_EVIOCSMASK(self.fd, ecodes.EV_SYN, None)
+            for etype in _MASK_TYPES:
+                _input.ioctl_EVIOCSMASK(self.fd, etype, None)
+            return
+
+        # Narrow down the codes before letting their types through.
+        for etype, codes in mask.items():
+            if etype in _MASK_TYPES:
+                _input.ioctl_EVIOCSMASK(self.fd, etype, codes)
+        _input.ioctl_EVIOCSMASK(self.fd, ecodes.EV_SYN, {ecodes.EV_SYN, *mask})
+
+    def get_event_mask(self) -> dict[int, list[int]]:
+        """
+        Return the events that the kernel queues for this file descriptor (see
+        :func:`set_event_mask()`) as a dict mapping the event types of the device
+        to those of its codes that pass the mask. ``EV_SYN`` is left out.
+
+        Example
+        -------
+
+        >>> device.get_event_mask()
+        {1: [30, 48]}
+        """
+
+        types = _input.ioctl_EVIOCGMASK(self.fd, ecodes.EV_SYN)
+
+        res = {}
+        for etype, codes in self._rawcapabilities.items():
+            if etype == ecodes.EV_SYN or etype not in types:
+                continue
+            if etype == ecodes.EV_ABS:
+                codes = [code for code, absinfo in codes]
+            if etype in _MASK_TYPES:
+                passed = set(_input.ioctl_EVIOCGMASK(self.fd, etype))
+                codes = [code for code in codes if code in passed]
+            res[etype] = codes
+        return res
+
+    def latency_ns(self, event, now: int | None = None) -> int:
+        """
+        Return the number of nanoseconds between the timestamp of an event
+        and ``now``, which is the current time of :attr:`clock` if not given.
+        ``event`` is an :class:`InputEvent <evdev.events.InputEvent>`, an
+        :class:`EventBatch <evdev.eventio.EventBatch>` (whose last event is
+        used) or anything else with a ``timestamp_ns()`` method.
+
+        Called right after a read, this is the time the event took to get from
+        the kernel to the reader. Called after the event has been acted on,
+        it is the end-to-end latency. ``now`` must be a time of :attr:`clock`,
+        e.g. one taken when the event was read::
+
+            >>> device = InputDevice("/dev/input/event0", clock="monotonic")
+            >>> for event in device.read_loop():
+            ...     received = time.monotonic_ns()
+            ...     handle(event)
+            ...     print(device.latency_ns(event, received), device.latency_ns(event))
+        """
+
+        if now is None:
+            now = time.clock_gettime_ns(self.clock)
+        return now - event.timestamp_ns()
+
     def grab(self) -> None:
         """
         Grab input device using ``EVIOCGRAB`` - other applications will
@@ -398,7 +695,10 @@ class InputDevice(EventIO, Generic[_AnyStr]):
           [('KEY_ESC', 1), ('KEY_LEFTSHIFT', 42)]
 
         """
-        active_keys = _input.ioctl_EVIOCG_bits(self.fd, ecodes.EV_KEY)
+        if self.state is not None:
+            active_keys = self.state.active(ecodes.EV_KEY)
+        else:
+            active_keys = _input.ioctl_EVIOCG_bits(self.fd, ecodes.EV_KEY)
         if verbose:
             return util.resolve_ecodes(ecodes.KEY, active_keys)
 
@@ -418,6 +718,11 @@ class InputDevice(EventIO, Generic[_AnyStr]):
         >>> device.absinfo(ecodes.ABS_X)
         AbsInfo(value=1501, min=-32768, max=32767, fuzz=0, flat=128, resolution=0)
         """
+        if self.state is not None:
+            try:
+                return self._absinfo[axis_num]._replace(value=self.state.abs_value(axis_num))
+            except KeyError:
+                pass
         return AbsInfo(*_input.ioctl_EVIOCGABS(self.fd, axis_num))
 
     def set_absinfo(
@@ -457,3 +762,6 @@ class InputDevice(EventIO, Generic[_AnyStr]):
             resolution if resolution is not None else cur_absinfo.resolution,
         )
         _input.ioctl_EVIOCSABS(self.fd, axis_num, new_absinfo)
+        if axis_num in self._absinfo:
+            self._absinfo[axis_num] = new_absinfo
+            self.state.update(ecodes.EV_ABS, axis_num, new_absinfo.value)
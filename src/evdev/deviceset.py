@@ -0,0 +1,129 @@
+"""
+This module provides the :class:`DeviceSet` class, which reads events
+from many input devices in one thread. Readiness is tracked with
+:func:`select.epoll`, so it is not bound by the 1024 fd limit of
+:func:`select.select` and costs nothing for devices that are idle::
+
+    >>> devices = DeviceSet(InputDevice(path) for path in list_devices())
+    >>> for device, batch in devices.read_loop():
+    ...     print(device.path, len(batch))
+"""
+
+import errno
+import select
+from typing import Iterable, Iterator
+
+from .eventio import EventBatch, EventIO
+
+
+class DeviceSet:
+    """
+    A set of input devices that can be read from together.
+
+    Arguments
+    ---------
+    devices
+      The devices to add to the set - any :class:`EventIO <evdev.eventio.EventIO>`
+      with a non-blocking file descriptor (e.g. :class:`InputDevice <evdev.device.InputDevice>`).
+
+    max_events
+      The size of the buffer that each ready device is drained with.
+    """
+
+    def __init__(self, devices: Iterable[EventIO] = (), max_events: int = 64):
+        self._epoll = select.epoll()
+        self._devices: dict[int, EventIO] = {}
+        self.max_events = max_events
+
+        for device in devices:
+            self.add(device)
+
+    def add(self, device: EventIO) -> None:
+        """Add a device to the set."""
+        fd = device.fileno()
+        if fd in self._devices:
+            return
+        self._epoll.register(fd, select.EPOLLIN)
+        self._devices[fd] = device
+
+    def remove(self, device: EventIO) -> None:
+        """Remove a device from the set. Raises :class:`KeyError` if the device is not in the set."""
+        fd = device.fileno()
+        if self._devices.get(fd) is not device:
+            raise KeyError(device)
+        del self._devices[fd]
+        try:
+            self._epoll.unregister(fd)
+        except OSError:
+            # The fd was closed before the device was removed.
+            pass
+
+    def discard(self, device: EventIO) -> None:
+        """Remove a device from the set if it is present."""
+        try:
+            self.remove(device)
+        except KeyError:
+            pass
+
+    def __contains__(self, device: EventIO) -> bool:
+        return self._devices.get(device.fileno()) is device
+
+    def __iter__(self) -> Iterator[EventIO]:
+        return iter(list(self._devices.values()))
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def fileno(self) -> int:
+        """
+        Return the epoll file descriptor. It becomes readable when any of the
+        devices does, which allows nesting a set in another event loop.
+        """
+        return self._epoll.fileno()
+
+    def poll(self, timeout: float | None = None) -> list[tuple[EventIO, EventBatch]]:
+        """
+        Wait up to ``timeout`` seconds (forever if ``None``) for any of the
+        devices to become readable and drain all devices that are. Return a
+        list of ``(device, batch)`` pairs, which is empty if the timeout expired.
+
+        Devices that have been disconnected are removed from the set.
+        """
+        results = []
+        for fd, mask in self._epoll.poll(-1 if timeout is None else timeout, len(self._devices) or 1):
+            device = self._devices.get(fd)
+            if device is None:
+                continue
+
+            try:
+                batch = device.read_batch(self.max_events, True)
+            except BlockingIOError:
+                continue
+            except OSError as error:
+                if error.errno != errno.ENODEV:
+                    raise
+                self.discard(device)
+                continue
+
+            results.append((device, batch))
+        return results
+
+    def read_loop(self) -> Iterator[tuple[EventIO, EventBatch]]:
+        """
+        Enter an endless loop that yields a ``(device, batch)`` pair for every
+        device that has events, where ``batch`` is an :class:`EventBatch
+        <evdev.eventio.EventBatch>` with all events that were queued for it.
+        """
+        while True:
+            yield from self.poll()
+
+    def close(self) -> None:
+        """Close the epoll file descriptor. The devices are left open."""
+        self._epoll.close()
+        self._devices.clear()
+
+    def __enter__(self) -> "DeviceSet":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,172 @@
+"""
+This module reads and writes the text format of the `evemu
+<https://www.freedesktop.org/wiki/Evemu/>`_ tools. ``evemu-describe``
+writes a description of a device and ``evemu-record`` follows it with one
+``E:`` line per event::
+
+    # EVEMU 1.3
+    N: Logitech USB Receiver
+    I: 0003 046d c52b 0111
+    P: 00 00 00 00 00 00 00 00
+    B: 00 17 00 00 00 00 00 00 00
+    ...
+    A: 00 0 1919 0 0 0
+    E: 0.000001 0002 0000 0001  # EV_REL / REL_X  1
+    E: 0.000001 0000 0000 0000  # ------------ SYN_REPORT (0) ----------
+
+Descriptions are read into a :class:`DeviceDescription
+<evdev.recording.DeviceDescription>`, from which a uinput device can be
+created with :func:`UInput.from_description()
+<evdev.uinput.UInput.from_description>`. Events are parsed into and
+formatted from :class:`EventBatch <evdev.eventio.EventBatch>` objects in C,
+a large chunk of the file at a time::
+
+    >>> description = evemu.read_description("touchpad.evemu")
+    >>> ui = UInput.from_description(description)
+    >>> with RecordingWriter("touchpad.evrec", description) as writer:
+    ...     for batch in evemu.read_events("touchpad.evemu"):
+    ...         writer.write(batch)
+"""
+
+import contextlib
+import os
+from typing import BinaryIO, Iterator
+
+from . import _input, ecodes
+from .device import AbsInfo, DeviceInfo
+from .eventio import EventBatch
+from .recording import DeviceDescription
+
+# The highest code of each event type, which sizes the B: bitmasks.
+_MAX_CODES = {
+    ecodes.EV_SYN: ecodes.EV_MAX,
+    ecodes.EV_KEY: ecodes.KEY_MAX,
+    ecodes.EV_REL: ecodes.REL_MAX,
+    ecodes.EV_ABS: ecodes.ABS_MAX,
+    ecodes.EV_MSC: ecodes.MSC_MAX,
+    ecodes.EV_SW: ecodes.SW_MAX,
+    ecodes.EV_LED: ecodes.LED_MAX,
+    ecodes.EV_SND: ecodes.SND_MAX,
+    ecodes.EV_REP: ecodes.REP_MAX,
+    ecodes.EV_FF: ecodes.FF_MAX,
+}
+
+
+def _open(file: str | os.PathLike | BinaryIO, mode: str):
+    if isinstance(file, (str, bytes, os.PathLike)):
+        return open(file, mode)
+    return contextlib.nullcontext(file)
+
+
+def _bits(data: bytes) -> list[int]:
+    return [i * 8 + bit for i, byte in enumerate(data) for bit in range(8) if byte >> bit & 1]
+
+
+def _bitmask_lines(prefix: str, codes, max_code: int) -> list[str]:
+    # Bitmasks are written 8 bytes to a line, as evemu-describe does.
+    data = bytearray((max_code // 64 + 1) * 8)
+    for code in codes:
+        data[code // 8] |= 1 << code % 8
+    return [prefix + " ".join("%02x" % byte for byte in data[i : i + 8]) for i in range(0, len(data), 8)]
+
+
+def read_description(file: str | os.PathLike | BinaryIO) -> DeviceDescription:
+    """
+    Read the device description (the ``N:``, ``I:``, ``P:``, ``B:`` and ``A:``
+    lines) at the start of an evemu file. Reading stops at the first event.
+    """
+    name = None
+    info = DeviceInfo(0, 0, 0, 0)
+    props = bytearray()
+    bits: dict[int, bytearray] = {}
+    absinfo = {}
+
+    with _open(file, "rb") as f:
+        for line in f:
+            line = line.decode("utf-8").rstrip("\r\n")
+            key, _, value = line.partition(": ")
+            if key == "E":
+                break
+            elif key == "N":
+                name = value
+            elif key == "I":
+                info = DeviceInfo(*(int(field, 16) for field in value.split()))
+            elif key == "P":
+                props += bytes.fromhex(value)
+            elif key == "B":
+                etype, _, data = value.partition(" ")
+                bits.setdefault(int(etype, 16), bytearray()).extend(bytes.fromhex(data))
+            elif key == "A":
+                code, *fields = value.split()
+                # Older versions of evemu do not write the resolution.
+                fields = [int(field) for field in fields] + [0] * (5 - len(fields))
+                absinfo[int(code, 16)] = AbsInfo(0, *fields)
+
+    if name is None:
+        raise ValueError("not an evemu device description")
+
+    types = _bits(bits.get(ecodes.EV_SYN, b""))
+    capabilities = {etype: _bits(bits.get(etype, b"")) for etype in types}
+    return DeviceDescription(
+        name=name,
+        phys="",
+        uniq="",
+        info=info,
+        capabilities=capabilities,
+        absinfo={code: axis for code, axis in absinfo.items() if code in capabilities.get(ecodes.EV_ABS, [])},
+        input_props=_bits(props),
+    )
+
+
+def write_description(file: str | os.PathLike | BinaryIO, description: DeviceDescription) -> None:
+    """Write a device description in the format of ``evemu-describe``."""
+    capabilities = description.capabilities
+    types = set(capabilities.get(ecodes.EV_SYN, [])) | set(capabilities)
+
+    lines = [
+        "# EVEMU 1.3",
+        '# Input device name: "%s"' % description.name,
+        "N: %s" % description.name,
+        "I: %04x %04x %04x %04x" % tuple(description.info),
+        *_bitmask_lines("P: ", description.input_props, ecodes.INPUT_PROP_MAX),
+    ]
+    for etype, max_code in _MAX_CODES.items():
+        codes = types if etype == ecodes.EV_SYN else capabilities.get(etype, [])
+        lines.extend(_bitmask_lines("B: %02x " % etype, codes, max_code))
+    for code in sorted(capabilities.get(ecodes.EV_ABS, [])):
+        absinfo = description.absinfo.get(code, AbsInfo(0, 0, 0, 0, 0, 0))
+        lines.append("A: %02x %d %d %d %d %d" % (code, *absinfo[1:]))
+
+    with _open(file, "wb") as f:
+        f.write("".join(line + "\n" for line in lines).encode("utf-8"))
+
+
+def read_events(file: str | os.PathLike | BinaryIO, chunk_size: int = 1 << 20) -> Iterator[EventBatch]:
+    """
+    Yield the events of the ``E:`` lines of an evemu file as :class:`EventBatch
+    <evdev.eventio.EventBatch>` objects, one for every ``chunk_size`` bytes
+    of the file. All other lines are skipped. Raises :class:`ValueError` on
+    a malformed event.
+    """
+    with _open(file, "rb") as f:
+        rest = b""
+        while True:
+            chunk = f.read(chunk_size)
+            data = rest + chunk if rest else chunk
+            batch, consumed = _input.parse_evemu(data, not chunk)
+            if len(batch):
+                yield batch
+            if not chunk:
+                return
+            rest = data[consumed:]
+
+
+def write_events(file: str | os.PathLike | BinaryIO, events) -> None:
+    """
+    Write a buffer of packed ``input_event`` structs - such as an
+    :class:`EventBatch <evdev.eventio.EventBatch>` - as ``E:`` lines. The
+    lines are appended to the file, so that they can follow a description
+    written with :func:`write_description()`.
+    """
+    with _open(file, "ab") as f:
+        f.write(_input.format_evemu(events))
@@ -1,18 +1,141 @@
 import fcntl
 import functools
+import itertools
 import os
 import select
-from typing import Iterator, Callable
+import threading
+from typing import Any, Iterator, Callable
 
 from . import _input, _uinput, ecodes
+from ._input import EventBatch, EventFilter
 from .events import InputEvent
 
+#: Size in bytes of a single ``input_event`` struct on this platform.
+EVENT_SIZE: int = _input.event_size
+
+
+def pack_events(events, sec: int = 0, usec: int = 0) -> EventBatch:
+    """
+    Pack an iterable of events into an :class:`EventBatch`. The events can be
+    :class:`InputEvent <evdev.events.InputEvent>` instances, or ``(type, code,
+    value)`` tuples, which are given the timestamp ``sec``, ``usec``.
+    """
+
+    return _input.pack_events(events, sec, usec)
+
+
+@functools.cache
+def event_dtype():
+    """
+    Return a :class:`numpy.dtype` describing the ``input_event`` struct, with
+    the fields ``sec``, ``usec``, ``type``, ``code`` and ``value``. Requires
+    :mod:`numpy` to be installed.
+    """
+    import numpy  # pylint: disable=import-error
+
+    fields = [("sec", "l"), ("usec", "l"), ("type", "H"), ("code", "H"), ("value", "i")]
+    return numpy.dtype(fields, align=True)
+
+
+def coalesce(events, window: float = 0.0) -> EventBatch:
+    """
+    Coalesce the motion events of an :class:`EventBatch` or another buffer of
+    raw ``input_event`` structs and return the result as a new batch.
+
+    Within a frame, the ``EV_REL`` events of each code are merged into one
+    that carries the sum of their values and the ``EV_ABS`` events of each
+    code into one that carries the last value. If ``window`` (in seconds) is
+    greater than zero, consecutive frames that hold nothing but such motion
+    and start within ``window`` of the first of them are merged into one
+    frame as well. Key, button, multitouch (``ABS_MT_*``) and all other
+    events are passed through unchanged and are never merged across, so the
+    motion before and after them stays apart. The merged events carry the
+    timestamp of the last event merged into them.
+
+    The sums of the relative axes are the same as those of the original
+    events, while far fewer events are left on high-rate devices::
+
+        >>> batch = coalesce(device.read_batch(drain=True), 0.010)
+        >>> [(event.code, event.value) for event in batch]
+        [(0, 57), (1, -12), (0, 0)]
+    """
+
+    return _input.coalesce(events, window)
+
+
+class EventDispatcher:
+    """
+    Call a handler for every event with a given type and code.
+
+    The :attr:`filter` of a dispatcher lets only the events that have a
+    handler pass, so when it is given to :func:`EventIO.read_batch()`, no
+    objects are created for any other events::
+
+        >>> dispatcher = EventDispatcher({
+        ...     (ecodes.EV_KEY, ecodes.KEY_F1): show_help,
+        ...     (ecodes.EV_KEY, ecodes.KEY_F5): reload,
+        ... }, values=(1,))
+        >>> while True:
+        ...     select.select([device], [], [])
+        ...     dispatcher.dispatch(device.read_batch(filter=dispatcher.filter))
+
+    Arguments
+    ---------
+    handlers
+      A dict mapping ``(type, code)`` pairs to callables that are called with
+      an :class:`InputEvent <evdev.events.InputEvent>`.
+
+    values
+      The event values to call the handlers for. All values if ``None``.
+    """
+
+    def __init__(self, handlers: dict[tuple[int, int], Callable[[InputEvent], Any]], values=None):
+        #: The ``(type, code) -> handler`` dict.
+        self.handlers = dict(handlers)
+
+        events: dict[int, list[int]] = {}
+        for etype, code in self.handlers:
+            events.setdefault(etype, []).append(code)
+
+        #: An :class:`EventFilter` that passes the events with a handler.
+        self.filter = EventFilter(events, values)
+
+    def dispatch(self, events) -> int:
+        """
+        Call the handlers of the events in an :class:`EventBatch` (or another
+        buffer of raw ``input_event`` structs) that pass the :attr:`filter`.
+        Return the number of handlers called.
+        """
+
+        handlers = self.handlers
+        batch = self.filter.apply(events)
+        for event in batch:
+            handlers[event.type, event.code](event)
+        return len(batch)
+
 
 # --------------------------------------------------------------------------
 class EvdevError(Exception):
     pass
 
 
+# Guards the creation of the per-instance locks of EventIO.
+_lock_creation = threading.Lock()
+
+_SYN_REPORT = (ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+_SYN_REPORT_BYTES = bytes(_input.pack_events([_SYN_REPORT]))
+
+
+def _pack_buffer(events, syn: bool = False) -> Any:
+    # Buffers of packed events are written as they are, anything else is
+    # packed in C. Only a buffer that needs a SYN_REPORT appended is copied.
+    try:
+        view = memoryview(events)
+    except TypeError:
+        return _input.pack_events(itertools.chain(events, [_SYN_REPORT]) if syn else events)
+    return bytes(view) + _SYN_REPORT_BYTES if syn else view
+
+
 class EventIO:
     """
     Base class for reading and writing input events.
@@ -28,6 +151,28 @@ class EventIO:
       beeps).
     """
 
+    # The events of a frame that has not been terminated by a SYN_REPORT yet,
+    # carried over from the last call to read_frames().
+    _partial_frame: EventBatch | None = None
+
+    @property
+    def _lock(self) -> threading.Lock:
+        # Serializes reads that carry state from one call to the next, such as
+        # read_frames(). Created on first use, as subclasses do not call an
+        # EventIO.__init__(); InputDevice creates its own when it is opened.
+        try:
+            return self._io_lock
+        except AttributeError:
+            with _lock_creation:
+                if not hasattr(self, "_io_lock"):
+                    self._io_lock = threading.Lock()
+            return self._io_lock
+
+    #: Whether the device was opened for writing. :class:`InputDevice` and
+    #: :class:`UInput` record this when they open the device. If ``None``,
+    #: the access mode is looked up with :func:`fcntl.fcntl` on every write.
+    writable: bool | None = None
+
     def fileno(self) -> int:
         """
         Return the file descriptor to the open event device. This makes
@@ -36,15 +181,32 @@ class EventIO:
         """
         return self.fd
 
-    def read_loop(self) -> Iterator[InputEvent]:
+    def read_loop(
+        self,
+        max_events: int = 64,
+        drain: bool = False,
+        filter: EventFilter | None = None,
+        coalesce: float | None = None,
+    ) -> Iterator[InputEvent]:
         """
         Enter an endless :func:`select.select()` loop that yields input events.
+        See :func:`read()` for the meaning of the arguments.
         """
 
         while True:
             r, w, x = select.select([self.fd], [], [])
-            for event in self.read():
-                yield event
+            while True:
+                try:
+                    batch = self.read_batch(max_events, drain, filter, coalesce)
+                except BlockingIOError:
+                    break
+
+                yield from batch
+
+                # Unless the batch came back full, the kernel queue has been
+                # emptied and the next read can wait on select.
+                if not batch.more:
+                    break
 
     def read_one(self) -> InputEvent | None:
         """
@@ -60,18 +222,135 @@ class EventIO:
         if event:
             return InputEvent(*event)
 
-    def read(self) -> Iterator[InputEvent]:
+    def read(
+        self,
+        max_events: int = 64,
+        drain: bool = False,
+        filter: EventFilter | None = None,
+        coalesce: float | None = None,
+    ) -> Iterator[InputEvent]:
         """
         Read multiple input events from device. Return a generator object that
         yields :class:`InputEvent <evdev.events.InputEvent>` instances. Raises
         `BlockingIOError` if there are no available events at the moment.
+
+        Arguments
+        ---------
+        max_events
+          Maximum number of events to read with a single ``read()`` syscall.
+
+        drain
+          Keep reading until the kernel event queue is empty, instead of
+          stopping after the first ``max_events`` events.
+
+        filter
+          An :class:`EventFilter` that is applied to the events as they are
+          read, before any objects are created for them. Only the events that
+          pass the filter are returned.
+
+        coalesce
+          Coalesce the motion events that are read, before any objects are
+          created for them - see :func:`coalesce()`. The value is the time
+          window in seconds to merge frames of motion across, or ``0`` to
+          merge only within frames. Off if ``None``.
+        """
+
+        yield from self.read_batch(max_events, drain, filter, coalesce)
+
+    def read_batch(
+        self,
+        max_events: int = 64,
+        drain: bool = False,
+        filter: EventFilter | None = None,
+        coalesce: float | None = None,
+    ) -> EventBatch:
+        """
+        Read multiple input events from device and return them as an
+        :class:`EventBatch`. See :func:`read()` for the meaning of the
+        arguments. Raises `BlockingIOError` if there are no available
+        events at the moment.
+
+        Unlike :func:`read()`, no :class:`InputEvent <evdev.events.InputEvent>`
+        instances are created up front - only when an individual event is
+        accessed. The ``types``, ``codes`` and ``values`` columns can be used
+        to inspect a batch without creating any events::
+
+            >>> batch = device.read_batch()
+            >>> batch.types.count(ecodes.EV_KEY)
+            2
+            >>> [event for event in batch if event.type == ecodes.EV_KEY]
+            [InputEvent(1337197425, 477827, 1, 30, 1), InputEvent(1337197425, 589127, 1, 30, 0)]
+
+        The ``more`` attribute of a batch is true if it was filled up to
+        ``max_events`` and the kernel queue may still hold events. With a
+        ``filter``, this refers to the number of events read, not to the
+        number of events that passed it.
+        """
+
+        return _input.device_read_batch(self.fd, max_events, drain, filter, coalesce)
+
+    def read_frames(self, max_events: int = 64, drain: bool = False) -> Iterator[EventBatch]:
+        """
+        Read multiple input events from device and return a generator object
+        that yields them grouped into frames - all events up to and including
+        a ``SYN_REPORT``. Each frame is an :class:`EventBatch` and its
+        ``sec``, ``usec`` and ``timestamp()`` are those of the ``SYN_REPORT``.
+        See :func:`read()` for the meaning of the arguments. Raises
+        `BlockingIOError` if there are no available events at the moment.
+
+        Events that are not yet followed by a ``SYN_REPORT`` are held back
+        and yielded as part of their frame by a later call.
+
+        Example
+        -------
+        >>> for frame in device.read_frames():
+        ...     print(frame.timestamp(), frame.codes)
+        1337197425.477827 (30, 0)
+        1337197425.589127 (30, 0)
+        """
+
+        with self._lock:
+            frames, self._partial_frame = _input.device_read_frames(self.fd, max_events, self._partial_frame, drain)
+        yield from frames
+
+    def read_into(self, buffer) -> int:
+        """
+        Read multiple input events from device directly into ``buffer``
+        and return the number of events read. The buffer can be any
+        writable object that supports the buffer protocol (e.g.
+        :class:`bytearray`, :class:`memoryview`, :class:`array.array`,
+        :class:`mmap.mmap`) and is filled with raw ``input_event`` structs
+        of :data:`EVENT_SIZE` bytes each. Raises `BlockingIOError` if there
+        are no available events at the moment.
+
+        Example
+        -------
+        >>> buf = bytearray(EVENT_SIZE * 64)
+        >>> count = device.read_into(buf)
+        """
+
+        return _input.device_read_into(self.fd, buffer)
+
+    def read_array(self, max_events: int = 64):
         """
+        Read multiple input events from device and return them as a NumPy
+        structured array of :func:`event_dtype`. The array is a view of the
+        bytes read by the kernel and no per-event objects are created.
+        Raises `BlockingIOError` if there are no available events at the moment.
+
+        Requires :mod:`numpy` to be installed.
 
-        # events -> ((sec, usec, type, code, val), ...)
-        events = _input.device_read_many(self.fd)
+        Example
+        -------
+        >>> events = device.read_array()
+        >>> events[events["type"] == ecodes.EV_KEY]["code"]
+        array([30, 30], dtype=uint16)
+        """
+        import numpy  # pylint: disable=import-error
 
-        for event in events:
-            yield InputEvent(*event)
+        buffer = bytearray(EVENT_SIZE * max_events)
+        count = self.read_into(buffer)
+        return numpy.frombuffer(buffer, dtype=event_dtype(), count=count)
 
     # pylint: disable=no-self-argument
     def need_write(func: Callable) -> Callable:
@@ -82,15 +361,19 @@ class EventIO:
 
         @functools.wraps(func)
         def wrapper(*args):
-            fd = args[0].fd
-            if fcntl.fcntl(fd, fcntl.F_GETFL) & os.O_RDWR:
-                # pylint: disable=not-callable
-                return func(*args)
-            msg = 'no write access to device "%s"' % args[0].path
-            raise EvdevError(msg)
+            if not args[0].writable:
+                args[0]._check_writable()
+            # pylint: disable=not-callable
+            return func(*args)
 
         return wrapper
 
+    def _check_writable(self) -> None:
+        if self.writable or (self.writable is None and fcntl.fcntl(self.fd, fcntl.F_GETFL) & os.O_RDWR):
+            return
+        msg = 'no write access to device "%s"' % self.path
+        raise EvdevError(msg)
+
     def write_event(self, event: InputEvent):
         """
         Inject an input event into the input subsystem. Events are
@@ -114,7 +397,6 @@ class EventIO:
 
         self.write(event.type, event.code, event.value)
 
-    @need_write
     def write(self, etype: int, code: int, value: int):
         """
         Inject an input event into the input subsystem. Events are
@@ -137,8 +419,69 @@ class EventIO:
         >>> ui.write(e.EV_KEY, e.KEY_A, 0) # key A - up
         """
 
+        # The check of need_write, inlined to save a call on the hot path.
+        if not self.writable:
+            self._check_writable()
         _uinput.write(self.fd, etype, code, value)
 
+    @need_write
+    def write_array(self, events) -> None:
+        """
+        Inject a NumPy structured array of events (see :func:`event_dtype`)
+        into the input subsystem with a single ``write()`` syscall. Event
+        timestamps are ignored - the kernel sets its own.
+
+        Example
+        -------
+        >>> events = numpy.zeros(2, dtype=event_dtype())
+        >>> events[0] = (0, 0, e.EV_KEY, e.KEY_A, 1)
+        >>> events[1] = (0, 0, e.EV_SYN, e.SYN_REPORT, 0)
+        >>> ui.write_array(events)
+        """
+        import numpy  # pylint: disable=import-error
+
+        events = numpy.ascontiguousarray(events, dtype=event_dtype())
+        _uinput.write_buffer(self.fd, events)
+
+    @need_write
+    def write_many(self, events) -> int:
+        """
+        Inject several input events into the input subsystem with a single
+        ``write()`` syscall. Returns the number of events written.
+
+        Arguments
+        ---------
+        events
+          A buffer of packed ``input_event`` structs (e.g. an :class:`EventBatch`)
+          or an iterable of ``(type, code, value)`` tuples or
+          :class:`InputEvent <evdev.events.InputEvent>` instances. Event
+          timestamps are ignored - the kernel sets its own.
+
+        Example
+        -------
+        >>> ui.write_many([(e.EV_KEY, e.KEY_A, 1), (e.EV_SYN, e.SYN_REPORT, 0)])
+        2
+        """
+
+        return _uinput.write_buffer(self.fd, _pack_buffer(events))
+
+    @need_write
+    def write_frame(self, events) -> int:
+        """
+        Like :func:`write_many()`, followed by a ``SYN_REPORT``, which is
+        written with the same ``write()`` syscall. Returns the number of
+        events written, including the ``SYN_REPORT``.
+
+        Example
+        -------
+        >>> ui.write_frame([(e.EV_KEY, e.KEY_A, 1)])  # key A - down
+        2
+        >>> ui.write_frame([(e.EV_KEY, e.KEY_A, 0)])  # key A - up
+        2
+        """
+
+        return _uinput.write_buffer(self.fd, _pack_buffer(events, True))
+
     def syn(self) -> None:
         """
         Inject a ``SYN_REPORT`` event into the input subsystem. Events
@@ -1,6 +1,12 @@
 import asyncio
+import collections
+import errno
+import heapq
+import itertools
 import select
 import sys
+import weakref
+from typing import Iterable, Iterator
 
 from . import eventio
 from .events import InputEvent
@@ -15,9 +21,38 @@ else:
 
 
 class ReadIterator:
-    def __init__(self, device: "EventIO"):
+    """
+    An iterator over the events of a device. As an async iterator, the device
+    is registered with the event loop once and every time it becomes readable,
+    all queued events are read into an internal queue of batches. Events are
+    then handed out from the queue without waiting on the loop.
+
+    The device is unregistered by :func:`aclose()` or when the iterator is
+    garbage collected, e.g. after leaving an ``async for`` loop with
+    ``break``. Events that were queued but not yet handed out are discarded.
+    """
+
+    def __init__(
+        self,
+        device: "EventIO",
+        batches: bool = False,
+        max_events: int = 64,
+        max_pending: int | None = None,
+        coalesce: float | None = None,
+    ):
         self.current_batch = iter(())
         self.device = device
+        self.batches = batches
+        self.max_events = max_events
+        self.max_pending = max_pending
+        self.coalesce = coalesce
+
+        self._loop: "asyncio.AbstractEventLoop | None" = None
+        self._reading = False
+        self._queue: "collections.deque[eventio.EventBatch]" = collections.deque()
+        self._pending = 0
+        self._waiter: "asyncio.Future[None] | None" = None
+        self._error: Exception | None = None
 
     # Standard iterator protocol.
     def __iter__(self) -> Self:
@@ -35,22 +70,268 @@ class ReadIterator:
     def __aiter__(self) -> Self:
         return self
 
-    def __anext__(self) -> "asyncio.Future[InputEvent]":
-        future = asyncio.get_running_loop().create_future()
+    async def __anext__(self) -> "InputEvent | eventio.EventBatch":
+        while True:
+            if not self.batches:
+                # Events of the current batch are returned without suspending.
+                event = next(self.current_batch, None)
+                if event is not None:
+                    return event
+
+            if self._queue:
+                batch = self._queue.popleft()
+                self._pending -= len(batch)
+                if not self._reading and self._error is None:
+                    self._start_reading()
+
+                if self.batches:
+                    return batch
+                self.current_batch = iter(batch)
+                continue
+
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
+            if not self._reading:
+                self._start_reading()
+
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    def _start_reading(self) -> None:
+        if self._loop is None:
+            return
+        # EventIO.close() removes the reader from the loop it was added to.
+        self.device._loop = self._loop
+        # The loop only holds a weak reference, so that an iterator that is no
+        # longer used can be collected and unregister itself in __del__.
+        fd = self.device.fileno()
+        self._loop.add_reader(fd, _read_ready, weakref.ref(self), self._loop, fd)
+        self._reading = True
+
+    def _stop_reading(self) -> None:
+        if self._reading:
+            self._reading = False
+            self._loop.remove_reader(self.device.fileno())
+
+    def _read_ready(self) -> None:
         try:
-            # Read from the previous batch of events.
-            future.set_result(next(self.current_batch))
-        except StopIteration:
+            batch = self.device.read_batch(self.max_events, True, None, self.coalesce)
+        except BlockingIOError:
+            return
+        except OSError as error:
+            self._error = error
+            self._stop_reading()
+        else:
+            self._queue.append(batch)
+            self._pending += len(batch)
+            # Leave further events in the kernel queue until the consumer catches up.
+            if self.max_pending is not None and self._pending >= self.max_pending:
+                self._stop_reading()
 
-            def next_batch_ready(batch):
-                try:
-                    self.current_batch = batch.result()
-                    future.set_result(next(self.current_batch))
-                except Exception as e:
-                    future.set_exception(e)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
 
-            self.device.async_read().add_done_callback(next_batch_ready)
-        return future
+    def close(self) -> None:
+        """Unregister the device from the event loop and discard any queued events."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._stop_reading()
+        self._reading = False
+        self._queue.clear()
+        self._pending = 0
+
+    async def aclose(self) -> None:
+        """
+        Unregister the device from the event loop and discard any queued
+        events. Called by :func:`contextlib.aclosing`.
+        """
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except (RuntimeError, OSError, AttributeError):
+            # The loop may already be shutting down or the device closed.
+            pass
+
+
+def _read_ready(ref: "weakref.ref", loop: "asyncio.AbstractEventLoop", fd: int, *args) -> None:
+    iterator = ref()
+    if iterator is None:
+        loop.remove_reader(fd)
+    else:
+        iterator._read_ready(*args)
+
+
+class MergeIterator:
+    """
+    An async iterator over the batches of events of several devices. See :func:`merge()`.
+    """
+
+    def __init__(
+        self,
+        devices: "Iterable[EventIO]",
+        window: float = 0.0,
+        max_events: int = 64,
+        max_pending: int | None = None,
+    ):
+        self.devices: list[EventIO] = list(devices)
+        self.window = window
+        self.max_events = max_events
+        self.max_pending = max_pending
+
+        self._loop: "asyncio.AbstractEventLoop | None" = None
+        self._reading = False
+        # Entries are (sec, usec, seq, arrival, device, batch), so that batches
+        # are ordered by the timestamp of their first event.
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._pending = 0
+        self._waiter: "asyncio.Future[None] | None" = None
+        self._error: Exception | None = None
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> "tuple[EventIO, eventio.EventBatch]":
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._start_reading()
+
+        while True:
+            timer = None
+            if self._heap:
+                due = self._heap[0][3] + self.window
+                if self.window <= 0 or self._loop.time() >= due:
+                    *_, device, batch = heapq.heappop(self._heap)
+                    self._pending -= len(batch)
+                    if not self._reading and self._error is None:
+                        self._start_reading()
+                    return device, batch
+
+                # Wait for the batch to leave the window, unless an earlier
+                # batch from another device arrives in the meantime.
+                timer = self._loop.call_at(due, self._wake)
+            elif self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            elif not self.devices:
+                raise StopAsyncIteration
+
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+                if timer is not None:
+                    timer.cancel()
+
+    def _start_reading(self) -> None:
+        # As with ReadIterator, the loop only holds a weak reference.
+        ref = weakref.ref(self)
+        for device in self.devices:
+            # EventIO.close() removes the reader from the loop it was added to.
+            device._loop = self._loop
+            fd = device.fileno()
+            self._loop.add_reader(fd, _read_ready, ref, self._loop, fd, device)
+        self._reading = True
+
+    def _stop_reading(self) -> None:
+        if self._reading:
+            self._reading = False
+            for device in self.devices:
+                self._loop.remove_reader(device.fileno())
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _read_ready(self, device: "EventIO") -> None:
+        try:
+            batch = device.read_batch(self.max_events, True)
+        except BlockingIOError:
+            return
+        except OSError as error:
+            self._loop.remove_reader(device.fileno())
+            self.devices.remove(device)
+            # A disconnected device simply leaves the merge.
+            if error.errno != errno.ENODEV:
+                self._error = error
+            self._wake()
+            return
+
+        if not batch:
+            return
+
+        first = batch[0]
+        entry = (first.sec, first.usec, next(self._seq), self._loop.time(), device, batch)
+        heapq.heappush(self._heap, entry)
+        self._pending += len(batch)
+        if self.max_pending is not None and self._pending >= self.max_pending:
+            self._stop_reading()
+        self._wake()
+
+    def close(self) -> None:
+        """Unregister the devices from the event loop and discard any queued events."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._stop_reading()
+        self._reading = False
+        self._heap.clear()
+        self._pending = 0
+
+    async def aclose(self) -> None:
+        """
+        Unregister the devices from the event loop and discard any queued
+        events. Called by :func:`contextlib.aclosing`.
+        """
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except (RuntimeError, OSError, AttributeError):
+            # The loop may already be shutting down or a device closed.
+            pass
+
+
+def merge(
+    devices: "Iterable[EventIO]",
+    window: float = 0.0,
+    max_events: int = 64,
+    max_pending: int | None = None,
+) -> MergeIterator:
+    """
+    Return an async iterator that yields ``(device, batch)`` pairs for a
+    group of devices, where ``batch`` is an :class:`EventBatch
+    <evdev.eventio.EventBatch>` with the events that were queued for
+    ``device``. All devices are registered with the event loop once and
+    every device that becomes readable is drained.
+
+    Batches are yielded in the order of their kernel timestamps. Batches that
+    are read in the same iteration of the event loop are always ordered. With
+    a ``window`` (in seconds), each batch is also held back for that long, so
+    that batches of other devices that are read later can be ordered before it.
+
+    Devices that are disconnected leave the merge, which ends when no devices
+    are left. ``max_events`` and ``max_pending`` have the same meaning as for
+    :func:`EventIO.async_read_loop() <evdev.eventio_async.EventIO.async_read_loop>`.
+    The devices are unregistered from the event loop by :func:`close()
+    <MergeIterator.close>`, :func:`contextlib.aclosing` or once the iterator
+    is no longer referenced.
+
+    Example
+    -------
+    >>> async for device, batch in evdev.merge(devices):
+    ...     for event in batch:
+    ...         print(device.path, categorize(event))
+    """
+    return MergeIterator(devices, window, max_events, max_pending)
 
 
 class EventIO(eventio.EventIO):
@@ -95,13 +376,68 @@ class EventIO(eventio.EventIO):
         self._do_when_readable(lambda: self._set_result(future, self.read))
         return future
 
-    def async_read_loop(self) -> ReadIterator:
+    def async_read_frames(self) -> "asyncio.Future[Iterator[eventio.EventBatch]]":
+        """
+        Asyncio coroutine to read multiple input events from device. Return
+        a generator object that yields them grouped into frames, as described
+        in :func:`read_frames() <evdev.eventio.EventIO.read_frames>`.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._do_when_readable(lambda: self._set_result(future, self.read_frames))
+        return future
+
+    def async_read_loop(
+        self,
+        batches: bool = False,
+        max_events: int = 64,
+        max_pending: int | None = None,
+        coalesce: float | None = None,
+    ) -> ReadIterator:
         """
         Return an iterator that yields input events. This iterator is
         compatible with the ``async for`` syntax.
 
+        When iterated with ``async for``, the device is registered with the
+        event loop once and drained into an internal queue whenever it becomes
+        readable. No future is created for events that are already queued.
+
+        Arguments
+        ---------
+        batches
+          Yield every :class:`EventBatch <evdev.eventio.EventBatch>` that was
+          read as a whole instead of individual events.
+
+        max_events
+          The size of the buffer that the device is drained with.
+
+        max_pending
+          Stop reading from the device once this many events are queued and
+          resume when the consumer has taken them. Further events wait in the
+          kernel queue, which reports ``SYN_DROPPED`` if it overflows.
+          Unlimited if ``None``.
+
+        coalesce
+          Coalesce the motion events of every batch that is read - see
+          :func:`evdev.eventio.coalesce()`. The value is the time window in
+          seconds, or ``0`` to merge only within frames. Off if ``None``.
+
+        The device stays registered with the event loop until the iterator is
+        closed with :func:`ReadIterator.aclose() <evdev.eventio_async.ReadIterator.aclose>`
+        or garbage collected. To unregister it as soon as a loop is left,
+        whether by ``break``, an exception or cancellation, use
+        :func:`contextlib.aclosing`.
+
+        Example
+        -------
+        >>> async for batch in device.async_read_loop(batches=True, max_pending=4096):
+        ...     print(len(batch))
+
+        >>> async with contextlib.aclosing(device.async_read_loop()) as events:
+        ...     async for event in events:
+        ...         if event.code == ecodes.KEY_ESC:
+        ...             break
         """
-        return ReadIterator(self)
+        return ReadIterator(self, batches, max_events, max_pending, coalesce)
 
     def close(self) -> None:
         # A reader is only registered once an async read has been awaited, in
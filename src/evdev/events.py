@@ -67,6 +67,10 @@ class InputEvent:
         """Return event timestamp as a float."""
         return self.sec + (self.usec / 1000000.0)
 
+    def timestamp_ns(self) -> int:
+        """Return event timestamp as an integer number of nanoseconds."""
+        return self.sec * 1000000000 + self.usec * 1000
+
     def __str__(self) -> str:
         msg = "event at {:f}, code {:02d}, type {:02d}, val {:02d}"
         return msg.format(self.timestamp(), self.code, self.type, self.value)
@@ -11,6 +11,7 @@
 
 #include <stdio.h>
 #include <stdint.h>
+#include <limits.h>
 #include <string.h>
 #include <errno.h>
 #include <sys/types.h>
@@ -24,105 +25,2164 @@
 #include <linux/input.h>
 #endif
 
-#if defined(Py_GIL_DISABLED)
-    #define MAYBE_BEGIN_ALLOW_THREADS Py_BEGIN_ALLOW_THREADS
-    #define MAYBE_END_ALLOW_THREADS   Py_END_ALLOW_THREADS
-#else
-    #define MAYBE_BEGIN_ALLOW_THREADS
-    #define MAYBE_END_ALLOW_THREADS
+// Critical sections are only needed (and only available since 3.13) on
+// free-threaded builds, where they serialize access to an object.
+#ifndef Py_BEGIN_CRITICAL_SECTION
+#define Py_BEGIN_CRITICAL_SECTION(op) {
+#define Py_END_CRITICAL_SECTION() }
+#endif
+
+#ifndef input_event_sec
+#define input_event_sec time.tv_sec
+#define input_event_usec time.tv_usec
 #endif
 
-#ifndef input_event_sec
-#define input_event_sec time.tv_sec
-#define input_event_usec time.tv_usec
-#endif
+#define MAX_NAME_SIZE 256
+
+extern char*  EV_NAME[EV_CNT];
+extern int    EV_TYPE_MAX[EV_CNT];
+extern char** EV_TYPE_NAME[EV_CNT];
+extern char*  BUS_NAME[];
+
+
+int test_bit(const char* bitmask, int bit) {
+    return bitmask[bit/8] & (1 << (bit % 8));
+}
+
+
+// Read input event from a device and return a tuple that mimics input_event
+static PyObject *
+device_read(PyObject *self, PyObject *args)
+{
+    struct input_event event;
+
+    // get device file descriptor (O_RDONLY|O_NONBLOCK)
+    int fd = (int)PyLong_AsLong(PyTuple_GET_ITEM(args, 0));
+
+    int n;
+    Py_BEGIN_ALLOW_THREADS
+    n = read(fd, &event, sizeof(event));
+    Py_END_ALLOW_THREADS
+
+    if (n < 0) {
+        if (errno == EAGAIN) {
+            Py_INCREF(Py_None);
+            return Py_None;
+        }
+
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    PyObject *py_input_event = PyTuple_New(5);
+    PyTuple_SET_ITEM(py_input_event, 0, PyLong_FromLong(event.input_event_sec));
+    PyTuple_SET_ITEM(py_input_event, 1, PyLong_FromLong(event.input_event_usec));
+    PyTuple_SET_ITEM(py_input_event, 2, PyLong_FromLong(event.type));
+    PyTuple_SET_ITEM(py_input_event, 3, PyLong_FromLong(event.code));
+    PyTuple_SET_ITEM(py_input_event, 4, PyLong_FromLong(event.value));
+
+    return py_input_event;
+}
+
+
+// Read up to max_events input events from a device into a heap buffer. If
+// drain is set, keep reading (and growing the buffer) until the kernel queue
+// is empty. Return the number of events read or -1 with errno set.
+static ssize_t
+read_events(int fd, struct input_event **buffer, size_t max_events, int drain)
+{
+    size_t event_size = sizeof(struct input_event);
+    size_t capacity = max_events, num_events = 0;
+    ssize_t nread;
+
+    struct input_event *events = PyMem_Malloc(event_size*capacity);
+    if (events == NULL) {
+        errno = ENOMEM;
+        return -1;
+    }
+
+    while (1) {
+        size_t chunk = capacity - num_events;
+
+        Py_BEGIN_ALLOW_THREADS
+        nread = read(fd, events + num_events, event_size*chunk);
+        Py_END_ALLOW_THREADS
+
+        if (nread < 0) {
+            // An empty queue after a successful read just ends the drain.
+            if (num_events > 0 && errno == EAGAIN)
+                break;
+            PyMem_Free(events);
+            return -1;
+        }
+
+        num_events += nread / event_size;
+
+        // The kernel returns as many events as are queued, so a short read
+        // means that the queue is empty.
+        if (!drain || (size_t)nread < event_size*chunk)
+            break;
+
+        capacity *= 2;
+        struct input_event *grown = PyMem_Realloc(events, event_size*capacity);
+        if (grown == NULL) {
+            PyMem_Free(events);
+            errno = ENOMEM;
+            return -1;
+        }
+        events = grown;
+    }
+
+    *buffer = events;
+    return num_events;
+}
+
+
+// Read multiple input events from a device and return a tuple of tuples
+static PyObject *
+device_read_many(PyObject *self, PyObject *args)
+{
+    int fd, drain = 0;
+    Py_ssize_t max_events = 64;
+
+    // get device file descriptor (O_RDONLY|O_NONBLOCK)
+    int ret = PyArg_ParseTuple(args, "i|np", &fd, &max_events, &drain);
+    if (!ret) return NULL;
+
+    if (max_events < 1) {
+        PyErr_SetString(PyExc_ValueError, "max_events must be positive");
+        return NULL;
+    }
+
+    struct input_event *event;
+    ssize_t num_events = read_events(fd, &event, max_events, drain);
+
+    if (num_events < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    // Construct a tuple of event tuples. Each tuple is the arguments to InputEvent.
+    PyObject* events = PyTuple_New(num_events);
+    for (ssize_t i = 0 ; i < num_events; i++) {
+        PyObject *py_input_event = PyTuple_New(5);
+        PyTuple_SET_ITEM(py_input_event, 0, PyLong_FromLong(event[i].input_event_sec));
+        PyTuple_SET_ITEM(py_input_event, 1, PyLong_FromLong(event[i].input_event_usec));
+        PyTuple_SET_ITEM(py_input_event, 2, PyLong_FromLong(event[i].type));
+        PyTuple_SET_ITEM(py_input_event, 3, PyLong_FromLong(event[i].code));
+        PyTuple_SET_ITEM(py_input_event, 4, PyLong_FromLong(event[i].value));
+        PyTuple_SET_ITEM(events, i, py_input_event);
+    }
+
+    PyMem_Free(event);
+    return events;
+}
+
+
+// Read input events from a device directly into a writable buffer and return
+// the number of events read. No Python objects are created per event.
+static PyObject *
+device_read_into(PyObject *self, PyObject *args)
+{
+    int fd;
+    Py_buffer buffer;
+
+    int ret = PyArg_ParseTuple(args, "iw*", &fd, &buffer);
+    if (!ret) return NULL;
+
+    size_t event_size = sizeof(struct input_event);
+    size_t max_events = buffer.len / event_size;
+
+    if (max_events == 0) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "buffer is too small to hold an input event");
+        return NULL;
+    }
+
+    ssize_t nread;
+    Py_BEGIN_ALLOW_THREADS
+    nread = read(fd, buffer.buf, event_size*max_events);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&buffer);
+
+    if (nread < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    return PyLong_FromSsize_t(nread / event_size);
+}
+
+
+// EventBatch is a read-only sequence of input events that is backed by a
+// buffer of raw input_event structs. InputEvent objects are created only
+// when individual events are accessed.
+
+#define EVENT_SIZE ((Py_ssize_t)sizeof(struct input_event))
+
+typedef struct {
+    PyObject_HEAD
+    char *data;         // packed input_event structs
+    Py_ssize_t count;   // number of events in data
+    Py_buffer view;     // the buffer data points into - view.obj is NULL if data is owned
+    int more;           // the kernel queue may still hold events
+} EventBatchObject;
+
+static PyTypeObject EventBatchType;
+
+// evdev.events.InputEvent - imported when the module is initialized, so that
+// threads of a free-threaded build do not race to set it.
+static PyObject *InputEventClass = NULL;
+
+static inline void
+batch_get(EventBatchObject *self, Py_ssize_t i, struct input_event *event)
+{
+    // The buffer may come from anywhere (e.g. an mmap at an odd offset), so
+    // don't assume that it is suitably aligned.
+    memcpy(event, self->data + i*EVENT_SIZE, EVENT_SIZE);
+}
+
+
+// Create a batch that takes ownership of a PyMem allocated array of events
+static PyObject *
+batch_from_memory(struct input_event *events, Py_ssize_t count, int more)
+{
+    EventBatchObject *self = PyObject_New(EventBatchObject, &EventBatchType);
+    if (self == NULL) {
+        PyMem_Free(events);
+        return NULL;
+    }
+
+    self->data = (char*)events;
+    self->count = count;
+    self->view.obj = NULL;
+    self->more = more;
+    return (PyObject*)self;
+}
+
+
+// Create a batch that views count events at byte offset start of obj
+static PyObject *
+batch_from_object(PyObject *obj, Py_ssize_t start, Py_ssize_t count)
+{
+    EventBatchObject *self = PyObject_New(EventBatchObject, &EventBatchType);
+    if (self == NULL) return NULL;
+
+    if (PyObject_GetBuffer(obj, &self->view, PyBUF_SIMPLE) < 0) {
+        self->view.obj = NULL;
+        self->data = NULL;
+        Py_DECREF(self);
+        return NULL;
+    }
+
+    if (count < 0) {
+        if (self->view.len % EVENT_SIZE != 0) {
+            PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the input_event size");
+            Py_DECREF(self);
+            return NULL;
+        }
+        count = self->view.len / EVENT_SIZE;
+    }
+
+    self->data = (char*)self->view.buf + start;
+    self->count = count;
+    self->more = 0;
+    return (PyObject*)self;
+}
+
+
+static PyObject *
+batch_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    PyObject *obj;
+    static char *kwlist[] = {"buffer", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O:EventBatch", kwlist, &obj))
+        return NULL;
+
+    return batch_from_object(obj, 0, -1);
+}
+
+
+static void
+batch_dealloc(EventBatchObject *self)
+{
+    if (self->view.obj != NULL)
+        PyBuffer_Release(&self->view);
+    else
+        PyMem_Free(self->data);
+
+    PyObject_Free(self);
+}
+
+
+static PyObject *
+batch_event(EventBatchObject *self, Py_ssize_t i)
+{
+    struct input_event event;
+
+    batch_get(self, i, &event);
+    return PyObject_CallFunction(InputEventClass, "llHHi",
+                                 (long)event.input_event_sec,
+                                 (long)event.input_event_usec,
+                                 event.type,
+                                 event.code,
+                                 event.value);
+}
+
+
+static Py_ssize_t
+batch_length(EventBatchObject *self)
+{
+    return self->count;
+}
+
+
+static PyObject *
+batch_item(EventBatchObject *self, Py_ssize_t i)
+{
+    if (i < 0 || i >= self->count) {
+        PyErr_SetString(PyExc_IndexError, "EventBatch index out of range");
+        return NULL;
+    }
+
+    return batch_event(self, i);
+}
+
+
+static PyObject *
+batch_subscript(EventBatchObject *self, PyObject *key)
+{
+    if (PyIndex_Check(key)) {
+        Py_ssize_t i = PyNumber_AsSsize_t(key, PyExc_IndexError);
+        if (i == -1 && PyErr_Occurred()) return NULL;
+        if (i < 0) i += self->count;
+        return batch_item(self, i);
+    }
+
+    if (!PySlice_Check(key)) {
+        PyErr_Format(PyExc_TypeError, "EventBatch indices must be integers or slices, not %.200s",
+                     Py_TYPE(key)->tp_name);
+        return NULL;
+    }
+
+    Py_ssize_t start, stop, step, length;
+    if (PySlice_Unpack(key, &start, &stop, &step) < 0) return NULL;
+    length = PySlice_AdjustIndices(self->count, &start, &stop, step);
+
+    // Contiguous slices share the memory of this batch.
+    if (step == 1)
+        return batch_from_object((PyObject*)self, start*EVENT_SIZE, length);
+
+    struct input_event *events = PyMem_Malloc(EVENT_SIZE*(length ? length : 1));
+    if (events == NULL) return PyErr_NoMemory();
+
+    for (Py_ssize_t i = 0; i < length; i++)
+        batch_get(self, start + i*step, &events[i]);
+
+    return batch_from_memory(events, length, 0);
+}
+
+
+enum { COLUMN_SEC, COLUMN_USEC, COLUMN_TYPE, COLUMN_CODE, COLUMN_VALUE };
+
+static PyObject *
+batch_column(EventBatchObject *self, void *closure)
+{
+    struct input_event event;
+    long value = 0;
+
+    PyObject *column = PyTuple_New(self->count);
+    if (column == NULL) return NULL;
+
+    for (Py_ssize_t i = 0; i < self->count; i++) {
+        batch_get(self, i, &event);
+        switch ((intptr_t)closure) {
+        case COLUMN_SEC:   value = event.input_event_sec;  break;
+        case COLUMN_USEC:  value = event.input_event_usec; break;
+        case COLUMN_TYPE:  value = event.type;  break;
+        case COLUMN_CODE:  value = event.code;  break;
+        case COLUMN_VALUE: value = event.value; break;
+        }
+
+        PyObject *item = PyLong_FromLong(value);
+        if (item == NULL) {
+            Py_DECREF(column);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(column, i, item);
+    }
+
+    return column;
+}
+
+
+static PyObject *
+batch_get_more(EventBatchObject *self, void *closure)
+{
+    return PyBool_FromLong(self->more);
+}
+
+
+// The timestamp of a batch is that of its last event. For a frame, this is
+// the time of the SYN_REPORT that terminates it.
+static PyObject *
+batch_get_time(EventBatchObject *self, void *closure)
+{
+    struct input_event event;
+
+    if (self->count == 0)
+        Py_RETURN_NONE;
+
+    batch_get(self, self->count - 1, &event);
+    if ((intptr_t)closure == COLUMN_SEC)
+        return PyLong_FromLong(event.input_event_sec);
+    return PyLong_FromLong(event.input_event_usec);
+}
+
+
+static PyObject *
+batch_timestamp(EventBatchObject *self, PyObject *unused)
+{
+    struct input_event event;
+
+    if (self->count == 0)
+        Py_RETURN_NONE;
+
+    batch_get(self, self->count - 1, &event);
+    return PyFloat_FromDouble(event.input_event_sec + (event.input_event_usec / 1000000.0));
+}
+
+
+static PyObject *
+batch_timestamp_ns(EventBatchObject *self, PyObject *unused)
+{
+    struct input_event event;
+
+    if (self->count == 0)
+        Py_RETURN_NONE;
+
+    batch_get(self, self->count - 1, &event);
+    return PyLong_FromLongLong((long long)event.input_event_sec * 1000000000LL + event.input_event_usec * 1000LL);
+}
+
+
+static int
+batch_getbuffer(EventBatchObject *self, Py_buffer *view, int flags)
+{
+    return PyBuffer_FillInfo(view, (PyObject*)self, self->data, self->count*EVENT_SIZE, 1, flags);
+}
+
+
+static PyObject *
+batch_repr(EventBatchObject *self)
+{
+    return PyUnicode_FromFormat("<EventBatch of %zd events>", self->count);
+}
+
+
+static PyGetSetDef batch_getset[] = {
+    { "secs",   (getter)batch_column, NULL, "seconds of the event timestamps", (void*)COLUMN_SEC },
+    { "usecs",  (getter)batch_column, NULL, "microseconds of the event timestamps", (void*)COLUMN_USEC },
+    { "types",  (getter)batch_column, NULL, "event types", (void*)COLUMN_TYPE },
+    { "codes",  (getter)batch_column, NULL, "event codes", (void*)COLUMN_CODE },
+    { "values", (getter)batch_column, NULL, "event values", (void*)COLUMN_VALUE },
+    { "more",   (getter)batch_get_more, NULL, "true if the kernel queue may still hold events", NULL },
+    { "sec",    (getter)batch_get_time, NULL, "seconds of the timestamp of the last event", (void*)COLUMN_SEC },
+    { "usec",   (getter)batch_get_time, NULL, "microseconds of the timestamp of the last event", (void*)COLUMN_USEC },
+    { NULL }
+};
+
+static PyMethodDef batch_methods[] = {
+    { "timestamp", (PyCFunction)batch_timestamp, METH_NOARGS, "return the timestamp of the last event as a float" },
+    { "timestamp_ns", (PyCFunction)batch_timestamp_ns, METH_NOARGS, "return the timestamp of the last event as an integer number of nanoseconds" },
+    { NULL }
+};
+
+static PySequenceMethods batch_as_sequence = {
+    .sq_length = (lenfunc)batch_length,
+    .sq_item = (ssizeargfunc)batch_item,
+};
+
+static PyMappingMethods batch_as_mapping = {
+    .mp_length = (lenfunc)batch_length,
+    .mp_subscript = (binaryfunc)batch_subscript,
+};
+
+static PyBufferProcs batch_as_buffer = {
+    .bf_getbuffer = (getbufferproc)batch_getbuffer,
+};
+
+static PyTypeObject EventBatchType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "evdev._input.EventBatch",
+    .tp_doc = "A read-only sequence of input events backed by a buffer of raw input_event structs.",
+    .tp_basicsize = sizeof(EventBatchObject),
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = batch_new,
+    .tp_dealloc = (destructor)batch_dealloc,
+    .tp_repr = (reprfunc)batch_repr,
+    .tp_as_sequence = &batch_as_sequence,
+    .tp_as_mapping = &batch_as_mapping,
+    .tp_as_buffer = &batch_as_buffer,
+    .tp_getset = batch_getset,
+    .tp_methods = batch_methods,
+};
+
+
+// EventFilter selects input events by type, code and value. The codes that
+// pass are kept in one bitmap per event type, so that matching an event takes
+// a bit test and (if values are given) a scan of a few values.
+
+typedef struct {
+    PyObject_HEAD
+    unsigned char codes[EV_CNT][KEY_CNT / 8];   // event type -> bitmap of codes
+    int32_t *values;                            // the values that pass
+    Py_ssize_t num_values;                      // -1 if all values pass
+} EventFilterObject;
+
+static PyTypeObject EventFilterType;
+
+
+static int
+filter_set_codes(EventFilterObject *self, PyObject *evtype, PyObject *codes)
+{
+    long type = PyLong_AsLong(evtype);
+    if (type == -1 && PyErr_Occurred()) return -1;
+    if (type < 0 || type >= EV_CNT) {
+        PyErr_Format(PyExc_ValueError, "event type %ld out of range", type);
+        return -1;
+    }
+
+    if (codes == Py_None) {
+        memset(self->codes[type], 0xff, sizeof(self->codes[type]));
+        return 0;
+    }
+
+    PyObject *iter = PyObject_GetIter(codes);
+    if (iter == NULL) return -1;
+
+    PyObject *item;
+    while ((item = PyIter_Next(iter)) != NULL) {
+        long code = PyLong_AsLong(item);
+        Py_DECREF(item);
+        if (code == -1 && PyErr_Occurred()) {
+            Py_DECREF(iter);
+            return -1;
+        }
+        if (code < 0 || code >= KEY_CNT) {
+            Py_DECREF(iter);
+            PyErr_Format(PyExc_ValueError, "event code %ld out of range", code);
+            return -1;
+        }
+        self->codes[type][code / 8] |= 1 << (code % 8);
+    }
+    Py_DECREF(iter);
+
+    return PyErr_Occurred() ? -1 : 0;
+}
+
+
+static PyObject *
+filter_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    PyObject *events = Py_None, *values = Py_None;
+    static char *kwlist[] = {"events", "values", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OO:EventFilter", kwlist, &events, &values))
+        return NULL;
+
+    EventFilterObject *self = (EventFilterObject*)type->tp_alloc(type, 0);
+    if (self == NULL) return NULL;
+    self->values = NULL;
+    self->num_values = -1;
+
+    if (events == Py_None) {
+        memset(self->codes, 0xff, sizeof(self->codes));
+    } else {
+        PyObject *items = PyMapping_Items(events);
+        if (items == NULL) goto on_err;
+
+        for (Py_ssize_t i = 0; i < PyList_GET_SIZE(items); i++) {
+            PyObject *item = PyList_GET_ITEM(items, i);
+            if (filter_set_codes(self, PyTuple_GET_ITEM(item, 0), PyTuple_GET_ITEM(item, 1)) < 0) {
+                Py_DECREF(items);
+                goto on_err;
+            }
+        }
+        Py_DECREF(items);
+    }
+
+    if (values != Py_None) {
+        PyObject *seq = PySequence_Fast(values, "values must be an iterable of integers");
+        if (seq == NULL) goto on_err;
+
+        Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+        self->values = PyMem_Malloc((n ? n : 1) * sizeof(int32_t));
+        if (self->values == NULL) {
+            Py_DECREF(seq);
+            PyErr_NoMemory();
+            goto on_err;
+        }
+
+        for (Py_ssize_t i = 0; i < n; i++) {
+            long value = PyLong_AsLong(PySequence_Fast_GET_ITEM(seq, i));
+            if (value == -1 && PyErr_Occurred()) {
+                Py_DECREF(seq);
+                goto on_err;
+            }
+            self->values[i] = (int32_t)value;
+        }
+        self->num_values = n;
+        Py_DECREF(seq);
+    }
+
+    return (PyObject*)self;
+
+  on_err:
+    Py_DECREF(self);
+    return NULL;
+}
+
+
+static void
+filter_dealloc(EventFilterObject *self)
+{
+    PyMem_Free(self->values);
+    Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+static inline int
+filter_match(EventFilterObject *self, const struct input_event *event)
+{
+    if (event->type >= EV_CNT || event->code >= KEY_CNT)
+        return 0;
+    if (!test_bit((const char*)self->codes[event->type], event->code))
+        return 0;
+    if (self->num_values < 0)
+        return 1;
+    for (Py_ssize_t i = 0; i < self->num_values; i++) {
+        if (self->values[i] == event->value)
+            return 1;
+    }
+    return 0;
+}
+
+
+// Move the events that pass a filter to the front of an array and return their number
+static Py_ssize_t
+filter_events(EventFilterObject *self, struct input_event *events, Py_ssize_t count)
+{
+    Py_ssize_t n = 0;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        if (filter_match(self, &events[i])) {
+            if (n != i)
+                events[n] = events[i];
+            n++;
+        }
+    }
+    return n;
+}
+
+
+static PyObject *
+filter_apply(EventFilterObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+
+    if (!PyArg_ParseTuple(args, "y*", &buffer))
+        return NULL;
+
+    if (buffer.len % EVENT_SIZE != 0) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the input_event size");
+        return NULL;
+    }
+
+    Py_ssize_t count = buffer.len / EVENT_SIZE;
+    struct input_event *events = PyMem_Malloc(count ? buffer.len : 1);
+    if (events == NULL) {
+        PyBuffer_Release(&buffer);
+        return PyErr_NoMemory();
+    }
+
+    // The buffer may not be aligned, so copy it before looking at the events.
+    memcpy(events, buffer.buf, buffer.len);
+    PyBuffer_Release(&buffer);
+
+    Py_ssize_t n = filter_events(self, events, count);
+    if (n > 0 && n < count) {
+        struct input_event *shrunk = PyMem_Realloc(events, EVENT_SIZE*n);
+        if (shrunk != NULL)
+            events = shrunk;
+    }
+
+    return batch_from_memory(events, n, 0);
+}
+
+
+static PyObject *
+filter_match_event(EventFilterObject *self, PyObject *args)
+{
+    struct input_event event;
+    unsigned short type, code;
+    int value;
+
+    if (!PyArg_ParseTuple(args, "HHi", &type, &code, &value))
+        return NULL;
+
+    event.type = type;
+    event.code = code;
+    event.value = value;
+    return PyBool_FromLong(filter_match(self, &event));
+}
+
+
+static PyMethodDef filter_methods[] = {
+    { "apply", (PyCFunction)filter_apply, METH_VARARGS,
+      "return an EventBatch with the events of a buffer of input_event structs that pass the filter" },
+    { "match", (PyCFunction)filter_match_event, METH_VARARGS,
+      "return true if an event with the given type, code and value passes the filter" },
+    { NULL }
+};
+
+static PyTypeObject EventFilterType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "evdev._input.EventFilter",
+    .tp_basicsize = sizeof(EventFilterObject),
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = "EventFilter(events=None, values=None)\n"
+              "--\n\n"
+              "A filter that selects input events by type, code and value.\n\n"
+              "events maps event types to the codes that pass the filter, or to None to let\n"
+              "all codes of a type pass. Events of other types are filtered out. All events\n"
+              "pass if events is None. values are the event values that pass the filter,\n"
+              "e.g. (1,) for key presses only. All values pass if values is None.",
+    .tp_new = filter_new,
+    .tp_dealloc = (destructor)filter_dealloc,
+    .tp_methods = filter_methods,
+};
+
+
+// Motion coalescing merges the EV_REL and EV_ABS events of a frame into one
+// event per code - relative deltas are summed and the last absolute value is
+// kept. With a time window, consecutive frames that consist of nothing but
+// motion are merged too, as long as they start within the window of the first
+// frame. Other events (keys, multitouch axes, SYN_DROPPED etc) are passed
+// through and end the merging, so that they stay in order with the motion.
+
+static inline int
+is_motion(const struct input_event *event)
+{
+    return event->type == EV_REL || (event->type == EV_ABS && event->code < ABS_MT_SLOT);
+}
+
+
+static inline int
+is_report(const struct input_event *event)
+{
+    return event->type == EV_SYN && event->code == SYN_REPORT;
+}
+
+
+// Coalesce an array of events in place and return the number of events left.
+// A window of 0 merges within frames only.
+static Py_ssize_t
+coalesce_events(struct input_event *events, Py_ssize_t count, long long window_us)
+{
+    Py_ssize_t rel_slots[REL_CNT], abs_slots[ABS_MT_SLOT];  // code -> output index, or -1
+    Py_ssize_t n = 0, i = 0;
+    long long group_start = 0;
+    int group_open = 0;
+
+    while (i < count) {
+        // Find the end of the frame and whether it holds anything but motion.
+        Py_ssize_t end = i;
+        int motion_only = 1;
+        while (end < count && !is_report(&events[end])) {
+            if (!is_motion(&events[end]))
+                motion_only = 0;
+            end++;
+        }
+        int complete = end < count;
+
+        long long start = (long long)events[i].input_event_sec * 1000000LL + events[i].input_event_usec;
+        int join = group_open && window_us > 0 && motion_only && complete && start - group_start <= window_us;
+
+        if (join) {
+            // Drop the SYN_REPORT of the group - it is replaced by this frame's.
+            n--;
+        } else {
+            memset(rel_slots, -1, sizeof(rel_slots));
+            memset(abs_slots, -1, sizeof(abs_slots));
+            group_start = start;
+            group_open = motion_only && complete;
+        }
+
+        for (Py_ssize_t k = i; k < end; k++) {
+            struct input_event *event = &events[k];
+            Py_ssize_t *slot = NULL;
+
+            if (event->type == EV_REL && event->code < REL_CNT)
+                slot = &rel_slots[event->code];
+            else if (event->type == EV_ABS && event->code < ABS_MT_SLOT)
+                slot = &abs_slots[event->code];
+
+            if (slot != NULL && *slot >= 0) {
+                struct input_event *merged = &events[*slot];
+                int32_t value = event->value;
+                if (event->type == EV_REL) {
+                    // Saturate rather than wrap around on absurd totals.
+                    long long sum = (long long)merged->value + event->value;
+                    value = sum > INT32_MAX ? INT32_MAX : sum < INT32_MIN ? INT32_MIN : (int32_t)sum;
+                }
+                *merged = *event;
+                merged->value = value;
+                continue;
+            }
+
+            if (slot != NULL)
+                *slot = n;
+            events[n++] = *event;
+        }
+
+        if (complete)
+            events[n++] = events[end];
+        i = end + 1;
+    }
+
+    return n;
+}
+
+
+// Convert a coalescing window in seconds to microseconds, or -1 if it is None
+static int
+parse_coalesce(PyObject *window, long long *window_us)
+{
+    if (window == Py_None) {
+        *window_us = -1;
+        return 0;
+    }
+
+    double seconds = PyFloat_AsDouble(window);
+    if (seconds == -1.0 && PyErr_Occurred())
+        return -1;
+    if (seconds < 0) {
+        PyErr_SetString(PyExc_ValueError, "coalescing window must not be negative");
+        return -1;
+    }
+
+    *window_us = (long long)(seconds * 1000000.0);
+    return 0;
+}
+
+
+// Coalesce the motion events of a buffer of input_event structs into an EventBatch
+static PyObject *
+coalesce(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+    PyObject *window = NULL;
+    long long window_us = 0;
+
+    if (!PyArg_ParseTuple(args, "y*|O", &buffer, &window))
+        return NULL;
+
+    if (window != NULL && parse_coalesce(window, &window_us) < 0) {
+        PyBuffer_Release(&buffer);
+        return NULL;
+    }
+
+    if (buffer.len % EVENT_SIZE != 0) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the input_event size");
+        return NULL;
+    }
+
+    Py_ssize_t count = buffer.len / EVENT_SIZE;
+    struct input_event *events = PyMem_Malloc(count ? buffer.len : 1);
+    if (events == NULL) {
+        PyBuffer_Release(&buffer);
+        return PyErr_NoMemory();
+    }
+
+    memcpy(events, buffer.buf, buffer.len);
+    PyBuffer_Release(&buffer);
+
+    Py_ssize_t n = coalesce_events(events, count, window_us < 0 ? 0 : window_us);
+    if (n > 0 && n < count) {
+        struct input_event *shrunk = PyMem_Realloc(events, EVENT_SIZE*n);
+        if (shrunk != NULL)
+            events = shrunk;
+    }
+
+    return batch_from_memory(events, n, 0);
+}
+
+
+// Index the frames of a buffer of input_event structs. A frame starts with the
+// first event after a SYN_REPORT, and one is added to the index whenever its
+// timestamp is interval_ns past that of the last one added, or earlier than it
+// (when the clock went backwards). Return a tuple of (entries, next_ns,
+// at_start), where entries is a list of (timestamp_ns, event index) tuples and
+// next_ns and at_start are the state to pass in with the buffer that follows.
+static PyObject *
+index_frames(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+    long long interval_ns = 0, next_ns = LLONG_MIN;
+    int at_start = 1;
+
+    if (!PyArg_ParseTuple(args, "y*|LLp", &buffer, &interval_ns, &next_ns, &at_start))
+        return NULL;
+
+    if (buffer.len % EVENT_SIZE != 0) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the input_event size");
+        return NULL;
+    }
+
+    PyObject *entries = PyList_New(0);
+    if (entries == NULL) {
+        PyBuffer_Release(&buffer);
+        return NULL;
+    }
+
+    long long last_ns = next_ns == LLONG_MIN ? LLONG_MIN : next_ns - interval_ns;
+    Py_ssize_t count = buffer.len / EVENT_SIZE;
+    struct input_event event;
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        memcpy(&event, (char*)buffer.buf + i*EVENT_SIZE, EVENT_SIZE);
+
+        if (at_start) {
+            long long ns = (long long)event.input_event_sec * 1000000000LL + event.input_event_usec * 1000LL;
+            if (ns >= next_ns || ns < last_ns) {
+                PyObject *entry = Py_BuildValue("(Ln)", ns, i);
+                if (entry == NULL || PyList_Append(entries, entry) < 0) {
+                    Py_XDECREF(entry);
+                    Py_DECREF(entries);
+                    PyBuffer_Release(&buffer);
+                    return NULL;
+                }
+                Py_DECREF(entry);
+                last_ns = ns;
+                next_ns = ns + interval_ns;
+            }
+        }
+        at_start = event.type == EV_SYN && event.code == SYN_REPORT;
+    }
+
+    PyBuffer_Release(&buffer);
+    return Py_BuildValue("(NLO)", entries, next_ns, at_start ? Py_True : Py_False);
+}
+
+
+// Fill in an event from a (type, code, value) tuple, which is stamped with sec
+// and usec, or an object with sec, usec, type, code and value attributes, such
+// as an InputEvent.
+static int
+event_from_object(PyObject *item, long sec, long usec, struct input_event *event)
+{
+    PyObject *fields[5] = { NULL, NULL, NULL, NULL, NULL };
+    static const char *names[5] = { "sec", "usec", "type", "code", "value" };
+    long values[5] = { sec, usec };
+    int first = 0, ret = -1;
+
+    if (PyTuple_Check(item)) {
+        if (PyTuple_GET_SIZE(item) != 3) {
+            PyErr_SetString(PyExc_TypeError, "event tuples must be (type, code, value)");
+            return -1;
+        }
+        first = 2;
+        for (int i = first; i < 5; i++)
+            fields[i] = Py_NewRef(PyTuple_GET_ITEM(item, i - first));
+    } else {
+        for (int i = 0; i < 5; i++)
+            if ((fields[i] = PyObject_GetAttrString(item, names[i])) == NULL)
+                goto out;
+    }
+
+    for (int i = first; i < 5; i++) {
+        values[i] = PyLong_AsLong(fields[i]);
+        if (values[i] == -1 && PyErr_Occurred())
+            goto out;
+    }
+
+    if (values[2] < 0 || values[2] > 0xffff || values[3] < 0 || values[3] > 0xffff
+        || values[4] < INT32_MIN || values[4] > INT32_MAX) {
+        PyErr_Format(PyExc_ValueError, "event (%ld, %ld, %ld) out of range", values[2], values[3], values[4]);
+        goto out;
+    }
+
+    memset(event, 0, sizeof(*event));
+    event->input_event_sec = values[0];
+    event->input_event_usec = values[1];
+    event->type = values[2];
+    event->code = values[3];
+    event->value = values[4];
+    ret = 0;
+
+  out:
+    for (int i = 0; i < 5; i++)
+        Py_XDECREF(fields[i]);
+    return ret;
+}
+
+
+// Pack an iterable of events - see event_from_object() - into an EventBatch.
+static PyObject *
+pack_events(PyObject *self, PyObject *args)
+{
+    PyObject *obj;
+    long sec = 0, usec = 0;
+
+    if (!PyArg_ParseTuple(args, "O|ll", &obj, &sec, &usec))
+        return NULL;
+
+    PyObject *items = PySequence_Tuple(obj);
+    if (items == NULL)
+        return NULL;
+
+    Py_ssize_t count = PyTuple_GET_SIZE(items);
+    struct input_event *events = PyMem_Malloc(EVENT_SIZE*count);
+    if (events == NULL) {
+        Py_DECREF(items);
+        return PyErr_NoMemory();
+    }
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        if (event_from_object(PyTuple_GET_ITEM(items, i), sec, usec, &events[i]) < 0) {
+            Py_DECREF(items);
+            PyMem_Free(events);
+            return NULL;
+        }
+    }
+
+    Py_DECREF(items);
+    return batch_from_memory(events, count, 0);
+}
+
+
+// Apply a buffer of input_event structs to the state of a device, as kept by
+// evdev.state.DeviceState: one byte per code for keys, LEDs and switches (or
+// None for types the device does not have), an int32 per ABS_* code for the
+// absolute axes and num_slots rows of ABS_CNT int32s for the multitouch axes.
+// The selected slot is the ABS_MT_SLOT entry of the axes. Updating stops at a
+// SYN_DROPPED, whose index is returned. Return None if there is none.
+static PyObject *
+update_state(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer, absv, slotv;
+    PyObject *bitmap_objs[3];
+    Py_buffer bitmaps[3] = {{0}};
+    int num_slots;
+
+    if (!PyArg_ParseTuple(args, "y*OOOw*w*i", &buffer, &bitmap_objs[0], &bitmap_objs[1], &bitmap_objs[2],
+                          &absv, &slotv, &num_slots))
+        return NULL;
+
+    PyObject *result = NULL;
+
+    for (int i = 0; i < 3; i++) {
+        if (bitmap_objs[i] != Py_None && PyObject_GetBuffer(bitmap_objs[i], &bitmaps[i], PyBUF_WRITABLE) < 0)
+            goto done;
+    }
+
+    if (buffer.len % EVENT_SIZE != 0) {
+        PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the input_event size");
+        goto done;
+    }
+    if (absv.len < (Py_ssize_t)sizeof(int32_t)*ABS_CNT || num_slots < 0
+        || slotv.len < (Py_ssize_t)sizeof(int32_t)*ABS_CNT*num_slots) {
+        PyErr_SetString(PyExc_ValueError, "axis buffers are too small");
+        goto done;
+    }
+
+    int32_t *abs_values = absv.buf, *slot_values = slotv.buf;
+    Py_ssize_t count = buffer.len / EVENT_SIZE;
+    struct input_event event;
+
+    for (Py_ssize_t i = 0; i < count; i++) {
+        memcpy(&event, (char*)buffer.buf + i*EVENT_SIZE, EVENT_SIZE);
+
+        Py_buffer *bitmap = NULL;
+        switch (event.type) {
+        case EV_SYN:
+            if (event.code == SYN_DROPPED) {
+                result = PyLong_FromSsize_t(i);
+                goto done;
+            }
+            continue;
+        case EV_KEY: bitmap = &bitmaps[0]; break;
+        case EV_LED: bitmap = &bitmaps[1]; break;
+        case EV_SW:  bitmap = &bitmaps[2]; break;
+        case EV_ABS:
+            if (event.code >= ABS_CNT)
+                continue;
+            if (num_slots && event.code > ABS_MT_SLOT && event.code <= ABS_MT_TOOL_Y) {
+                int32_t slot = abs_values[ABS_MT_SLOT];
+                if (slot >= 0 && slot < num_slots)
+                    slot_values[slot*ABS_CNT + event.code] = event.value;
+            } else {
+                abs_values[event.code] = event.value;
+            }
+            continue;
+        default:
+            continue;
+        }
+
+        if (bitmap->buf != NULL && event.code < bitmap->len)
+            ((char*)bitmap->buf)[event.code] = event.value != 0;
+    }
+    result = Py_NewRef(Py_None);
+
+done:
+    for (int i = 0; i < 3; i++) {
+        if (bitmaps[i].obj != NULL)
+            PyBuffer_Release(&bitmaps[i]);
+    }
+    PyBuffer_Release(&buffer);
+    PyBuffer_Release(&absv);
+    PyBuffer_Release(&slotv);
+    return result;
+}
+
+
+// The delta encoding of recordings stores events in blocks that can be decoded
+// independently of each other. A block is a header (payload size, number of
+// events and timestamp of the first event in microseconds, little-endian)
+// followed by the payload:
+//
+//   - The number of distinct (type, code) pairs in the block, followed by the
+//     pairs themselves. Events refer to a pair by its position in this list.
+//   - For every event: the difference of its timestamp to that of the previous
+//     event in microseconds, the position of its (type, code) pair and the
+//     difference of its value to that of the previous event with that pair.
+//
+// All numbers in the payload are LEB128 varints and the differences are
+// zig-zag encoded, so that the small differences of typical input take a
+// byte or two.
+
+#define BLOCK_HEADER_SIZE 16
+
+static inline uint64_t zigzag(int64_t n) { return ((uint64_t)n << 1) ^ (uint64_t)(n >> 63); }
+static inline int64_t unzigzag(uint64_t n) { return (int64_t)(n >> 1) ^ -(int64_t)(n & 1); }
+
+static inline unsigned char *
+put_varint(unsigned char *p, uint64_t n)
+{
+    while (n >= 0x80) {
+        *p++ = (unsigned char)(n | 0x80);
+        n >>= 7;
+    }
+    *p++ = (unsigned char)n;
+    return p;
+}
+
+// Read a varint from [*p, end). Return -1 if it runs past end or is too long.
+static inline int
+get_varint(const unsigned char **p, const unsigned char *end, uint64_t *n)
+{
+    uint64_t result = 0;
+    for (int shift = 0; shift < 64 && *p < end; shift += 7) {
+        unsigned char byte = *(*p)++;
+        result |= (uint64_t)(byte & 0x7f) << shift;
+        if (!(byte & 0x80)) {
+            *n = result;
+            return 0;
+        }
+    }
+    return -1;
+}
+
+static inline void
+put_u32(unsigned char *p, uint32_t n)
+{
+    for (int i = 0; i < 4; i++) p[i] = (unsigned char)(n >> (8*i));
+}
+
+static inline uint32_t
+get_u32(const unsigned char *p)
+{
+    return p[0] | (uint32_t)p[1] << 8 | (uint32_t)p[2] << 16 | (uint32_t)p[3] << 24;
+}
+
+static inline int64_t
+event_usec(const struct input_event *event)
+{
+    return (int64_t)event->input_event_sec * 1000000 + event->input_event_usec;
+}
+
+
+// Encode a buffer of input_event structs as one block
+static PyObject *
+encode_block(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+
+    if (!PyArg_ParseTuple(args, "y*", &buffer))
+        return NULL;
+
+    if (buffer.len % EVENT_SIZE != 0 || buffer.len / EVENT_SIZE > UINT32_MAX) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the input_event size");
+        return NULL;
+    }
+
+    Py_ssize_t count = buffer.len / EVENT_SIZE;
+    struct input_event *events = PyMem_Malloc(count ? buffer.len : 1);
+    uint16_t *ids = PyMem_Calloc(EV_CNT * KEY_CNT, sizeof(uint16_t));  // (type, code) -> position + 1
+    int32_t *last = PyMem_Calloc(count ? count : 1, sizeof(int32_t));  // position -> previous value
+    // The dictionary takes at most 6 bytes per pair and an event at most 25.
+    unsigned char *out = PyMem_Malloc(BLOCK_HEADER_SIZE + 10 + 31*count);
+
+    if (events == NULL || ids == NULL || last == NULL || out == NULL) {
+        PyErr_NoMemory();
+        goto on_err;
+    }
+
+    memcpy(events, buffer.buf, buffer.len);
+
+    // Number the (type, code) pairs in the order they first appear.
+    Py_ssize_t num_pairs = 0;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        if (events[i].type >= EV_CNT || events[i].code >= KEY_CNT) {
+            PyErr_Format(PyExc_ValueError, "event type %d or code %d out of range", events[i].type, events[i].code);
+            goto on_err;
+        }
+        uint16_t *id = &ids[events[i].type * KEY_CNT + events[i].code];
+        if (*id == 0) {
+            if (num_pairs == UINT16_MAX) {
+                PyErr_SetString(PyExc_ValueError, "too many distinct event codes in one block");
+                goto on_err;
+            }
+            *id = (uint16_t)++num_pairs;
+        }
+    }
+
+    unsigned char *p = put_varint(out + BLOCK_HEADER_SIZE, num_pairs);
+    for (Py_ssize_t i = 0, n = 0; i < count && n < num_pairs; i++) {
+        uint16_t id = ids[events[i].type * KEY_CNT + events[i].code];
+        if (id == n + 1) {
+            p = put_varint(p, events[i].type);
+            p = put_varint(p, events[i].code);
+            n++;
+        }
+    }
+
+    int64_t base = count ? event_usec(&events[0]) : 0, previous = base;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        int64_t time = event_usec(&events[i]);
+        uint16_t id = ids[events[i].type * KEY_CNT + events[i].code] - 1;
+        p = put_varint(p, zigzag(time - previous));
+        p = put_varint(p, id);
+        p = put_varint(p, zigzag((int64_t)events[i].value - last[id]));
+        last[id] = events[i].value;
+        previous = time;
+    }
+
+    Py_ssize_t size = p - out;
+    put_u32(out, (uint32_t)(size - BLOCK_HEADER_SIZE));
+    put_u32(out + 4, (uint32_t)count);
+    put_u32(out + 8, (uint32_t)((uint64_t)base & 0xffffffff));
+    put_u32(out + 12, (uint32_t)((uint64_t)base >> 32));
+
+    PyObject *result = PyBytes_FromStringAndSize((char*)out, size);
+    PyMem_Free(events);
+    PyMem_Free(ids);
+    PyMem_Free(last);
+    PyMem_Free(out);
+    PyBuffer_Release(&buffer);
+    return result;
+
+  on_err:
+    PyMem_Free(events);
+    PyMem_Free(ids);
+    PyMem_Free(last);
+    PyMem_Free(out);
+    PyBuffer_Release(&buffer);
+    return NULL;
+}
+
+
+// Read the header of a block: return (payload size, number of events, timestamp in microseconds)
+static PyObject *
+block_header(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+    Py_ssize_t offset = 0;
+
+    if (!PyArg_ParseTuple(args, "y*|n", &buffer, &offset))
+        return NULL;
+
+    if (offset < 0 || buffer.len - offset < BLOCK_HEADER_SIZE) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "truncated block header");
+        return NULL;
+    }
+
+    const unsigned char *p = (const unsigned char*)buffer.buf + offset;
+    uint32_t size = get_u32(p), count = get_u32(p + 4);
+    int64_t base = (int64_t)((uint64_t)get_u32(p + 8) | (uint64_t)get_u32(p + 12) << 32);
+    PyBuffer_Release(&buffer);
+
+    return Py_BuildValue("(kkL)", (unsigned long)size, (unsigned long)count, (long long)base);
+}
+
+
+// Decode a block (header and payload) into an EventBatch
+static PyObject *
+decode_block(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+    struct input_event *events = NULL;
+    struct { uint16_t type, code; int32_t last; } *pairs = NULL;
+
+    if (!PyArg_ParseTuple(args, "y*", &buffer))
+        return NULL;
+
+    const unsigned char *p = buffer.buf, *end = p + buffer.len;
+    if (buffer.len < BLOCK_HEADER_SIZE || buffer.len - BLOCK_HEADER_SIZE != get_u32(p))
+        goto on_corrupt;
+
+    uint32_t count = get_u32(p + 4);
+    int64_t time = (int64_t)((uint64_t)get_u32(p + 8) | (uint64_t)get_u32(p + 12) << 32);
+    p += BLOCK_HEADER_SIZE;
+
+    // Every event takes at least three bytes, which bounds what a corrupt count can allocate.
+    if ((Py_ssize_t)count > (end - p) / 3 + 1)
+        goto on_corrupt;
+
+    uint64_t num_pairs, n;
+    if (get_varint(&p, end, &num_pairs) < 0 || num_pairs > (uint64_t)(end - p) / 2)
+        goto on_corrupt;
+
+    pairs = PyMem_Calloc(num_pairs ? num_pairs : 1, sizeof(*pairs));
+    events = PyMem_Malloc(count ? count*EVENT_SIZE : 1);
+    if (pairs == NULL || events == NULL) {
+        PyErr_NoMemory();
+        goto on_err;
+    }
+
+    for (uint64_t i = 0; i < num_pairs; i++) {
+        uint64_t type, code;
+        if (get_varint(&p, end, &type) < 0 || get_varint(&p, end, &code) < 0 || type > 0xffff || code > 0xffff)
+            goto on_corrupt;
+        pairs[i].type = (uint16_t)type;
+        pairs[i].code = (uint16_t)code;
+    }
+
+    for (uint32_t i = 0; i < count; i++) {
+        uint64_t id;
+        if (get_varint(&p, end, &n) < 0 || get_varint(&p, end, &id) < 0 || id >= num_pairs)
+            goto on_corrupt;
+        time += unzigzag(n);
+
+        if (get_varint(&p, end, &n) < 0)
+            goto on_corrupt;
+        pairs[id].last = (int32_t)(pairs[id].last + unzigzag(n));
+
+        struct input_event *event = &events[i];
+        memset(event, 0, sizeof(*event));
+        event->input_event_sec = time / 1000000;
+        event->input_event_usec = time % 1000000;
+        event->type = pairs[id].type;
+        event->code = pairs[id].code;
+        event->value = pairs[id].last;
+    }
+
+    if (p != end)
+        goto on_corrupt;
+
+    PyMem_Free(pairs);
+    PyBuffer_Release(&buffer);
+    return batch_from_memory(events, count, 0);
+
+  on_corrupt:
+    PyErr_SetString(PyExc_ValueError, "corrupt block");
+  on_err:
+    PyMem_Free(pairs);
+    PyMem_Free(events);
+    PyBuffer_Release(&buffer);
+    return NULL;
+}
+
+
+
+static const char *
+skip_blanks(const char *p, const char *end)
+{
+    while (p < end && (*p == ' ' || *p == '\t'))
+        p++;
+    return p;
+}
+
+
+// Parse up to max_digits digits in base 10 or 16. Returns NULL if there are none.
+static const char *
+parse_digits(const char *p, const char *end, int base, int max_digits, unsigned long long *out)
+{
+    const char *start = p;
+    unsigned long long n = 0;
+
+    for (; p < end && p - start < max_digits; p++) {
+        int digit;
+        if (*p >= '0' && *p <= '9') digit = *p - '0';
+        else if (base == 16 && *p >= 'a' && *p <= 'f') digit = *p - 'a' + 10;
+        else if (base == 16 && *p >= 'A' && *p <= 'F') digit = *p - 'A' + 10;
+        else break;
+        n = n * base + digit;
+    }
+
+    *out = n;
+    return p == start ? NULL : p;
+}
+
+
+// Parse " <sec>.<usec> <type> <code> <value>" - the rest of an evemu "E:" line.
+static int
+parse_evemu_event(const char *p, const char *end, struct input_event *event)
+{
+    unsigned long long sec, usec, type, code, value;
+    const char *digits;
+    int negative = 0;
+
+    p = parse_digits(skip_blanks(p, end), end, 10, 18, &sec);
+    if (p == NULL || p >= end || *p++ != '.')
+        return -1;
+
+    digits = p;
+    p = parse_digits(p, end, 10, 6, &usec);
+    if (p == NULL)
+        return -1;
+    for (Py_ssize_t n = p - digits; n < 6; n++)
+        usec *= 10;
+
+    p = parse_digits(skip_blanks(p, end), end, 16, 4, &type);
+    if (p == NULL || p == end || (*p != ' ' && *p != '\t'))
+        return -1;
+    p = parse_digits(skip_blanks(p, end), end, 16, 4, &code);
+    if (p == NULL || p == end || (*p != ' ' && *p != '\t'))
+        return -1;
+
+    p = skip_blanks(p, end);
+    if (p < end && *p == '-') {
+        negative = 1;
+        p++;
+    }
+    p = parse_digits(p, end, 10, 10, &value);
+    if (p == NULL || value > (unsigned long long)INT32_MAX + negative)
+        return -1;
+
+    // Anything after the event must be a comment.
+    p = skip_blanks(p, end);
+    if (p < end && *p != '#' && *p != '\r')
+        return -1;
+
+    memset(event, 0, sizeof(*event));
+    event->input_event_sec = sec;
+    event->input_event_usec = usec;
+    event->type = type;
+    event->code = code;
+    event->value = negative ? (int32_t)(-(long long)value) : (int32_t)value;
+    return 0;
+}
+
+
+// Parse the "E:" lines of evemu-record output into an EventBatch, skipping all
+// other lines. A last line without a newline is left for the next call, unless
+// final is true. Return (batch, number of bytes consumed).
+static PyObject *
+parse_evemu(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+    int final = 0;
+
+    if (!PyArg_ParseTuple(args, "y*|p", &buffer, &final))
+        return NULL;
+
+    const char *start = buffer.buf, *end = start + buffer.len, *p = start;
+
+    // The shortest event line, "E: 0.0 0 0 0\n", takes 13 bytes.
+    struct input_event *events = PyMem_Malloc((buffer.len / 13 + 1) * EVENT_SIZE);
+    if (events == NULL) {
+        PyBuffer_Release(&buffer);
+        return PyErr_NoMemory();
+    }
+
+    Py_ssize_t count = 0;
+    while (p < end) {
+        const char *eol = memchr(p, '\n', end - p);
+        if (eol == NULL) {
+            if (!final)
+                break;
+            eol = end;
+        }
+
+        if (eol - p >= 2 && p[0] == 'E' && p[1] == ':') {
+            if (parse_evemu_event(p + 2, eol, &events[count]) < 0) {
+                PyErr_Format(PyExc_ValueError, "malformed evemu event at byte %zd", (Py_ssize_t)(p - start));
+                PyMem_Free(events);
+                PyBuffer_Release(&buffer);
+                return NULL;
+            }
+            count++;
+        }
+        p = eol < end ? eol + 1 : end;
+    }
+
+    Py_ssize_t consumed = p - start;
+    PyBuffer_Release(&buffer);
+
+    PyObject *batch = batch_from_memory(events, count, 0);
+    if (batch == NULL)
+        return NULL;
+    return Py_BuildValue("(Nn)", batch, consumed);
+}
+
+
+static char *
+put_decimal(char *p, long long n)
+{
+    char digits[24];
+    int len = 0;
+    unsigned long long u = n < 0 ? -(unsigned long long)n : (unsigned long long)n;
+
+    if (n < 0)
+        *p++ = '-';
+    do {
+        digits[len++] = '0' + u % 10;
+        u /= 10;
+    } while (u);
+    while (len)
+        *p++ = digits[--len];
+    return p;
+}
+
+
+static char *
+put_hex4(char *p, unsigned int n)
+{
+    static const char hex[] = "0123456789abcdef";
+    p[0] = hex[(n >> 12) & 0xf];
+    p[1] = hex[(n >> 8) & 0xf];
+    p[2] = hex[(n >> 4) & 0xf];
+    p[3] = hex[n & 0xf];
+    return p + 4;
+}
+
+
+// Format a buffer of input events as evemu "E:" lines
+static PyObject *
+format_evemu(PyObject *self, PyObject *args)
+{
+    Py_buffer buffer;
+
+    if (!PyArg_ParseTuple(args, "y*", &buffer))
+        return NULL;
+
+    if (buffer.len % EVENT_SIZE != 0) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the input_event size");
+        return NULL;
+    }
+
+    // "E: " + 20 + "." + 6 + " " + 4 + " " + 4 + " " + 11 + "\n" fits in 64 bytes.
+    Py_ssize_t count = buffer.len / EVENT_SIZE;
+    PyObject *out = PyBytes_FromStringAndSize(NULL, count * 64);
+    if (out == NULL) {
+        PyBuffer_Release(&buffer);
+        return NULL;
+    }
+
+    // The buffer may be any bytes-like object, so events are copied out of it
+    // rather than read in place, where they may not be aligned.
+    struct input_event event;
+    char *start = PyBytes_AS_STRING(out), *p = start;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        memcpy(&event, (char*)buffer.buf + i*EVENT_SIZE, EVENT_SIZE);
+        long usec = event.input_event_usec;
+
+        memcpy(p, "E: ", 3);
+        p = put_decimal(p + 3, event.input_event_sec);
+        *p++ = '.';
+        for (long scale = 100000; scale; scale /= 10)
+            *p++ = '0' + (usec / scale) % 10;
+        *p++ = ' ';
+        p = put_hex4(p, event.type);
+        *p++ = ' ';
+        p = put_hex4(p, event.code);
+        *p++ = ' ';
+        p = put_decimal(p, event.value);
+        *p++ = '\n';
+    }
+    PyBuffer_Release(&buffer);
+
+    if (_PyBytes_Resize(&out, p - start) < 0)
+        return NULL;
+    return out;
+}
+
+// Read multiple input events from a device and return them as an EventBatch.
+// If a filter is given, only the events that pass it are kept. If a coalescing
+// window is given, the motion events that remain are coalesced.
+static PyObject *
+device_read_batch(PyObject *self, PyObject *args)
+{
+    int fd, drain = 0;
+    Py_ssize_t max_events = 64;
+    PyObject *filter = Py_None, *window = Py_None;
+    long long window_us;
+
+    int ret = PyArg_ParseTuple(args, "i|npOO", &fd, &max_events, &drain, &filter, &window);
+    if (!ret) return NULL;
+
+    if (parse_coalesce(window, &window_us) < 0)
+        return NULL;
+
+    if (max_events < 1) {
+        PyErr_SetString(PyExc_ValueError, "max_events must be positive");
+        return NULL;
+    }
+
+    if (filter != Py_None && !PyObject_TypeCheck(filter, &EventFilterType)) {
+        PyErr_SetString(PyExc_TypeError, "filter must be an EventFilter or None");
+        return NULL;
+    }
+
+    struct input_event *events;
+    ssize_t num_events = read_events(fd, &events, max_events, drain);
+
+    if (num_events < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    // A full buffer means that there may be more events in the queue. When
+    // draining, reading stops only once the queue is empty.
+    int more = !drain && num_events == max_events;
+
+    if (filter != Py_None)
+        num_events = filter_events((EventFilterObject*)filter, events, num_events);
+    if (window_us >= 0)
+        num_events = coalesce_events(events, num_events, window_us);
+
+    // Give back what the buffer was over-allocated by.
+    if (num_events > 0 && num_events < max_events) {
+        struct input_event *shrunk = PyMem_Realloc(events, EVENT_SIZE*num_events);
+        if (shrunk != NULL)
+            events = shrunk;
+    }
+
+    return batch_from_memory(events, num_events, more);
+}
+
+
+// Split events into frames - runs of events terminated by a SYN_REPORT - and
+// take ownership of the buffer. The events of an incomplete frame are returned
+// separately, so that they can be passed back in and completed later. Return a
+// tuple of (frames, partial), where frames is a tuple of EventBatch objects and
+// partial is an EventBatch or None.
+static PyObject *
+split_events(struct input_event *events, Py_ssize_t num_events)
+{
+    Py_ssize_t num_frames = 0, end = 0;
+    for (Py_ssize_t i = 0; i < num_events; i++) {
+        if (events[i].type == EV_SYN && events[i].code == SYN_REPORT) {
+            num_frames++;
+            end = i + 1;
+        }
+    }
+
+    // All frames are views into the one batch that owns the events.
+    PyObject *all = batch_from_memory(events, num_events, 0);
+    if (all == NULL) return NULL;
+
+    PyObject *frames = PyTuple_New(num_frames);
+    if (frames == NULL) {
+        Py_DECREF(all);
+        return NULL;
+    }
+
+    Py_ssize_t start = 0, n = 0;
+    for (Py_ssize_t i = 0; i < end; i++) {
+        if (events[i].type != EV_SYN || events[i].code != SYN_REPORT)
+            continue;
+
+        PyObject *frame = batch_from_object(all, start*EVENT_SIZE, i + 1 - start);
+        if (frame == NULL) {
+            Py_DECREF(frames);
+            Py_DECREF(all);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(frames, n++, frame);
+        start = i + 1;
+    }
+
+    PyObject *rest;
+    if (end < num_events) {
+        rest = batch_from_object(all, end*EVENT_SIZE, num_events - end);
+        if (rest == NULL) {
+            Py_DECREF(frames);
+            Py_DECREF(all);
+            return NULL;
+        }
+    } else {
+        rest = Py_NewRef(Py_None);
+    }
+
+    Py_DECREF(all);
+    return Py_BuildValue("(NN)", frames, rest);
+}
+
+
+// Join the events of an incomplete frame and those that follow it into a new
+// heap buffer. Frees events and returns NULL with an exception set on failure.
+static struct input_event *
+join_partial(PyObject *partial, struct input_event *events, Py_ssize_t *num_events)
+{
+    Py_ssize_t num_partial = partial == Py_None ? 0 : ((EventBatchObject*)partial)->count;
+
+    struct input_event *joined = PyMem_Malloc(EVENT_SIZE*(num_partial + *num_events));
+    if (joined == NULL) {
+        PyMem_Free(events);
+        PyErr_NoMemory();
+        return NULL;
+    }
+    if (num_partial > 0)
+        memcpy(joined, ((EventBatchObject*)partial)->data, EVENT_SIZE*num_partial);
+    if (*num_events > 0)
+        memcpy(joined + num_partial, events, EVENT_SIZE*(*num_events));
+    PyMem_Free(events);
+    *num_events += num_partial;
+    return joined;
+}
+
+
+// Read input events from a device and split them into frames with
+// split_events(), after the incomplete frame of the previous read.
+static PyObject *
+device_read_frames(PyObject *self, PyObject *args)
+{
+    int fd, drain = 0;
+    Py_ssize_t max_events = 64;
+    PyObject *partial = Py_None;
+
+    int ret = PyArg_ParseTuple(args, "i|nOp", &fd, &max_events, &partial, &drain);
+    if (!ret) return NULL;
+
+    if (max_events < 1) {
+        PyErr_SetString(PyExc_ValueError, "max_events must be positive");
+        return NULL;
+    }
+
+    if (partial != Py_None && !PyObject_TypeCheck(partial, &EventBatchType)) {
+        PyErr_SetString(PyExc_TypeError, "partial must be an EventBatch or None");
+        return NULL;
+    }
+
+    struct input_event *events;
+    ssize_t num_events = read_events(fd, &events, max_events, drain);
+
+    if (num_events < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    // Prepend the events of the incomplete frame from the previous read.
+    if (partial != Py_None && ((EventBatchObject*)partial)->count > 0) {
+        Py_ssize_t count = num_events;
+        events = join_partial(partial, events, &count);
+        if (events == NULL) return NULL;
+        num_events = count;
+    }
+
+    return split_events(events, num_events);
+}
+
+
+// Split the events of a batch into frames, after the incomplete frame of a
+// previous call, as device_read_frames() does for the events it reads.
+static PyObject *
+split_frames(PyObject *self, PyObject *args)
+{
+    PyObject *batch, *partial = Py_None;
+
+    int ret = PyArg_ParseTuple(args, "O!|O", &EventBatchType, &batch, &partial);
+    if (!ret) return NULL;
+
+    if (partial != Py_None && !PyObject_TypeCheck(partial, &EventBatchType)) {
+        PyErr_SetString(PyExc_TypeError, "partial must be an EventBatch or None");
+        return NULL;
+    }
+
+    // The frames take ownership of a copy of the events.
+    Py_ssize_t num_events = ((EventBatchObject*)batch)->count;
+    struct input_event *events = PyMem_Malloc(EVENT_SIZE*num_events);
+    if (events == NULL)
+        return PyErr_NoMemory();
+    if (num_events > 0)
+        memcpy(events, ((EventBatchObject*)batch)->data, EVENT_SIZE*num_events);
+
+    if (partial != Py_None && ((EventBatchObject*)partial)->count > 0) {
+        events = join_partial(partial, events, &num_events);
+        if (events == NULL) return NULL;
+    }
+
+    return split_events(events, num_events);
+}
 
-#define MAX_NAME_SIZE 256
 
-extern char*  EV_NAME[EV_CNT];
-extern int    EV_TYPE_MAX[EV_CNT];
-extern char** EV_TYPE_NAME[EV_CNT];
-extern char*  BUS_NAME[];
+// SlotTracker follows the slots of a multitouch protocol B device. The values
+// of the tracked ABS_MT_* axes are kept in a fixed-size num_slots x num_codes
+// array that is updated from raw input_event structs. A snapshot of the active
+// contacts is taken at every SYN_REPORT.
 
+typedef struct {
+    PyObject_HEAD
+    int num_slots;
+    int num_codes;
+    int slot;                   // the currently selected slot
+    int columns[ABS_CNT];       // ABS_MT_* code -> column in values, or -1
+    int codes[ABS_CNT];         // column in values -> ABS_MT_* code
+    int32_t *values;            // num_slots rows of num_codes values
+} SlotTrackerObject;
 
-int test_bit(const char* bitmask, int bit) {
-    return bitmask[bit/8] & (1 << (bit % 8));
+static PyTypeObject SlotTrackerType;
+
+
+static PyObject *
+tracker_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    int num_slots;
+    PyObject *codes;
+    static char *kwlist[] = {"num_slots", "codes", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "iO:SlotTracker", kwlist, &num_slots, &codes))
+        return NULL;
+
+    if (num_slots < 1) {
+        PyErr_SetString(PyExc_ValueError, "num_slots must be positive");
+        return NULL;
+    }
+
+    PyObject *seq = PySequence_Fast(codes, "codes must be a sequence of ABS_MT_* codes");
+    if (seq == NULL) return NULL;
+
+    SlotTrackerObject *self = (SlotTrackerObject*)type->tp_alloc(type, 0);
+    if (self == NULL) {
+        Py_DECREF(seq);
+        return NULL;
+    }
+
+    for (int i = 0; i < ABS_CNT; i++)
+        self->columns[i] = -1;
+
+    // The tracking id is always in the first column, as it decides whether
+    // a slot holds a contact.
+    self->columns[ABS_MT_TRACKING_ID] = 0;
+    self->codes[0] = ABS_MT_TRACKING_ID;
+    self->num_codes = 1;
+
+    for (Py_ssize_t i = 0; i < PySequence_Fast_GET_SIZE(seq); i++) {
+        long code = PyLong_AsLong(PySequence_Fast_GET_ITEM(seq, i));
+        if (code == -1 && PyErr_Occurred()) goto on_err;
+
+        if (code <= ABS_MT_SLOT || code >= ABS_CNT) {
+            PyErr_Format(PyExc_ValueError, "%ld is not an ABS_MT_* code", code);
+            goto on_err;
+        }
+
+        if (self->columns[code] == -1) {
+            self->columns[code] = self->num_codes;
+            self->codes[self->num_codes++] = code;
+        }
+    }
+    Py_DECREF(seq);
+
+    self->num_slots = num_slots;
+    self->values = PyMem_Calloc((size_t)num_slots * self->num_codes, sizeof(int32_t));
+    if (self->values == NULL) {
+        Py_DECREF(self);
+        return PyErr_NoMemory();
+    }
+
+    for (int i = 0; i < num_slots; i++)
+        self->values[i*self->num_codes] = -1;
+
+    return (PyObject*)self;
+
+    on_err:
+        Py_DECREF(seq);
+        Py_DECREF(self);
+        return NULL;
 }
 
 
-// Read input event from a device and return a tuple that mimics input_event
+static void
+tracker_dealloc(SlotTrackerObject *self)
+{
+    PyMem_Free(self->values);
+    Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+// Return a tuple of (slot, *values) tuples for all slots with a contact
 static PyObject *
-device_read(PyObject *self, PyObject *args)
+tracker_contacts(SlotTrackerObject *self)
+{
+    Py_ssize_t num_contacts = 0;
+    for (int i = 0; i < self->num_slots; i++)
+        if (self->values[i*self->num_codes] != -1)
+            num_contacts++;
+
+    PyObject *contacts = PyTuple_New(num_contacts);
+    if (contacts == NULL) return NULL;
+
+    Py_ssize_t n = 0;
+    for (int i = 0; i < self->num_slots; i++) {
+        int32_t *row = self->values + i*self->num_codes;
+        if (row[0] == -1)
+            continue;
+
+        PyObject *contact = PyTuple_New(self->num_codes + 1);
+        if (contact == NULL) goto on_err;
+        PyTuple_SET_ITEM(contacts, n++, contact);
+
+        PyObject *item = PyLong_FromLong(i);
+        if (item == NULL) goto on_err;
+        PyTuple_SET_ITEM(contact, 0, item);
+
+        for (int j = 0; j < self->num_codes; j++) {
+            item = PyLong_FromLong(row[j]);
+            if (item == NULL) goto on_err;
+            PyTuple_SET_ITEM(contact, j + 1, item);
+        }
+    }
+
+    return contacts;
+
+    on_err:
+        Py_DECREF(contacts);
+        return NULL;
+}
+
+
+static PyObject *
+tracker_feed_locked(SlotTrackerObject *self, PyObject *args)
 {
+    Py_buffer buffer;
+
+    if (!PyArg_ParseTuple(args, "y*", &buffer))
+        return NULL;
+
+    if (buffer.len % EVENT_SIZE != 0) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the input_event size");
+        return NULL;
+    }
+
+    PyObject *frames = PyList_New(0);
+    if (frames == NULL) {
+        PyBuffer_Release(&buffer);
+        return NULL;
+    }
+
     struct input_event event;
+    for (Py_ssize_t offset = 0; offset < buffer.len; offset += EVENT_SIZE) {
+        memcpy(&event, (char*)buffer.buf + offset, EVENT_SIZE);
 
-    // get device file descriptor (O_RDONLY|O_NONBLOCK)
-    int fd = (int)PyLong_AsLong(PyTuple_GET_ITEM(args, 0));
+        if (event.type == EV_ABS) {
+            if (event.code == ABS_MT_SLOT) {
+                self->slot = event.value;
+            }
+            else if (event.code < ABS_CNT && self->columns[event.code] != -1
+                     && self->slot >= 0 && self->slot < self->num_slots) {
+                self->values[self->slot*self->num_codes + self->columns[event.code]] = event.value;
+            }
+        }
+        else if (event.type == EV_SYN && event.code == SYN_REPORT) {
+            PyObject *contacts = tracker_contacts(self);
+            if (contacts == NULL) goto on_err;
 
-    int n;
-    MAYBE_BEGIN_ALLOW_THREADS
-    n = read(fd, &event, sizeof(event));
-    MAYBE_END_ALLOW_THREADS
+            PyObject *frame = Py_BuildValue("(llN)", (long)event.input_event_sec,
+                                            (long)event.input_event_usec, contacts);
+            if (frame == NULL) goto on_err;
 
-    if (n < 0) {
-        if (errno == EAGAIN) {
-            Py_INCREF(Py_None);
-            return Py_None;
+            int ret = PyList_Append(frames, frame);
+            Py_DECREF(frame);
+            if (ret < 0) goto on_err;
+        }
+    }
+
+    PyBuffer_Release(&buffer);
+    return frames;
+
+    on_err:
+        PyBuffer_Release(&buffer);
+        Py_DECREF(frames);
+        return NULL;
+}
+
+
+// Load the current slot and the values of all slots from the device
+static PyObject *
+tracker_load_locked(SlotTrackerObject *self, PyObject *args)
+{
+    int fd, err = 0;
+    struct input_absinfo absinfo;
+
+    if (!PyArg_ParseTuple(args, "i", &fd))
+        return NULL;
+
+    // One struct input_mt_request_layout { __u32 code; __s32 values[num_slots]; }
+    // per code. The ioctls fill these local requests with the GIL released and
+    // the values are copied into the tracker once it is held again.
+    int num_slots = self->num_slots, num_codes = self->num_codes, stride = num_slots + 1;
+    int32_t *requests = PyMem_Calloc((size_t)num_codes * stride + 1, sizeof(int32_t));
+    if (requests == NULL) return PyErr_NoMemory();
+
+    Py_BEGIN_ALLOW_THREADS
+    for (int j = 0; j < num_codes; j++) {
+        int32_t *request = requests + j*stride;
+        request[0] = self->codes[j];
+        if (ioctl(fd, EVIOCGMTSLOTS(stride * sizeof(int32_t)), request) == -1) {
+            err = errno;
+            break;
         }
+    }
+    if (!err && ioctl(fd, EVIOCGABS(ABS_MT_SLOT), &absinfo) == -1)
+        err = errno;
+    Py_END_ALLOW_THREADS
 
+    if (err) {
+        PyMem_Free(requests);
+        errno = err;
         PyErr_SetFromErrno(PyExc_OSError);
         return NULL;
     }
 
-    PyObject *py_input_event = PyTuple_New(5);
-    PyTuple_SET_ITEM(py_input_event, 0, PyLong_FromLong(event.input_event_sec));
-    PyTuple_SET_ITEM(py_input_event, 1, PyLong_FromLong(event.input_event_usec));
-    PyTuple_SET_ITEM(py_input_event, 2, PyLong_FromLong(event.type));
-    PyTuple_SET_ITEM(py_input_event, 3, PyLong_FromLong(event.code));
-    PyTuple_SET_ITEM(py_input_event, 4, PyLong_FromLong(event.value));
+    for (int j = 0; j < num_codes; j++)
+        for (int i = 0; i < num_slots; i++)
+            self->values[i*num_codes + j] = requests[j*stride + i + 1];
+    self->slot = absinfo.value;
 
-    return py_input_event;
+    PyMem_Free(requests);
+    Py_RETURN_NONE;
 }
 
 
-// Read multiple input events from a device and return a list of tuples
 static PyObject *
-device_read_many(PyObject *self, PyObject *args)
+tracker_get_values_locked(SlotTrackerObject *self, PyObject *args)
 {
-    // get device file descriptor (O_RDONLY|O_NONBLOCK)
-    int fd = (int)PyLong_AsLong(PyTuple_GET_ITEM(args, 0));
+    int slot;
 
-    struct input_event event[64];
-
-    size_t event_size = sizeof(struct input_event);
-    ssize_t nread;
-    MAYBE_BEGIN_ALLOW_THREADS
-    nread = read(fd, event, event_size*64);
-    MAYBE_END_ALLOW_THREADS
+    if (!PyArg_ParseTuple(args, "i", &slot))
+        return NULL;
 
-    if (nread < 0) {
-        PyErr_SetFromErrno(PyExc_OSError);
+    if (slot < 0 || slot >= self->num_slots) {
+        PyErr_SetString(PyExc_IndexError, "slot out of range");
         return NULL;
     }
 
-    // Construct a tuple of event tuples. Each tuple is the arguments to InputEvent.
-    size_t num_events = nread / event_size;
+    PyObject *values = PyTuple_New(self->num_codes);
+    if (values == NULL) return NULL;
 
-    PyObject* events = PyTuple_New(num_events);
-    for (size_t i = 0 ; i < num_events; i++) {
-        PyObject *py_input_event = PyTuple_New(5);
-        PyTuple_SET_ITEM(py_input_event, 0, PyLong_FromLong(event[i].input_event_sec));
-        PyTuple_SET_ITEM(py_input_event, 1, PyLong_FromLong(event[i].input_event_usec));
-        PyTuple_SET_ITEM(py_input_event, 2, PyLong_FromLong(event[i].type));
-        PyTuple_SET_ITEM(py_input_event, 3, PyLong_FromLong(event[i].code));
-        PyTuple_SET_ITEM(py_input_event, 4, PyLong_FromLong(event[i].value));
-        PyTuple_SET_ITEM(events, i, py_input_event);
+    for (int j = 0; j < self->num_codes; j++) {
+        PyObject *item = PyLong_FromLong(self->values[slot*self->num_codes + j]);
+        if (item == NULL) {
+            Py_DECREF(values);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(values, j, item);
     }
 
-    return events;
+    return values;
+}
+
+
+// The slots of a tracker that is shared between threads are updated and read
+// one thread at a time.
+#define TRACKER_LOCKED(name)                                    \
+    static PyObject *                                           \
+    name(SlotTrackerObject *self, PyObject *args)               \
+    {                                                           \
+        PyObject *res;                                          \
+        Py_BEGIN_CRITICAL_SECTION(self);                        \
+        res = name##_locked(self, args);                        \
+        Py_END_CRITICAL_SECTION();                              \
+        return res;                                             \
+    }
+
+TRACKER_LOCKED(tracker_feed)
+TRACKER_LOCKED(tracker_load)
+TRACKER_LOCKED(tracker_get_values)
+
+
+static PyObject *
+tracker_get_codes(SlotTrackerObject *self, void *closure)
+{
+    PyObject *codes = PyTuple_New(self->num_codes);
+    if (codes == NULL) return NULL;
+
+    for (int j = 0; j < self->num_codes; j++) {
+        PyObject *item = PyLong_FromLong(self->codes[j]);
+        if (item == NULL) {
+            Py_DECREF(codes);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(codes, j, item);
+    }
+
+    return codes;
+}
+
+
+static PyMethodDef tracker_methods[] = {
+    { "feed",   (PyCFunction)tracker_feed, METH_VARARGS,
+      "apply a buffer of raw input events and return a (sec, usec, contacts) tuple for every SYN_REPORT" },
+    { "load",   (PyCFunction)tracker_load, METH_VARARGS, "load the state of all slots from a device" },
+    { "values", (PyCFunction)tracker_get_values, METH_VARARGS, "return the values of a slot" },
+    { NULL }
+};
+
+static PyObject *
+tracker_get_num_slots(SlotTrackerObject *self, void *closure)
+{
+    return PyLong_FromLong(self->num_slots);
+}
+
+
+static PyObject *
+tracker_get_slot(SlotTrackerObject *self, void *closure)
+{
+    return PyLong_FromLong(self->slot);
 }
 
 
+static PyGetSetDef tracker_getset[] = {
+    { "codes", (getter)tracker_get_codes, NULL, "the tracked ABS_MT_* codes, starting with ABS_MT_TRACKING_ID", NULL },
+    { "num_slots", (getter)tracker_get_num_slots, NULL, "number of slots", NULL },
+    { "slot",  (getter)tracker_get_slot, NULL, "the currently selected slot", NULL },
+    { NULL }
+};
+
+static PyTypeObject SlotTrackerType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "evdev._input.SlotTracker",
+    .tp_doc = "Tracks the slots of a multitouch protocol B device.",
+    .tp_basicsize = sizeof(SlotTrackerObject),
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = tracker_new,
+    .tp_dealloc = (destructor)tracker_dealloc,
+    .tp_methods = tracker_methods,
+    .tp_getset = tracker_getset,
+};
+
+
 // Get the event types and event codes that the input device supports
 static PyObject *
 ioctl_capabilities(PyObject *self, PyObject *args)
@@ -262,7 +2322,9 @@ ioctl_EVIOCGABS(PyObject *self, PyObject *args)
     if (!ret) return NULL;
 
     memset(&absinfo, 0, sizeof(absinfo));
+    Py_BEGIN_ALLOW_THREADS
     ret = ioctl(fd, EVIOCGABS(ev_code), &absinfo);
+    Py_END_ALLOW_THREADS
     if (ret == -1) {
         PyErr_SetFromErrno(PyExc_OSError);
         return NULL;
@@ -297,7 +2359,9 @@ ioctl_EVIOCSABS(PyObject *self, PyObject *args)
                                &absinfo.resolution);
     if (!ret) return NULL;
 
+    Py_BEGIN_ALLOW_THREADS
     ret = ioctl(fd, EVIOCSABS(ev_code), &absinfo);
+    Py_END_ALLOW_THREADS
     if (ret == -1) {
         PyErr_SetFromErrno(PyExc_OSError);
         return NULL;
@@ -316,7 +2380,9 @@ ioctl_EVIOCGREP(PyObject *self, PyObject *args)
     ret = PyArg_ParseTuple(args, "i", &fd);
     if (!ret) return NULL;
 
+    Py_BEGIN_ALLOW_THREADS
     ret = ioctl(fd, EVIOCGREP, &rep);
+    Py_END_ALLOW_THREADS
     if (ret == -1)
         return NULL;
 
@@ -333,7 +2399,9 @@ ioctl_EVIOCSREP(PyObject *self, PyObject *args)
     ret = PyArg_ParseTuple(args, "iii", &fd, &rep[0], &rep[1]);
     if (!ret) return NULL;
 
+    Py_BEGIN_ALLOW_THREADS
     ret = ioctl(fd, EVIOCSREP, &rep);
+    Py_END_ALLOW_THREADS
     if (ret == -1)
         return NULL;
 
@@ -348,7 +2416,9 @@ ioctl_EVIOCGVERSION(PyObject *self, PyObject *args)
     ret = PyArg_ParseTuple(args, "i", &fd);
     if (!ret) return NULL;
 
+    Py_BEGIN_ALLOW_THREADS
     ret = ioctl(fd, EVIOCGVERSION, &res);
+    Py_END_ALLOW_THREADS
     if (ret == -1)
         return NULL;
 
@@ -363,7 +2433,9 @@ ioctl_EVIOCGRAB(PyObject *self, PyObject *args)
     ret = PyArg_ParseTuple(args, "ii", &fd, &flag);
     if (!ret) return NULL;
 
+    Py_BEGIN_ALLOW_THREADS
     ret = ioctl(fd, EVIOCGRAB, (intptr_t)flag);
+    Py_END_ALLOW_THREADS
     if (ret != 0) {
         PyErr_SetFromErrno(PyExc_OSError);
         return NULL;
@@ -374,6 +2446,162 @@ ioctl_EVIOCGRAB(PyObject *self, PyObject *args)
 }
 
 
+// The number of codes in the event mask of an event type, as in the kernel's
+// evdev_get_mask_cnt(). The codes of the EV_SYN mask are event types.
+static int
+mask_code_count(int evtype)
+{
+    switch (evtype) {
+    case EV_SYN: return EV_CNT;
+    case EV_KEY: return KEY_CNT;
+    case EV_REL: return REL_CNT;
+    case EV_ABS: return ABS_CNT;
+    case EV_MSC: return MSC_CNT;
+    case EV_SW:  return SW_CNT;
+    case EV_LED: return LED_CNT;
+    case EV_SND: return SND_CNT;
+    case EV_FF:  return FF_CNT;
+    }
+    return 0;
+}
+
+
+// Set the codes of an event type that are queued for a file descriptor.
+// All codes pass if codes is None.
+static PyObject *
+ioctl_EVIOCSMASK(PyObject *self, PyObject *args)
+{
+    int fd, evtype, ret;
+    PyObject *codes;
+    char bits[KEY_CNT / 8 + sizeof(long)];
+
+    ret = PyArg_ParseTuple(args, "iiO", &fd, &evtype, &codes);
+    if (!ret) return NULL;
+
+    int count = mask_code_count(evtype);
+    if (count == 0) {
+        PyErr_Format(PyExc_ValueError, "event type %d has no event mask", evtype);
+        return NULL;
+    }
+
+    if (codes == Py_None) {
+        memset(bits, 0xff, sizeof(bits));
+    } else {
+        memset(bits, 0, sizeof(bits));
+
+        PyObject *iter = PyObject_GetIter(codes);
+        if (iter == NULL) return NULL;
+
+        PyObject *item;
+        while ((item = PyIter_Next(iter)) != NULL) {
+            long code = PyLong_AsLong(item);
+            Py_DECREF(item);
+            if (code == -1 && PyErr_Occurred()) {
+                Py_DECREF(iter);
+                return NULL;
+            }
+            if (code < 0 || code >= count) {
+                Py_DECREF(iter);
+                PyErr_Format(PyExc_ValueError, "event code %ld out of range for event type %d", code, evtype);
+                return NULL;
+            }
+            bits[code / 8] |= 1 << (code % 8);
+        }
+        Py_DECREF(iter);
+        if (PyErr_Occurred()) return NULL;
+    }
+
+    struct input_mask mask = {
+        .type = evtype,
+        .codes_size = sizeof(bits),
+        .codes_ptr = (uint64_t)(uintptr_t)bits,
+    };
+
+    Py_BEGIN_ALLOW_THREADS
+    ret = ioctl(fd, EVIOCSMASK, &mask);
+    Py_END_ALLOW_THREADS
+    if (ret == -1) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    Py_RETURN_NONE;
+}
+
+
+// Get the codes of an event type that are queued for a file descriptor
+static PyObject *
+ioctl_EVIOCGMASK(PyObject *self, PyObject *args)
+{
+    int fd, evtype, ret;
+    char bits[KEY_CNT / 8 + sizeof(long)] = {0};
+
+    ret = PyArg_ParseTuple(args, "ii", &fd, &evtype);
+    if (!ret) return NULL;
+
+    int count = mask_code_count(evtype);
+    if (count == 0) {
+        PyErr_Format(PyExc_ValueError, "event type %d has no event mask", evtype);
+        return NULL;
+    }
+
+    struct input_mask mask = {
+        .type = evtype,
+        .codes_size = sizeof(bits),
+        .codes_ptr = (uint64_t)(uintptr_t)bits,
+    };
+
+    Py_BEGIN_ALLOW_THREADS
+    ret = ioctl(fd, EVIOCGMASK, &mask);
+    Py_END_ALLOW_THREADS
+    if (ret == -1) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    PyObject *res = PyList_New(0);
+    if (res == NULL) return NULL;
+
+    for (int i = 0; i < count; i++) {
+        if (bits[i / 8] == 0) {
+            i |= 7;
+            continue;
+        }
+        if (test_bit(bits, i)) {
+            PyObject *val = PyLong_FromLong(i);
+            if (val == NULL || PyList_Append(res, val) == -1) {
+                Py_XDECREF(val);
+                Py_DECREF(res);
+                return NULL;
+            }
+            Py_DECREF(val);
+        }
+    }
+
+    return res;
+}
+
+
+// Select the clock that the kernel timestamps the events of a file descriptor with
+static PyObject *
+ioctl_EVIOCSCLOCKID(PyObject *self, PyObject *args)
+{
+    int fd, ret, clockid;
+    ret = PyArg_ParseTuple(args, "ii", &fd, &clockid);
+    if (!ret) return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    ret = ioctl(fd, EVIOCSCLOCKID, &clockid);
+    Py_END_ALLOW_THREADS
+    if (ret == -1) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    Py_RETURN_NONE;
+}
+
+
 static PyObject *
 ioctl_EVIOCG_bits(PyObject *self, PyObject *args)
 {
@@ -398,6 +2626,7 @@ ioctl_EVIOCG_bits(PyObject *self, PyObject *args)
     char bytes[(max+7)/8];
     memset(bytes, 0, sizeof bytes);
 
+    Py_BEGIN_ALLOW_THREADS
     switch (evtype) {
     case EV_LED:
         ret = ioctl(fd, EVIOCGLED(sizeof(bytes)), &bytes);
@@ -412,12 +2641,20 @@ ioctl_EVIOCG_bits(PyObject *self, PyObject *args)
         ret = ioctl(fd, EVIOCGSW(sizeof(bytes)), &bytes);
         break;
     }
+    Py_END_ALLOW_THREADS
 
-    if (ret == -1)
+    if (ret == -1) {
+        PyErr_SetFromErrno(PyExc_OSError);
         return NULL;
+    }
 
     PyObject* res = PyList_New(0);
     for (int i=0; i<=max; i++) {
+        // Most keys are up at any given time - skip them a byte at a time.
+        if (bytes[i/8] == 0) {
+            i |= 7;
+            continue;
+        }
         if (test_bit(bytes, i)) {
             PyObject *val = PyLong_FromLong(i);
             PyList_Append(res, val);
@@ -429,6 +2666,55 @@ ioctl_EVIOCG_bits(PyObject *self, PyObject *args)
 }
 
 
+// Get the values of an ABS_MT_* axis for all slots of a multitouch device
+static PyObject *
+ioctl_EVIOCGMTSLOTS(PyObject *self, PyObject *args)
+{
+    int fd, ev_code, num_slots, ret;
+
+    ret = PyArg_ParseTuple(args, "iii", &fd, &ev_code, &num_slots);
+    if (!ret) return NULL;
+
+    if (num_slots < 1) {
+        PyErr_SetString(PyExc_ValueError, "num_slots must be positive");
+        return NULL;
+    }
+
+    // struct input_mt_request_layout { __u32 code; __s32 values[num_slots]; }
+    int32_t *request = PyMem_Calloc(num_slots + 1, sizeof(int32_t));
+    if (request == NULL) return PyErr_NoMemory();
+    request[0] = ev_code;
+
+    Py_BEGIN_ALLOW_THREADS
+    ret = ioctl(fd, EVIOCGMTSLOTS((num_slots + 1) * sizeof(int32_t)), request);
+    Py_END_ALLOW_THREADS
+    if (ret == -1) {
+        PyMem_Free(request);
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    PyObject *values = PyTuple_New(num_slots);
+    if (values == NULL) {
+        PyMem_Free(request);
+        return NULL;
+    }
+
+    for (int i = 0; i < num_slots; i++) {
+        PyObject *value = PyLong_FromLong(request[i + 1]);
+        if (value == NULL) {
+            Py_DECREF(values);
+            PyMem_Free(request);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(values, i, value);
+    }
+
+    PyMem_Free(request);
+    return values;
+}
+
+
 static PyObject *
 ioctl_EVIOCGEFFECTS(PyObject *self, PyObject *args)
 {
@@ -436,7 +2722,9 @@ ioctl_EVIOCGEFFECTS(PyObject *self, PyObject *args)
     ret = PyArg_ParseTuple(args, "i", &fd);
     if (!ret) return NULL;
 
+    Py_BEGIN_ALLOW_THREADS
     ret = ioctl(fd, EVIOCGEFFECTS, &res);
+    Py_END_ALLOW_THREADS
     if (ret == -1)
         return NULL;
 
@@ -488,7 +2776,9 @@ upload_effect(PyObject *self, PyObject *args)
 
     // print_ff_effect(&effect);
 
+    Py_BEGIN_ALLOW_THREADS
     ret = ioctl(fd, EVIOCSFF, &effect);
+    Py_END_ALLOW_THREADS
     if (ret != 0) {
         PyErr_SetFromErrno(PyExc_OSError);
         return NULL;
@@ -507,7 +2797,9 @@ erase_effect(PyObject *self, PyObject *args)
     if (!ret) return NULL;
 
     long ff_id = PyLong_AsLong(ff_id_obj);
+    Py_BEGIN_ALLOW_THREADS
     ret = ioctl(fd, EVIOCRMFF, ff_id);
+    Py_END_ALLOW_THREADS
     if (ret != 0) {
         PyErr_SetFromErrno(PyExc_OSError);
         return NULL;
@@ -528,7 +2820,9 @@ ioctl_EVIOCGPROP(PyObject *self, PyObject *args)
     char bytes[(INPUT_PROP_MAX+7)/8];
     memset(bytes, 0, sizeof bytes);
 
+    Py_BEGIN_ALLOW_THREADS
     ret = ioctl(fd, EVIOCGPROP(sizeof(bytes)), &bytes);
+    Py_END_ALLOW_THREADS
 
     if (ret == -1)
         return NULL;
@@ -555,11 +2849,28 @@ static PyMethodDef MethodTable[] = {
     { "ioctl_EVIOCSREP",      ioctl_EVIOCSREP,      METH_VARARGS},
     { "ioctl_EVIOCGVERSION",  ioctl_EVIOCGVERSION,  METH_VARARGS},
     { "ioctl_EVIOCGRAB",      ioctl_EVIOCGRAB,      METH_VARARGS},
+    { "ioctl_EVIOCSCLOCKID",  ioctl_EVIOCSCLOCKID,  METH_VARARGS, "set the clock used for event timestamps"},
+    { "ioctl_EVIOCSMASK",     ioctl_EVIOCSMASK,     METH_VARARGS, "set the event mask of an event type"},
+    { "ioctl_EVIOCGMASK",     ioctl_EVIOCGMASK,     METH_VARARGS, "get the event mask of an event type"},
     { "ioctl_EVIOCGEFFECTS",  ioctl_EVIOCGEFFECTS,  METH_VARARGS, "fetch the number of effects the device can keep in its memory." },
     { "ioctl_EVIOCG_bits",    ioctl_EVIOCG_bits,    METH_VARARGS, "get state of KEY|LED|SND|SW"},
+    { "ioctl_EVIOCGMTSLOTS",  ioctl_EVIOCGMTSLOTS,  METH_VARARGS, "get the values of a multitouch axis for all slots"},
     { "ioctl_EVIOCGPROP",     ioctl_EVIOCGPROP,     METH_VARARGS, "get device properties"},
     { "device_read",          device_read,          METH_VARARGS, "read an input event from a device" },
     { "device_read_many",     device_read_many,     METH_VARARGS, "read all available input events from a device" },
+    { "device_read_into",     device_read_into,     METH_VARARGS, "read raw input events from a device into a buffer" },
+    { "device_read_batch",    device_read_batch,    METH_VARARGS, "read input events from a device into an EventBatch" },
+    { "device_read_frames",   device_read_frames,   METH_VARARGS, "read input events from a device and split them into frames" },
+    { "split_frames",         split_frames,         METH_VARARGS, "split a batch of input events into frames" },
+    { "coalesce",             coalesce,             METH_VARARGS, "coalesce the motion events of a buffer of input events" },
+    { "index_frames",         index_frames,         METH_VARARGS, "index the frames of a buffer of input events" },
+    { "update_state",         update_state,         METH_VARARGS, "apply a buffer of input events to the state of a device" },
+    { "pack_events",          pack_events,          METH_VARARGS, "pack an iterable of input events into an EventBatch" },
+    { "encode_block",         encode_block,         METH_VARARGS, "encode a buffer of input events as a delta encoded block" },
+    { "decode_block",         decode_block,         METH_VARARGS, "decode a delta encoded block into an EventBatch" },
+    { "block_header",         block_header,         METH_VARARGS, "read the header of a delta encoded block" },
+    { "parse_evemu",          parse_evemu,          METH_VARARGS, "parse the event lines of evemu-record output into an EventBatch" },
+    { "format_evemu",         format_evemu,         METH_VARARGS, "format a buffer of input events as evemu event lines" },
     { "upload_effect",        upload_effect,        METH_VARARGS, "" },
     { "erase_effect",         erase_effect,         METH_VARARGS, "" },
 
@@ -582,11 +2893,40 @@ static struct PyModuleDef moduledef = {
 static PyObject *
 moduleinit(void)
 {
+    if (PyType_Ready(&EventBatchType) < 0) return NULL;
+    if (PyType_Ready(&EventFilterType) < 0) return NULL;
+    if (PyType_Ready(&SlotTrackerType) < 0) return NULL;
+
     PyObject* m = PyModule_Create(&moduledef);
     if (m == NULL) return NULL;
 #ifdef Py_GIL_DISABLED
     PyUnstable_Module_SetGIL(m, Py_MOD_GIL_NOT_USED);
 #endif
+    PyModule_AddIntConstant(m, "event_size", sizeof(struct input_event));
+    if (PyModule_AddObjectRef(m, "EventBatch", (PyObject*)&EventBatchType) < 0) {
+        Py_DECREF(m);
+        return NULL;
+    }
+    if (PyModule_AddObjectRef(m, "EventFilter", (PyObject*)&EventFilterType) < 0) {
+        Py_DECREF(m);
+        return NULL;
+    }
+    if (PyModule_AddObjectRef(m, "SlotTracker", (PyObject*)&SlotTrackerType) < 0) {
+        Py_DECREF(m);
+        return NULL;
+    }
+
+    if (InputEventClass == NULL) {
+        PyObject *events = PyImport_ImportModule("evdev.events");
+        if (events != NULL) {
+            InputEventClass = PyObject_GetAttrString(events, "InputEvent");
+            Py_DECREF(events);
+        }
+        if (InputEventClass == NULL) {
+            Py_DECREF(m);
+            return NULL;
+        }
+    }
     return m;
 }
 
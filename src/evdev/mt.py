@@ -0,0 +1,127 @@
+"""
+This module provides the :class:`SlotTracker` class, which follows the
+contacts of a multitouch device that implements protocol B (see the
+kernel's `multi-touch-protocol.txt`_). The slots are tracked in C, in
+fixed-size per-slot arrays, and a :class:`TouchFrame` with the set of
+active contacts is produced for every ``SYN_REPORT``::
+
+    >>> device = InputDevice("/dev/input/event5")
+    >>> tracker = SlotTracker.from_device(device)
+    >>> while True:
+    ...     select.select([device], [], [])
+    ...     for frame in tracker.feed(device.read_batch()):
+    ...         for contact in frame.contacts:
+    ...             print(contact.slot, contact.tracking_id, contact.position_x, contact.position_y)
+
+.. _multi-touch-protocol.txt: https://www.kernel.org/doc/Documentation/input/multi-touch-protocol.txt
+"""
+
+import collections
+from typing import NamedTuple
+
+from . import _input, ecodes
+
+
+class TouchFrame(NamedTuple):
+    """
+    The active contacts of a multitouch device at the time of a ``SYN_REPORT``.
+
+    Attributes
+    ----------
+    sec, usec
+      The timestamp of the ``SYN_REPORT``.
+
+    contacts
+      A tuple of contacts, one for every slot with a tracking id other
+      than -1, ordered by slot. Each contact is a named tuple with the
+      fields ``slot``, ``tracking_id`` and one field for every tracked
+      ``ABS_MT_*`` axis (``position_x``, ``position_y``, ``pressure`` etc).
+    """
+
+    sec: int
+    usec: int
+    contacts: tuple
+
+    def timestamp(self) -> float:
+        """Return the frame timestamp as a float."""
+        return self.sec + (self.usec / 1000000.0)
+
+    def timestamp_ns(self) -> int:
+        """Return the frame timestamp as an integer number of nanoseconds."""
+        return self.sec * 1000000000 + self.usec * 1000
+
+
+def _field_name(code: int) -> str:
+    name = ecodes.ABS[code]
+    if isinstance(name, list):
+        name = name[0]
+    return name.removeprefix("ABS_MT_").lower()
+
+
+class SlotTracker:
+    """
+    Track the slots of a multitouch protocol B device.
+
+    Arguments
+    ---------
+    num_slots
+      The number of slots (``ABS_MT_SLOT`` maximum plus one).
+
+    codes
+      The ``ABS_MT_*`` axes to track. ``ABS_MT_TRACKING_ID`` is always tracked.
+    """
+
+    def __init__(self, num_slots: int, codes=(ecodes.ABS_MT_POSITION_X, ecodes.ABS_MT_POSITION_Y)):
+        self._tracker = _input.SlotTracker(num_slots, codes)
+
+        #: The tracked ``ABS_MT_*`` codes, starting with ``ABS_MT_TRACKING_ID``.
+        self.codes: tuple[int, ...] = self._tracker.codes
+
+        #: The named tuple type of the contacts in a :class:`TouchFrame`.
+        self.Contact = collections.namedtuple("Contact", ["slot", *map(_field_name, self.codes)])
+
+    @classmethod
+    def from_device(cls, device, load: bool = True) -> "SlotTracker":
+        """
+        Create a :class:`SlotTracker` for all ``ABS_MT_*`` axes of an
+        :class:`InputDevice <evdev.device.InputDevice>`. If ``load`` is
+        true, the slots are initialised from the device with ``EVIOCGMTSLOTS``.
+        """
+        absinfo = dict(device.capabilities(absinfo=True).get(ecodes.EV_ABS, []))
+        if ecodes.ABS_MT_SLOT not in absinfo:
+            raise ValueError("device %s does not support multitouch slots" % device.path)
+
+        codes = [code for code in absinfo if ecodes.ABS_MT_SLOT < code <= ecodes.ABS_MT_TOOL_Y]
+        tracker = cls(absinfo[ecodes.ABS_MT_SLOT].max + 1, codes)
+        if load:
+            tracker.load(device.fd)
+        return tracker
+
+    @property
+    def num_slots(self) -> int:
+        """The number of slots."""
+        return self._tracker.num_slots
+
+    @property
+    def slot(self) -> int:
+        """The currently selected slot."""
+        return self._tracker.slot
+
+    def load(self, fd: int) -> None:
+        """Load the values of all slots from a device, e.g. after a ``SYN_DROPPED``."""
+        self._tracker.load(fd)
+
+    def feed(self, events) -> list[TouchFrame]:
+        """
+        Apply events to the slots and return a :class:`TouchFrame` for every
+        ``SYN_REPORT`` among them. ``events`` is an :class:`EventBatch
+        <evdev.eventio.EventBatch>` or any other buffer of raw ``input_event``
+        structs, such as one filled by :func:`read_into()
+        <evdev.eventio.EventIO.read_into>`.
+        """
+        make = self.Contact._make
+        return [TouchFrame(sec, usec, tuple(map(make, contacts))) for sec, usec, contacts in self._tracker.feed(events)]
+
+    def contact(self, slot: int):
+        """Return the current values of a slot as a contact, regardless of whether it is active."""
+        return self.Contact(slot, *self._tracker.values(slot))
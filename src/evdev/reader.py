@@ -0,0 +1,174 @@
+"""
+This module provides the :class:`DeviceReader` class, which reads events
+from a group of devices in a small pool of worker threads. The reads and
+ioctls in the C extension release the GIL, so the workers wait on and
+read from their devices while other threads process the events::
+
+    >>> def handle(device, batch):
+    ...     print(device.path, len(batch))
+    >>> with DeviceReader(devices, handle, workers=2):
+    ...     time.sleep(60)
+"""
+
+import errno
+import os
+import queue
+import select
+import threading
+from typing import Callable, Iterable, Iterator
+
+from .eventio import EventBatch, EventIO
+
+
+class DeviceReader:
+    """
+    Read from a group of devices in a pool of worker threads.
+
+    The devices are divided between the workers, each of which waits for its
+    devices with :func:`select.epoll` and reads a batch from every device
+    that becomes readable. This works with devices in blocking as well as in
+    non-blocking mode.
+
+    Arguments
+    ---------
+    devices
+      The devices to read from - any :class:`EventIO <evdev.eventio.EventIO>`
+      (e.g. :class:`InputDevice <evdev.device.InputDevice>`).
+
+    handler
+      Called with ``(device, batch)`` in a worker thread for every batch that
+      is read. If ``None``, the batches are queued and can be consumed with
+      :func:`read_loop()`.
+
+    workers
+      The number of worker threads.
+
+    max_events
+      The size of the buffer that each device is read with.
+
+    max_pending
+      The maximum number of batches to queue when there is no ``handler``.
+      Workers block when the queue is full, until there is room or the reader
+      is stopped. Unlimited if 0.
+    """
+
+    def __init__(
+        self,
+        devices: Iterable[EventIO],
+        handler: Callable[[EventIO, EventBatch], None] | None = None,
+        workers: int = 2,
+        max_events: int = 64,
+        max_pending: int = 0,
+    ):
+        devices = list(devices)
+        if workers < 1:
+            raise ValueError("workers must be positive")
+
+        self.devices = devices
+        self.handler = handler
+        self.max_events = max_events
+
+        #: The exception that stopped a worker, if any.
+        self.error: BaseException | None = None
+
+        self._queue: "queue.Queue[tuple[EventIO, EventBatch]]" = queue.Queue(max_pending)
+        self._groups = [group for group in (devices[i::workers] for i in range(workers)) if group]
+        self._threads: list[threading.Thread] = []
+        self._stop_r = self._stop_w = -1
+        # Set by stop() for workers that wait for room in a full queue.
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        if self._threads:
+            return
+
+        self._stopping.clear()
+        self._stop_r, self._stop_w = os.pipe()
+        for i, group in enumerate(self._groups):
+            thread = threading.Thread(target=self._run, args=(group,), name=f"evdev-reader-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """
+        Stop the worker threads and wait for them to finish. Re-raises the
+        exception that stopped a worker, if any.
+        """
+        if not self._threads:
+            return
+
+        # Every worker polls the read end of the pipe, so one byte wakes all.
+        self._stopping.set()
+        os.write(self._stop_w, b"x")
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+        os.close(self._stop_r)
+        os.close(self._stop_w)
+        self._stop_r = self._stop_w = -1
+
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _run(self, devices: list[EventIO]) -> None:
+        fds = {device.fileno(): device for device in devices}
+        with select.epoll() as epoll:
+            epoll.register(self._stop_r, select.EPOLLIN)
+            for fd in fds:
+                epoll.register(fd, select.EPOLLIN)
+
+            try:
+                while True:
+                    for fd, mask in epoll.poll():
+                        if fd == self._stop_r:
+                            return
+
+                        device = fds[fd]
+                        try:
+                            batch = device.read_batch(self.max_events)
+                        except BlockingIOError:
+                            continue
+                        except OSError as error:
+                            if error.errno != errno.ENODEV:
+                                raise
+                            # A disconnected device is no longer read from.
+                            epoll.unregister(fd)
+                            continue
+
+                        if self.handler is not None:
+                            self.handler(device, batch)
+                        elif not self._put((device, batch)):
+                            return
+            except BaseException as error:
+                self.error = error
+
+    def _put(self, item: tuple[EventIO, EventBatch]) -> bool:
+        # Wait for room in the queue, but give up once the reader is stopped.
+        while True:
+            try:
+                self._queue.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                if self._stopping.is_set():
+                    return False
+
+    def read_loop(self, timeout: float | None = None) -> Iterator[tuple[EventIO, EventBatch]]:
+        """
+        Yield the ``(device, batch)`` pairs read by the workers when there is
+        no ``handler``. Stop if nothing has been read for ``timeout`` seconds.
+        """
+        while True:
+            try:
+                yield self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return
+
+    def __enter__(self) -> "DeviceReader":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
@@ -0,0 +1,569 @@
+"""
+This module provides a compact binary format for recordings of input
+devices. A recording starts with a description of the device it was made
+from, followed by the events as raw ``input_event`` structs. Events can be
+appended straight from the buffers they were read into, and recordings are
+opened with :func:`mmap.mmap`, so that even large ones are available at
+once and their events are never copied::
+
+    >>> device = InputDevice("/dev/input/event0")
+    >>> with RecordingWriter("session.evrec", DeviceDescription.from_device(device)) as writer:
+    ...     for batch in DeviceSet([device]).read_loop():
+    ...         writer.write(batch)
+
+    >>> with Recording("session.evrec") as recording:
+    ...     print(recording.description.name, len(recording))
+    ...     print(recording.events.types.count(ecodes.EV_KEY))
+    ...     for frame in recording.frames(recording.start + 47 * 60):
+    ...         print(frame.timestamp(), len(frame))
+
+The file layout is:
+
+- A fixed-size prefix: the magic bytes ``EVDEVREC``, the format version,
+  the event encoding, the size of the description and the size of an event
+  record, all little-endian (see ``_PREFIX``).
+- The :class:`DeviceDescription` and other metadata as UTF-8 encoded JSON.
+- Spaces that pad the description to a multiple of 8 bytes.
+- The events, as native ``input_event`` structs.
+- A sparse time index: ``(timestamp in nanoseconds, event index)`` pairs
+  of frames, one for about every second of events (see ``_INDEX_ENTRY``).
+- A trailer with the number of index entries and events and the magic bytes
+  ``EVRECIDX`` (see ``_TRAILER``).
+
+The index is built as events are written and stored when the recording is
+closed, so nothing has to be rewritten while recording. A recording that was
+cut short has no trailer - it is readable up to its last complete event and
+its index is rebuilt when it is opened, in one pass over the events.
+
+Events can instead be stored in the ``"delta"`` encoding, which takes a
+fraction of the space and is meant for keeping recordings for a long time.
+The events are then grouped into blocks of about 4096 events, which start at
+frame boundaries and can be decoded independently. Within a block, every
+event is stored as the difference of its timestamp to that of the previous
+event, a small identifier for its type and code and the difference of its
+value to that of the previous event with the same type and code, all as
+variable-length integers. The block headers hold the timestamp of their first
+event, so they serve as the time index and there is no trailer. Blocks are
+decoded in C as they are accessed, which is many times faster than real time.
+Events that were not yet written out as a block are lost if recording stops
+without the writer being closed.
+
+Recordings are tied to the size of ``input_event`` and the byte order of the
+machine they were made on, which are checked when a recording is opened.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import BinaryIO, Iterable, Iterator, NamedTuple
+
+from . import _input, ecodes
+from .device import AbsInfo, DeviceInfo
+from .eventio import EVENT_SIZE, EventBatch, pack_events
+from .events import InputEvent
+
+MAGIC = b"EVDEVREC"
+INDEX_MAGIC = b"EVRECIDX"
+
+#: The version of the recording format that is written.
+VERSION = 2
+
+# magic, version, encoding, description size, event size
+_PREFIX = struct.Struct("<8sHHII")
+
+# timestamp in nanoseconds, event index
+_INDEX_ENTRY = struct.Struct("<qQ")
+
+# number of index entries, number of events, magic
+_TRAILER = struct.Struct("<QQ8s")
+
+# Events are stored as native input_event structs or in delta encoded blocks.
+_ENCODINGS = {"raw": 0, "delta": 1}
+
+# payload size, number of events, timestamp of the first event in microseconds
+_BLOCK_HEADER = struct.Struct("<IIq")
+
+
+class RecordingError(Exception):
+    pass
+
+
+class DeviceDescription(NamedTuple):
+    """
+    The description of the device that a recording was made from.
+
+    Attributes
+    ----------
+    name, phys, uniq
+      The name, physical topology and unique identifier of the device.
+
+    info
+      A :class:`DeviceInfo <evdev.device.DeviceInfo>`.
+
+    capabilities
+      A dict mapping event types to event codes, as returned by
+      :func:`InputDevice.capabilities(absinfo=False) <evdev.device.InputDevice.capabilities>`.
+
+    absinfo
+      A dict mapping absolute axes to their :class:`AbsInfo <evdev.device.AbsInfo>`.
+
+    input_props
+      The input properties of the device.
+    """
+
+    name: str
+    phys: str
+    uniq: str
+    info: DeviceInfo
+    capabilities: dict[int, list[int]]
+    absinfo: dict[int, AbsInfo]
+    input_props: list[int]
+
+    @classmethod
+    def from_device(cls, device) -> "DeviceDescription":
+        """Describe an :class:`InputDevice <evdev.device.InputDevice>`."""
+        return cls(
+            name=device.name,
+            phys=device.phys,
+            uniq=device.uniq,
+            info=device.info,
+            capabilities=device.capabilities(absinfo=False),
+            absinfo=dict(device.capabilities().get(ecodes.EV_ABS, [])),
+            input_props=device.input_props(),
+        )
+
+    def _to_json(self) -> dict:
+        return {
+            "name": self.name,
+            "phys": self.phys,
+            "uniq": self.uniq,
+            "info": list(self.info),
+            "capabilities": {str(etype): list(codes) for etype, codes in self.capabilities.items()},
+            "absinfo": {str(code): list(absinfo) for code, absinfo in self.absinfo.items()},
+            "input_props": list(self.input_props),
+        }
+
+    @classmethod
+    def _from_json(cls, data: dict) -> "DeviceDescription":
+        return cls(
+            name=data["name"],
+            phys=data["phys"],
+            uniq=data["uniq"],
+            info=DeviceInfo(*data["info"]),
+            capabilities={int(etype): codes for etype, codes in data["capabilities"].items()},
+            absinfo={int(code): AbsInfo(*absinfo) for code, absinfo in data["absinfo"].items()},
+            input_props=data["input_props"],
+        )
+
+
+class RecordingWriter:
+    """
+    Write a recording of the events of a device to a file.
+
+    Arguments
+    ---------
+    file
+      The path of the file to create, or a binary file object open for writing.
+
+    description
+      The :class:`DeviceDescription` of the device.
+
+    clock
+      The ``time.CLOCK_*`` clock that the events are timestamped with,
+      e.g. the :attr:`clock <evdev.device.InputDevice.clock>` of the device.
+
+    index_interval
+      The number of seconds between the frames in the time index.
+
+    encoding
+      How events are stored - ``"raw"`` or ``"delta"`` (see above).
+
+    block_size
+      The number of events after which a delta encoded block is ended at the
+      next frame boundary.
+    """
+
+    def __init__(
+        self,
+        file: str | os.PathLike | BinaryIO,
+        description: DeviceDescription,
+        clock: int = time.CLOCK_REALTIME,
+        index_interval: float = 1.0,
+        encoding: str = "raw",
+        block_size: int = 4096,
+    ):
+        if encoding not in _ENCODINGS:
+            raise ValueError("unknown encoding %r" % encoding)
+
+        if isinstance(file, (str, bytes, os.PathLike)):
+            self._file = open(file, "wb")
+            self._owned = True
+        else:
+            self._file = file
+            self._owned = False
+
+        self.description = description
+
+        #: The number of events written so far.
+        self.count = 0
+
+        # The time index and the state of index_frames() between writes.
+        self._index: list[tuple[int, int]] = []
+        self._interval_ns = round(index_interval * 1000000000)
+        self._next_ns = -(2**63)
+        self._at_start = True
+        self._closed = False
+
+        self._encoding = encoding
+        self._block_size = block_size
+        # The events that have not been encoded into a block yet.
+        self._pending = bytearray()
+
+        metadata = {
+            "description": description._to_json(),
+            "clock": clock,
+            "byteorder": sys.byteorder,
+            "index_interval_ns": self._interval_ns,
+        }
+        header = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+        padding = -(_PREFIX.size + len(header)) % 8
+        self._file.write(_PREFIX.pack(MAGIC, VERSION, _ENCODINGS[encoding], len(header) + padding, EVENT_SIZE))
+        self._file.write(header + b" " * padding)
+
+    def write(self, events) -> None:
+        """
+        Append the events of an :class:`EventBatch <evdev.eventio.EventBatch>`
+        or any other buffer of raw ``input_event`` structs, such as one filled
+        by :func:`read_into() <evdev.eventio.EventIO.read_into>` or returned by
+        :func:`read_array() <evdev.eventio.EventIO.read_array>`.
+        """
+        data = memoryview(events).cast("B")
+        if len(data) % EVENT_SIZE != 0:
+            raise ValueError("buffer size is not a multiple of the input_event size")
+
+        if self._encoding == "delta":
+            self._pending += data
+            self.count += len(data) // EVENT_SIZE
+            self._write_blocks()
+            return
+
+        self._file.write(data)
+        entries, self._next_ns, self._at_start = _input.index_frames(
+            data, self._interval_ns, self._next_ns, self._at_start
+        )
+        self._index.extend((ns, self.count + index) for ns, index in entries)
+        self.count += len(data) // EVENT_SIZE
+
+    def _write_blocks(self, final: bool = False) -> None:
+        pending = self._pending
+        limit = self._block_size * EVENT_SIZE
+        start = 0
+
+        while len(pending) - start > limit:
+            # End the block with the first frame that is complete past the limit.
+            tail = pending[start + limit - EVENT_SIZE : start + 4 * limit]
+            entries = _input.index_frames(tail, 0, -(2**63), False)[0]
+            if entries:
+                end = start + limit - EVENT_SIZE + entries[0][1] * EVENT_SIZE
+            elif len(pending) - start > 4 * limit:
+                # A frame that never ends is split rather than held back forever.
+                end = start + limit
+            else:
+                break
+            self._file.write(_input.encode_block(pending[start:end]))
+            start = end
+
+        if final and start < len(pending):
+            self._file.write(_input.encode_block(pending[start:]))
+            start = len(pending)
+
+        del pending[:start]
+
+    def write_events(self, events: Iterable[InputEvent]) -> None:
+        """Append an iterable of :class:`InputEvent <evdev.events.InputEvent>` instances."""
+        self.write(pack_events(events))
+
+    def flush(self) -> None:
+        """
+        Flush the events written so far to the file. In the delta encoding,
+        this ends the current block early.
+        """
+        self._write_blocks(final=True)
+        self._file.flush()
+
+    def close(self) -> None:
+        """Write the time index and close the file (if it was opened by the writer)."""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._encoding == "delta":
+            self._write_blocks(final=True)
+        else:
+            pack = _INDEX_ENTRY.pack
+            self._file.write(b"".join(pack(ns, index) for ns, index in self._index))
+            self._file.write(_TRAILER.pack(len(self._index), self.count, INDEX_MAGIC))
+
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self) -> "RecordingWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class Recording:
+    """
+    A recording opened for reading. The file is mapped into memory and the
+    events of a raw recording are exposed as :class:`EventBatch
+    <evdev.eventio.EventBatch>` objects that view the mapping, so opening a
+    recording reads nothing but its description and time index. The blocks
+    of a delta encoded recording are decoded as their events are accessed.
+
+    Timestamps are in seconds, as returned by :func:`InputEvent.timestamp()
+    <evdev.events.InputEvent.timestamp>`. Seeking assumes that they do not go
+    backwards, which is only guaranteed for recordings of devices that use
+    the monotonic or boottime clock (see :func:`InputDevice.set_clock()
+    <evdev.device.InputDevice.set_clock>`).
+
+    Arguments
+    ---------
+    path
+      The path of the recording.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        with open(path, "rb") as file:
+            prefix = file.read(_PREFIX.size)
+            if len(prefix) < _PREFIX.size or not prefix.startswith(MAGIC):
+                raise RecordingError("%s is not a recording" % path)
+
+            _, version, encoding, header_size, event_size = _PREFIX.unpack(prefix)
+            if version > VERSION:
+                raise RecordingError("unsupported recording format version %d" % version)
+            if encoding not in _ENCODINGS.values():
+                raise RecordingError("unsupported event encoding %d" % encoding)
+
+            metadata = json.loads(file.read(header_size))
+            if event_size != EVENT_SIZE or metadata["byteorder"] != sys.byteorder:
+                raise RecordingError("recording was made on a machine with a different input_event layout")
+
+            offset = _PREFIX.size + header_size
+            size = os.fstat(file.fileno()).st_size
+
+            # An empty region cannot be mapped.
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+        #: The format version of the recording.
+        self.version: int = version
+
+        #: The encoding of the events - ``"raw"`` or ``"delta"``.
+        self.encoding: str = next(name for name, value in _ENCODINGS.items() if value == encoding)
+
+        #: The :class:`DeviceDescription` of the recorded device.
+        self.description = DeviceDescription._from_json(metadata["description"])
+
+        #: The ``time.CLOCK_*`` clock that the events are timestamped with.
+        self.clock: int = metadata["clock"]
+
+        self._view = memoryview(b"")
+        self._events: EventBatch | None = None
+
+        # The (start, end) byte offsets of the blocks of a delta encoded recording.
+        self._blocks: list[tuple[int, int]] = []
+
+        if self.encoding == "delta":
+            index = self._read_blocks(offset, size)
+        else:
+            index = self._read_raw(offset, size, metadata["index_interval_ns"])
+
+        self._times = [ns for ns, position in index]
+        self._positions = [position for ns, position in index]
+
+    def _read_raw(self, offset: int, size: int, interval_ns: int) -> list[tuple[int, int]]:
+        index = None
+        if size >= offset + _TRAILER.size:
+            num_entries, count, magic = _TRAILER.unpack_from(self._mmap, size - _TRAILER.size)
+            index_offset = offset + count * EVENT_SIZE
+            if magic == INDEX_MAGIC and index_offset + num_entries * _INDEX_ENTRY.size + _TRAILER.size == size:
+                index = list(_INDEX_ENTRY.iter_unpack(self._mmap[index_offset : size - _TRAILER.size]))
+
+        if index is None:
+            # A trailing partial event (from a recording that was cut short) is ignored.
+            count = max(size - offset, 0) // EVENT_SIZE
+
+        if count:
+            self._view = memoryview(self._mmap)[offset : offset + count * EVENT_SIZE]
+        self._events = EventBatch(self._view)
+        self._count = count
+
+        if index is None:
+            index = _input.index_frames(self._events, interval_ns)[0]
+        return index
+
+    def _read_blocks(self, offset: int, size: int) -> list[tuple[int, int]]:
+        index = []
+        count = 0
+        while offset + _BLOCK_HEADER.size <= size:
+            payload, num_events, usec = _input.block_header(self._mmap, offset)
+            end = offset + _BLOCK_HEADER.size + payload
+            if end > size:
+                # The last block of a recording that was cut short.
+                break
+            self._blocks.append((offset, end))
+            index.append((usec * 1000, count))
+            count += num_events
+            offset = end
+
+        self._count = count
+        return index
+
+    def _decode(self, block: int) -> EventBatch:
+        start, end = self._blocks[block]
+        return _input.decode_block(memoryview(self._mmap)[start:end])
+
+    def _range(self, first: int, last: int) -> EventBatch:
+        # The events from index first up to last, decoded if need be.
+        if self._events is not None:
+            return self._events[first:last]
+        if first >= last:
+            return EventBatch(b"")
+
+        i = bisect.bisect_right(self._positions, first) - 1
+        j = bisect.bisect_left(self._positions, last)
+        batches = [self._decode(block) for block in range(i, j)]
+        batch = batches[0] if len(batches) == 1 else EventBatch(b"".join(batches))
+        base = self._positions[i]
+        return batch[first - base : last - base]
+
+    @property
+    def events(self) -> EventBatch:
+        """
+        All events of the recording as an :class:`EventBatch <evdev.eventio.EventBatch>`.
+        The events of a delta encoded recording are decoded on first access.
+        """
+        if self._events is None:
+            self._events = self._range(0, self._count)
+        return self._events
+
+    @property
+    def start(self) -> float | None:
+        """The timestamp of the first event, or ``None`` if there are no events."""
+        return self._range(0, 1).timestamp()
+
+    @property
+    def end(self) -> float | None:
+        """The timestamp of the last event, or ``None`` if there are no events."""
+        return self._range(self._count - 1, self._count).timestamp()
+
+    def seek(self, timestamp: float) -> int:
+        """
+        Return the index of the first event of the first frame with a timestamp
+        at or after ``timestamp``, or the number of events if there is none.
+        The time index narrows the search down to about one index interval
+        (or block) of events, which are then scanned.
+        """
+        ns = round(timestamp * 1000000) * 1000
+        i = bisect.bisect_right(self._times, ns) - 1
+        if i < 0:
+            return 0
+
+        lo = self._positions[i]
+        hi = self._positions[i + 1] if i + 1 < len(self._positions) else self._count
+        for frame_ns, position in _input.index_frames(self._range(lo, hi))[0]:
+            if frame_ns >= ns:
+                return lo + position
+        return hi
+
+    def slice(self, start: float | None = None, end: float | None = None) -> EventBatch:
+        """
+        Return the events of the frames with timestamps from ``start`` up to
+        (but not including) ``end`` as an :class:`EventBatch <evdev.eventio.EventBatch>`,
+        which views the mapping if the recording is raw. Open-ended if
+        ``start`` or ``end`` is ``None``.
+        """
+        first = 0 if start is None else self.seek(start)
+        last = self._count if end is None else self.seek(end)
+        return self._range(first, last)
+
+    def frames(self, start: float | None = None, end: float | None = None) -> Iterator[EventBatch]:
+        """
+        Yield the frames - runs of events terminated by a ``SYN_REPORT`` -
+        with timestamps from ``start`` up to (but not including) ``end`` as
+        :class:`EventBatch <evdev.eventio.EventBatch>` objects. The events
+        after the last ``SYN_REPORT`` of the recording, if any, are yielded
+        as a last, incomplete frame.
+        """
+        position = 0 if start is None else self.seek(start)
+        last = self._count if end is None else self.seek(end)
+
+        size = 65536
+        while position < last:
+            batch = self._range(position, min(position + size, last))
+            entries, _, complete = _input.index_frames(batch)
+            starts = [index for ns, index in entries]
+
+            if complete or position + len(batch) == last:
+                ends = starts[1:] + [len(batch)]
+            elif len(starts) > 1:
+                # The frame at the end of the batch continues in the next one.
+                ends = starts[1:]
+            else:
+                size *= 2
+                continue
+
+            for frame_start, frame_end in zip(starts, ends):
+                yield batch[frame_start:frame_end]
+            position += ends[-1]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[InputEvent]:
+        for batch in self.batches():
+            yield from batch
+
+    def batches(self, size: int = 4096) -> Iterator[EventBatch]:
+        """
+        Yield the events in batches of up to ``size`` events, which view the
+        mapping if the recording is raw. The batches of a delta encoded
+        recording do not span blocks.
+        """
+        if self.encoding == "raw":
+            events = self._events
+            for start in range(0, len(events), size):
+                yield events[start : start + size]
+            return
+
+        for block in range(len(self._blocks)):
+            events = self._decode(block)
+            for start in range(0, len(events), size):
+                yield events[start : start + size]
+
+    def close(self) -> None:
+        """
+        Close the recording. Batches of its events that are still referenced
+        keep the mapping alive until they are released.
+        """
+        self._events = EventBatch(b"")
+        try:
+            self._view.release()
+            if self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            # Left to be unmapped once the last batch is garbage collected.
+            pass
+
+    def __enter__(self) -> "Recording":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
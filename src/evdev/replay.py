@@ -0,0 +1,126 @@
+"""
+This module replays recorded events into a uinput device with the timing
+they were recorded with. Frames are scheduled against absolute deadlines
+with ``clock_nanosleep()``, so the error of one wakeup does not carry over
+to the next, and every frame is written with a single ``write()``::
+
+    >>> with Recording("session.evrec") as recording:
+    ...     ui = UInput.from_device(...)
+    ...     stats = replay(ui, recording, speed=2.0)
+    >>> stats.lateness_p99_ns
+    61204
+"""
+
+import time
+from typing import Iterable, Iterator, NamedTuple
+
+from . import _input, _uinput, ecodes
+from .eventio import EventBatch, EventIO, pack_events
+from .events import InputEvent
+from .recording import Recording
+
+
+class ReplayStats(NamedTuple):
+    """
+    What :func:`replay()` did. The lateness is how long after its deadline a
+    frame was written, and is ``None`` if nothing was replayed or frames
+    were written as fast as possible.
+    """
+
+    frames: int
+    events: int
+    #: Wall clock duration of the replay in seconds.
+    duration: float
+    lateness_p50_ns: int | None
+    lateness_p99_ns: int | None
+    lateness_max_ns: int | None
+
+
+def _frames(events: "Recording | EventBatch | Iterable[InputEvent]") -> Iterator[EventBatch]:
+    if isinstance(events, Recording):
+        yield from events.frames()
+        return
+
+    if isinstance(events, EventBatch):
+        starts = [index for ns, index in _input.index_frames(events)[0]]
+        for start, end in zip(starts, starts[1:] + [len(events)]):
+            yield events[start:end]
+        return
+
+    frame = []
+    for event in events:
+        frame.append(event)
+        if event.type == ecodes.EV_SYN and event.code == ecodes.SYN_REPORT:
+            yield pack_events(frame)
+            frame = []
+    if frame:
+        yield pack_events(frame)
+
+
+def _percentile(values: list[int], fraction: float) -> int:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def replay(
+    device: EventIO,
+    events: "Recording | EventBatch | Iterable[InputEvent]",
+    speed: float | None = 1.0,
+    clock: int = time.CLOCK_MONOTONIC,
+) -> ReplayStats:
+    """
+    Write events to a device frame by frame, spaced out as their timestamps
+    are. Returns when the last frame has been written.
+
+    Arguments
+    ---------
+    device
+      The device to write to - usually a :class:`UInput <evdev.uinput.UInput>`.
+
+    events
+      A :class:`Recording <evdev.recording.Recording>`, an :class:`EventBatch
+      <evdev.eventio.EventBatch>` or an iterable of :class:`InputEvent
+      <evdev.events.InputEvent>` instances. Events are grouped into frames
+      at every ``SYN_REPORT``.
+
+    speed
+      How many times faster than recorded to replay - e.g. ``0.5`` or
+      ``10``. Frames are written as fast as possible if ``None``.
+
+    clock
+      The ``time.CLOCK_*`` clock to schedule against.
+    """
+    if speed is not None and speed <= 0:
+        raise ValueError("speed must be positive")
+
+    write_at = _uinput.write_at
+    fd = device.fd
+    lateness = []
+    frames = count = 0
+    first_ns = start_ns = 0
+
+    started = time.perf_counter()
+    for frame in _frames(events):
+        if not len(frame):
+            continue
+
+        deadline = 0
+        if speed is not None:
+            frame_ns = frame[0].timestamp_ns()
+            if not frames:
+                first_ns, start_ns = frame_ns, time.clock_gettime_ns(clock)
+            # Frames that are already late, such as ones with timestamps that
+            # went backwards, are written right away.
+            deadline = start_ns + round((frame_ns - first_ns) / speed)
+            lateness.append(write_at(fd, frame, clock, deadline))
+        else:
+            write_at(fd, frame, clock, deadline)
+
+        frames += 1
+        count += len(frame)
+
+    duration = time.perf_counter() - started
+    if not lateness:
+        return ReplayStats(frames, count, duration, None, None, None)
+
+    lateness.sort()
+    return ReplayStats(frames, count, duration, _percentile(lateness, 0.5), _percentile(lateness, 0.99), lateness[-1])
@@ -0,0 +1,241 @@
+"""
+This module provides the :class:`DeviceState` class, which mirrors the
+key, LED, switch and absolute axis state of an input device, as well as
+the state of its multitouch slots. It is kept up to date from the event
+stream and can be brought back in sync with the kernel after events have
+been dropped (see ``SYN_DROPPED`` in the kernel's `event-codes.txt`_).
+
+An :class:`InputDevice <evdev.device.InputDevice>` opened with
+``track_state=True`` keeps a :class:`DeviceState` in its ``state``
+attribute, which answers queries without any ioctl calls::
+
+    >>> device = InputDevice("/dev/input/event1", track_state=True)
+    >>> for event in device.read_loop():
+    ...     if device.state.is_pressed(ecodes.KEY_LEFTCTRL):
+    ...         ...
+
+.. _event-codes.txt: https://www.kernel.org/doc/Documentation/input/event-codes.txt
+"""
+
+import array
+
+from . import _input, ecodes
+from .eventio import EventBatch
+
+# The per-slot axes of multitouch protocol B.
+_MT_CODES = range(ecodes.ABS_MT_SLOT + 1, ecodes.ABS_MT_TOOL_Y + 1)
+
+
+class DeviceState:
+    """
+    A mirror of the state of an input device.
+
+    Arguments
+    ---------
+    capabilities
+      The event types and codes that the device supports, as returned by
+      :func:`InputDevice.capabilities(absinfo=False) <evdev.device.InputDevice.capabilities>`.
+
+    num_slots
+      The number of multitouch slots (``ABS_MT_SLOT`` maximum plus one).
+      Zero for devices that do not use multitouch protocol B.
+    """
+
+    def __init__(self, capabilities: dict[int, list[int]], num_slots: int = 0):
+        self._capabilities = capabilities
+
+        #: The state of every key, LED and switch, indexed by event code.
+        self.keys = bytearray(ecodes.KEY_CNT)
+        self.leds = bytearray(ecodes.LED_CNT)
+        self.switches = bytearray(ecodes.SW_CNT)
+
+        self._bitmaps = {
+            etype: bitmap
+            for etype, bitmap in ((ecodes.EV_KEY, self.keys), (ecodes.EV_LED, self.leds), (ecodes.EV_SW, self.switches))
+            if etype in capabilities
+        }
+
+        abs_codes = capabilities.get(ecodes.EV_ABS, [])
+        mt_codes = []
+        if num_slots:
+            mt_codes = [code for code in abs_codes if code in _MT_CODES]
+            abs_codes = [code for code in abs_codes if code not in _MT_CODES and code != ecodes.ABS_MT_SLOT]
+        self._abs_codes = abs_codes
+        self._mt_codes = mt_codes
+
+        #: The number of multitouch slots.
+        self.num_slots: int = num_slots
+
+        # The axes are kept in fixed-size tables that _input.update_state()
+        # updates in place: a value for every ABS_* code, the selected slot
+        # being that of ABS_MT_SLOT, and a row of those values for every slot.
+        self._abs_values = array.array("i", bytes(4 * ecodes.ABS_CNT))
+        self._slot_values = array.array("i", bytes(4 * ecodes.ABS_CNT * num_slots))
+        if ecodes.ABS_MT_TRACKING_ID in mt_codes:
+            for slot in range(num_slots):
+                self._slot_values[slot * ecodes.ABS_CNT + ecodes.ABS_MT_TRACKING_ID] = -1
+
+    @property
+    def abs(self) -> dict[int, int]:
+        """The values of the absolute axes, excluding the multitouch slot axes."""
+        values = self._abs_values
+        return {code: values[code] for code in self._abs_codes}
+
+    @property
+    def slots(self) -> list[dict[int, int]]:
+        """The values of the multitouch axes of each slot."""
+        values, size = self._slot_values, ecodes.ABS_CNT
+        return [{code: values[slot * size + code] for code in self._mt_codes} for slot in range(self.num_slots)]
+
+    @property
+    def slot(self) -> int:
+        """The currently selected multitouch slot."""
+        return self._abs_values[ecodes.ABS_MT_SLOT]
+
+    @classmethod
+    def from_device(cls, device) -> "DeviceState":
+        """
+        Create a :class:`DeviceState` for an :class:`InputDevice
+        <evdev.device.InputDevice>` and load its current state.
+        """
+        absinfo = dict(device.capabilities(absinfo=True).get(ecodes.EV_ABS, []))
+        num_slots = absinfo[ecodes.ABS_MT_SLOT].max + 1 if ecodes.ABS_MT_SLOT in absinfo else 0
+
+        state = cls(device.capabilities(absinfo=False), num_slots)
+        state.load(device.fd)
+        return state
+
+    def is_pressed(self, code: int) -> bool:
+        """Return ``True`` if the key or button ``code`` is held down."""
+        return self.keys[code] != 0
+
+    def is_on(self, etype: int, code: int) -> bool:
+        """Return ``True`` if the key, LED or switch ``code`` of type ``etype`` is active."""
+        return self._bitmaps[etype][code] != 0
+
+    def abs_value(self, axis: int) -> int:
+        """Return the latest value of an absolute axis (``ABS_MT_*`` axes excluded)."""
+        if axis not in self._abs_codes:
+            raise KeyError(axis)
+        return self._abs_values[axis]
+
+    def active(self, etype: int) -> list[int]:
+        """Return the codes of the currently active keys, LEDs or switches (``EV_KEY``, ``EV_LED``, ``EV_SW``)."""
+        bitmap = self._bitmaps.get(etype)
+        if bitmap is None:
+            return []
+
+        codes = []
+        code = bitmap.find(1)
+        while code != -1:
+            codes.append(code)
+            code = bitmap.find(1, code + 1)
+        return codes
+
+    def snapshot(self, etype: int) -> bytes:
+        """
+        Return a copy of the state of all keys, LEDs or switches, with one
+        byte per event code that is 1 if active and 0 otherwise.
+        """
+        bitmap = self._bitmaps.get(etype)
+        return bytes(bitmap) if bitmap is not None else bytes()
+
+    def update(self, etype: int, code: int, value: int) -> None:
+        """Apply a single event to the state."""
+        bitmap = self._bitmaps.get(etype)
+        if bitmap is not None:
+            if code < len(bitmap):
+                bitmap[code] = value != 0
+        elif etype == ecodes.EV_ABS and code < ecodes.ABS_CNT:
+            if self.num_slots and code in _MT_CODES:
+                if 0 <= self.slot < self.num_slots:
+                    self._slot_values[self.slot * ecodes.ABS_CNT + code] = value
+            else:
+                self._abs_values[code] = value
+
+    def update_batch(self, batch: EventBatch) -> int | None:
+        """
+        Apply the events of an :class:`EventBatch` to the state. If the batch
+        contains a ``SYN_DROPPED``, stop there and return its index.
+        """
+        bitmaps = self._bitmaps
+        return _input.update_state(
+            batch,
+            bitmaps.get(ecodes.EV_KEY),
+            bitmaps.get(ecodes.EV_LED),
+            bitmaps.get(ecodes.EV_SW),
+            self._abs_values,
+            self._slot_values,
+            self.num_slots,
+        )
+
+    def load(self, fd: int) -> None:
+        """Replace the state with the current state of the device, as reported by the kernel."""
+        for etype, bitmap in self._bitmaps.items():
+            bitmap[:] = bytes(len(bitmap))
+            for code in _input.ioctl_EVIOCG_bits(fd, etype):
+                if code < len(bitmap):
+                    bitmap[code] = 1
+
+        for code in self._abs_codes:
+            self._abs_values[code] = _input.ioctl_EVIOCGABS(fd, code)[0]
+
+        if self.num_slots:
+            self._abs_values[ecodes.ABS_MT_SLOT] = _input.ioctl_EVIOCGABS(fd, ecodes.ABS_MT_SLOT)[0]
+            for code in self._mt_codes:
+                values = _input.ioctl_EVIOCGMTSLOTS(fd, code, self.num_slots)
+                for slot, value in enumerate(values):
+                    self._slot_values[slot * ecodes.ABS_CNT + code] = value
+
+    def changes(self, other: "DeviceState") -> list[tuple[int, int, int]]:
+        """
+        Return the ``(type, code, value)`` events that take this state to
+        ``other``, in the order in which libevdev reports them after a
+        ``SYN_DROPPED``: keys, LEDs, switches, absolute axes and slots.
+        """
+        events = []
+
+        for etype, bitmap in self._bitmaps.items():
+            target = other._bitmaps[etype]
+            if bitmap != target:
+                codes = [code for code in range(len(bitmap)) if bitmap[code] != target[code]]
+                events.extend((etype, code, target[code]) for code in codes)
+
+        mine = self.abs
+        events.extend((ecodes.EV_ABS, code, value) for code, value in other.abs.items() if mine.get(code) != value)
+
+        current = self.slot
+        tracking_id = ecodes.ABS_MT_TRACKING_ID
+        for i, (mine, theirs) in enumerate(zip(self.slots, other.slots)):
+            changed = [(code, value) for code, value in theirs.items() if mine[code] != value]
+            if not changed:
+                continue
+
+            events.append((ecodes.EV_ABS, ecodes.ABS_MT_SLOT, i))
+            current = i
+
+            # A slot that has been taken over by a new contact is released
+            # first, so that the change is not mistaken for movement.
+            old_id, new_id = mine.get(tracking_id, -1), theirs.get(tracking_id, -1)
+            if old_id != new_id and old_id != -1 and new_id != -1:
+                events.append((ecodes.EV_ABS, tracking_id, -1))
+
+            events.extend((ecodes.EV_ABS, code, value) for code, value in changed)
+
+        if self.num_slots and current != other.slot:
+            events.append((ecodes.EV_ABS, ecodes.ABS_MT_SLOT, other.slot))
+
+        return events
+
+    def sync(self, fd: int) -> list[tuple[int, int, int]]:
+        """
+        Bring the state in line with the kernel and return the ``(type, code,
+        value)`` events that describe the changes, as returned by :func:`changes()`.
+        """
+        current = DeviceState(self._capabilities, self.num_slots)
+        current.load(fd)
+
+        events = self.changes(current)
+        for event in events:
+            self.update(*event)
+        return events
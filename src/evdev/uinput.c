@@ -1,12 +1,15 @@
 #include <Python.h>
 
 #include <stdio.h>
+#include <stdint.h>
+#include <limits.h>
 #include <string.h>
 #include <errno.h>
 #include <sys/types.h>
 #include <sys/stat.h>
 #include <fcntl.h>
 #include <unistd.h>
+#include <time.h>
 
 #ifdef __FreeBSD__
 #include <dev/evdev/input.h>
@@ -269,27 +272,41 @@ uinput_close(PyObject *self, PyObject *args)
 }
 
 
+// Write a single event. This is the hot path of EventIO.write(), so the
+// arguments are converted without PyArg_ParseTuple() and the timestamp is
+// left at zero - the kernel stamps injected events itself.
 static PyObject *
-uinput_write(PyObject *self, PyObject *args)
+uinput_write(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
 {
-    int fd, type, code, value;
+    long values[4];
 
-    int ret = PyArg_ParseTuple(args, "iiii", &fd, &type, &code, &value);
-    if (!ret) return NULL;
+    if (nargs != 4) {
+        PyErr_Format(PyExc_TypeError, "write() takes exactly 4 arguments (%zd given)", nargs);
+        return NULL;
+    }
+
+    for (int i = 0; i < 4; i++) {
+        values[i] = PyLong_AsLong(args[i]);
+        if (values[i] == -1 && PyErr_Occurred())
+            return NULL;
+        if (values[i] < INT_MIN || values[i] > INT_MAX) {
+            PyErr_SetString(PyExc_OverflowError, "signed integer is greater than maximum");
+            return NULL;
+        }
+    }
 
     struct input_event event;
-    struct timeval tval;
     memset(&event, 0, sizeof(event));
-    gettimeofday(&tval, 0);
-    event.input_event_usec = tval.tv_usec;
-    event.input_event_sec = tval.tv_sec;
-    event.type = type;
-    event.code = code;
-    event.value = value;
-
-    if (write(fd, &event, sizeof(event)) != sizeof(event)) {
-        // @todo: elaborate
-        // PyErr_SetString(PyExc_OSError, "error writing event to uinput device");
+    event.type = values[1];
+    event.code = values[2];
+    event.value = values[3];
+
+    ssize_t nwritten;
+    Py_BEGIN_ALLOW_THREADS
+    nwritten = write((int)values[0], &event, sizeof(event));
+    Py_END_ALLOW_THREADS
+
+    if (nwritten != sizeof(event)) {
         PyErr_SetFromErrno(PyExc_OSError);
         return NULL;
     }
@@ -298,6 +315,102 @@ uinput_write(PyObject *self, PyObject *args)
 }
 
 
+// Write a buffer of packed input_event structs with a single write() call.
+static PyObject *
+uinput_write_buffer(PyObject *self, PyObject *args)
+{
+    int fd;
+    Py_buffer buffer;
+
+    int ret = PyArg_ParseTuple(args, "iy*", &fd, &buffer);
+    if (!ret) return NULL;
+
+    if (buffer.len % sizeof(struct input_event) != 0) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the input_event size");
+        return NULL;
+    }
+
+    ssize_t nwritten;
+    Py_BEGIN_ALLOW_THREADS
+    nwritten = write(fd, buffer.buf, buffer.len);
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(&buffer);
+
+    if (nwritten < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    return PyLong_FromSsize_t(nwritten / sizeof(struct input_event));
+}
+
+
+// Sleep until an absolute deadline in nanoseconds on a clock and write a buffer
+// of packed input_event structs with a single write() call. Returns how many
+// nanoseconds after the deadline the write was issued. A deadline of 0 writes
+// right away.
+static PyObject *
+uinput_write_at(PyObject *self, PyObject *args)
+{
+    int fd, clockid;
+    long long deadline;
+    Py_buffer buffer;
+
+    int ret = PyArg_ParseTuple(args, "iy*iL", &fd, &buffer, &clockid, &deadline);
+    if (!ret) return NULL;
+
+    if (buffer.len % sizeof(struct input_event) != 0) {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the input_event size");
+        return NULL;
+    }
+
+    struct timespec when = { deadline / 1000000000LL, deadline % 1000000000LL };
+    struct timespec now;
+    ssize_t nwritten;
+    int err = 0;
+
+    while (deadline > 0) {
+        Py_BEGIN_ALLOW_THREADS
+        err = clock_nanosleep(clockid, TIMER_ABSTIME, &when, NULL);
+        Py_END_ALLOW_THREADS
+
+        if (err != EINTR)
+            break;
+
+        // Let signal handlers (e.g. KeyboardInterrupt) run during long waits.
+        if (PyErr_CheckSignals() < 0) {
+            PyBuffer_Release(&buffer);
+            return NULL;
+        }
+    }
+
+    if (err) {
+        PyBuffer_Release(&buffer);
+        errno = err;
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    clock_gettime(clockid, &now);
+    nwritten = write(fd, buffer.buf, buffer.len);
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(&buffer);
+
+    if (nwritten < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+
+    if (deadline <= 0)
+        return PyLong_FromLong(0);
+
+    return PyLong_FromLongLong(now.tv_sec * 1000000000LL + now.tv_nsec - deadline);
+}
+
+
 static PyObject *
 uinput_enable_event_type(PyObject *self, PyObject *args)
 {
@@ -355,6 +468,170 @@ uinput_enable_event(PyObject *self, PyObject *args)
         return NULL;
 }
 
+// The ioctl that enables a code of an event type, or 0 if codes of the type cannot be enabled.
+static unsigned long
+set_bit_request(long type)
+{
+    switch (type) {
+        case EV_KEY: return UI_SET_KEYBIT;
+        case EV_ABS: return UI_SET_ABSBIT;
+        case EV_REL: return UI_SET_RELBIT;
+        case EV_MSC: return UI_SET_MSCBIT;
+        case EV_SW:  return UI_SET_SWBIT;
+        case EV_LED: return UI_SET_LEDBIT;
+        case EV_FF:  return UI_SET_FFBIT;
+        case EV_SND: return UI_SET_SNDBIT;
+        default:     return 0;
+    }
+}
+
+
+// Collect the codes of an iterable of codes or of a bitmap of codes (a
+// bytes-like object as returned by EVIOCGBIT) into a new array.
+static int *
+collect_codes(PyObject *codes, Py_ssize_t *count)
+{
+    Py_ssize_t capacity = 64, n = 0;
+    int *out = PyMem_Malloc(capacity * sizeof(int));
+    if (out == NULL) {
+        PyErr_NoMemory();
+        return NULL;
+    }
+
+    if (PyObject_CheckBuffer(codes)) {
+        Py_buffer bitmap;
+        if (PyObject_GetBuffer(codes, &bitmap, PyBUF_SIMPLE) < 0) {
+            PyMem_Free(out);
+            return NULL;
+        }
+
+        const unsigned char *bits = bitmap.buf;
+        Py_ssize_t size = bitmap.len < KEY_CNT / 8 ? bitmap.len : KEY_CNT / 8;
+        int *more = PyMem_Realloc(out, size * 8 * sizeof(int) + 1);
+        if (more == NULL) {
+            PyBuffer_Release(&bitmap);
+            PyMem_Free(out);
+            PyErr_NoMemory();
+            return NULL;
+        }
+        out = more;
+
+        for (Py_ssize_t i = 0; i < size; i++)
+            for (int bit = 0; bit < 8; bit++)
+                if (bits[i] >> bit & 1)
+                    out[n++] = i * 8 + bit;
+        PyBuffer_Release(&bitmap);
+
+        *count = n;
+        return out;
+    }
+
+    PyObject *iter = PyObject_GetIter(codes), *item;
+    if (iter == NULL) {
+        PyMem_Free(out);
+        return NULL;
+    }
+
+    while ((item = PyIter_Next(iter)) != NULL) {
+        long code = PyLong_AsLong(item);
+        Py_DECREF(item);
+        if (code == -1 && PyErr_Occurred())
+            break;
+        if (code < 0 || code >= KEY_CNT) {
+            PyErr_Format(PyExc_ValueError, "event code %ld out of range", code);
+            break;
+        }
+
+        if (n == capacity) {
+            int *more = PyMem_Realloc(out, (capacity *= 2) * sizeof(int));
+            if (more == NULL) {
+                PyErr_NoMemory();
+                break;
+            }
+            out = more;
+        }
+        out[n++] = (int)code;
+    }
+    Py_DECREF(iter);
+
+    if (PyErr_Occurred()) {
+        PyMem_Free(out);
+        return NULL;
+    }
+
+    *count = n;
+    return out;
+}
+
+
+// Enable event types and codes in bulk. Takes a dict that maps event types
+// to iterables or bitmaps of codes. A type that maps to no codes is enabled
+// without enabling any codes, which is how types such as EV_REP are enabled.
+static PyObject *
+uinput_enable_events(PyObject *self, PyObject *args)
+{
+    int fd;
+    PyObject *events;
+
+    int ret = PyArg_ParseTuple(args, "iO!", &fd, &PyDict_Type, &events);
+    if (!ret) return NULL;
+
+    PyObject *items = PyDict_Items(events);
+    if (items == NULL) return NULL;
+
+    for (Py_ssize_t i = 0; i < PyList_GET_SIZE(items); i++) {
+        PyObject *item = PyList_GET_ITEM(items, i);
+        long type = PyLong_AsLong(PyTuple_GET_ITEM(item, 0));
+        if (type == -1 && PyErr_Occurred())
+            goto on_err;
+        if (type < 0 || type > EV_MAX) {
+            PyErr_Format(PyExc_ValueError, "event type %ld out of range", type);
+            goto on_err;
+        }
+
+        Py_ssize_t count = 0;
+        int *codes = collect_codes(PyTuple_GET_ITEM(item, 1), &count);
+        if (codes == NULL)
+            goto on_err;
+
+        unsigned long req = set_bit_request(type);
+        int failed = 0;
+
+        Py_BEGIN_ALLOW_THREADS
+        if (ioctl(fd, UI_SET_EVBIT, type) < 0) {
+            failed = 1;
+        } else if (count && req == 0) {
+            errno = EINVAL;
+            failed = 1;
+        } else {
+            for (Py_ssize_t j = 0; j < count; j++) {
+                if (ioctl(fd, req, codes[j]) < 0) {
+                    failed = 1;
+                    break;
+                }
+            }
+        }
+        Py_END_ALLOW_THREADS
+
+        int err = errno;
+        PyMem_Free(codes);
+
+        if (failed) {
+            _uinput_close(fd);
+            errno = err;
+            PyErr_SetFromErrno(PyExc_OSError);
+            goto on_err;
+        }
+    }
+
+    Py_DECREF(items);
+    Py_RETURN_NONE;
+
+  on_err:
+    Py_DECREF(items);
+    return NULL;
+}
+
 int _uinput_begin_upload(int fd, struct uinput_ff_upload *upload)
 {
     return ioctl(fd, UI_BEGIN_FF_UPLOAD, upload);
@@ -389,12 +666,21 @@ static PyMethodDef MethodTable[] = {
     { "close",  uinput_close, METH_VARARGS,
       "Destroy uinput device."},
 
-    { "write",  uinput_write, METH_VARARGS,
+    { "write",  (PyCFunction)(void(*)(void))uinput_write, METH_FASTCALL,
       "Write event to uinput device."},
 
+    { "write_buffer",  uinput_write_buffer, METH_VARARGS,
+      "Write a buffer of packed events to uinput device."},
+
+    { "write_at",  uinput_write_at, METH_VARARGS,
+      "Write a buffer of packed events to uinput device at a deadline."},
+
     { "enable", uinput_enable_event, METH_VARARGS,
       "Enable a type of event."},
 
+    { "enable_events", uinput_enable_events, METH_VARARGS,
+      "Enable event types and codes in bulk."},
+
     { "enable_type", uinput_enable_event_type, METH_VARARGS,
       "Enable an event type without enabling an event code."},
 
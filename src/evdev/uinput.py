@@ -10,6 +10,7 @@ from typing import Sequence
 from . import _uinput, ecodes, ff, util
 from .device import InputDevice, AbsInfo
 from .events import InputEvent
+from .recording import DeviceDescription
 
 try:
     from evdev.eventio_async import EventIO
@@ -37,6 +38,7 @@ class UInput(EventIO):
         "devnode",
         "fd",
         "device",
+        "writable",
     )
 
     @classmethod
@@ -84,6 +86,51 @@ class UInput(EventIO):
 
         return cls(events=all_capabilities, **kwargs)
 
+    @classmethod
+    def from_description(
+        cls,
+        description: DeviceDescription,
+        filtered_types: tuple[int] = (ecodes.EV_SYN, ecodes.EV_FF),
+        **kwargs,
+    ) -> "UInput":
+        """
+        Create an UInput device from a :class:`DeviceDescription
+        <evdev.recording.DeviceDescription>`, such as that of a recording or
+        one read with :func:`evemu.read_description() <evdev.evemu.read_description>`.
+
+        Arguments
+        ---------
+        description
+          The description of the device to create.
+
+        filtered_types : Tuple[event type codes]
+          Event types to exclude from the capabilities of the uinput device.
+
+        **kwargs
+          Keyword arguments to UInput constructor, which take precedence
+          over the description.
+        """
+
+        events = {}
+        for etype, codes in description.capabilities.items():
+            if etype in filtered_types:
+                continue
+            if etype == ecodes.EV_ABS:
+                codes = [(code, description.absinfo.get(code, AbsInfo(0, 0, 0, 0, 0, 0))) for code in codes]
+            events[etype] = codes
+
+        bustype, vendor, product, version = description.info
+        kwargs.setdefault("name", description.name)
+        kwargs.setdefault("bustype", bustype)
+        kwargs.setdefault("vendor", vendor)
+        kwargs.setdefault("product", product)
+        kwargs.setdefault("version", version)
+        kwargs.setdefault("input_props", description.input_props)
+        if description.phys:
+            kwargs.setdefault("phys", description.phys)
+
+        return cls(events=events, **kwargs)
+
     def __init__(
         self,
         events: dict[int, Sequence[int]] | None = None,
@@ -153,10 +200,11 @@ class UInput(EventIO):
 
         self._verify()
 
-        #: Write-only, non-blocking file descriptor to the uinput device node.
+        #: Non-blocking file descriptor to the uinput device node, opened for reading and writing.
         self.fd = _uinput.open(devnode)
+        self.writable: bool = True
 
-        # Prepare the list of events for passing to _uinput.enable and _uinput.setup.
+        # Prepare the list of events for passing to _uinput.enable_events and _uinput.setup.
         absinfo, prepared_events = self._prepare_events(events)
 
         # Set phys name
@@ -167,12 +215,12 @@ class UInput(EventIO):
         for prop in input_props:
             _uinput.set_prop(self.fd, prop)
 
-        for etype, codes in events.items():
-            if not codes:
-                _uinput.enable_type(self.fd, etype)
-
+        # Enable all event types and codes with one call into the extension.
+        # Types without codes are enabled on their own.
+        codes = {etype: [] for etype in events}
         for etype, code in prepared_events:
-            _uinput.enable(self.fd, etype, code)
+            codes[etype].append(code)
+        _uinput.enable_events(self.fd, codes)
 
         _uinput.setup(self.fd, name, vendor, product, version, bustype, absinfo, max_effects)
 
@@ -189,7 +237,7 @@ class UInput(EventIO):
         self.device: InputDevice = self._find_device(self.fd)
 
     def _prepare_events(self, events: dict[int, Sequence[int]]):
-        """Prepare events for passing to _uinput.enable and _uinput.setup"""
+        """Prepare events for passing to _uinput.enable_events and _uinput.setup"""
         absinfo, prepared_events = [], []
         for etype, codes in events.items():
             for code in codes:
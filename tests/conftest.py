@@ -0,0 +1,65 @@
+import os
+import struct
+
+from pytest import fixture
+
+from evdev import ecodes, eventio_async
+from evdev.eventio import EventBatch, EventIO
+
+# The native layout of struct input_event: struct timeval, __u16, __u16, __s32.
+event_struct = struct.Struct("llHHi")
+
+
+class PipeIO(EventIO):
+    """
+    An EventIO backed by a pipe instead of a device node. Events fed into the
+    pipe are read from ``fd``. With ``writer``, ``fd`` is the write end instead,
+    and what was written to it can be read back with :func:`received()`.
+    """
+
+    def __init__(self, blocking=False, writer=False):
+        self.rfd, self.wfd = os.pipe()
+        os.set_blocking(self.rfd, blocking)
+        self.fd = self.wfd if writer else self.rfd
+
+    def feed(self, *events):
+        """Write ``(sec, usec, type, code, value)`` tuples to the pipe."""
+        os.write(self.wfd, b"".join(event_struct.pack(*event) for event in events))
+
+    def feed_keys(self, *codes):
+        """Write a key press with a zero timestamp for each code."""
+        self.feed(*((0, 0, ecodes.EV_KEY, code, 1) for code in codes))
+
+    def received(self):
+        """Return the events that are in the pipe as an EventBatch."""
+        os.set_blocking(self.rfd, False)
+        return EventBatch(os.read(self.rfd, 65536))
+
+    def close(self):
+        os.close(self.rfd)
+        os.close(self.wfd)
+
+
+class AsyncPipeIO(PipeIO, eventio_async.EventIO):
+    pass
+
+
+@fixture
+def make_pipe():
+    """Return a factory of :class:`PipeIO` objects, which are closed after the test."""
+    pipes = []
+
+    def make(cls=PipeIO, **kwargs):
+        pipe = cls(**kwargs)
+        pipes.append(pipe)
+        return pipe
+
+    yield make
+    for pipe in pipes:
+        pipe.close()
+
+
+@fixture
+def pipe(make_pipe):
+    """A non-blocking :class:`PipeIO`."""
+    return make_pipe()
@@ -0,0 +1,42 @@
+from pytest import fixture, raises
+
+from evdev import ecodes
+from evdev.deviceset import DeviceSet
+
+
+@fixture
+def pipes(make_pipe):
+    return [make_pipe() for _ in range(3)]
+
+
+def test_poll(pipes):
+    with DeviceSet(pipes, max_events=1) as devices:
+        assert len(devices) == 3
+        assert devices.poll(0) == []
+
+        pipes[0].feed_keys(ecodes.KEY_A)
+        pipes[2].feed_keys(ecodes.KEY_B, ecodes.KEY_C)
+        ready = {device: batch.codes for device, batch in devices.poll(1)}
+        assert ready == {pipes[0]: (ecodes.KEY_A,), pipes[2]: (ecodes.KEY_B, ecodes.KEY_C)}
+        assert devices.poll(0) == []
+
+
+def test_add_remove(pipes):
+    devices = DeviceSet()
+    devices.add(pipes[0])
+    devices.add(pipes[0])
+    devices.add(pipes[1])
+    assert list(devices) == pipes[:2]
+
+    devices.remove(pipes[0])
+    assert pipes[0] not in devices
+    with raises(KeyError):
+        devices.remove(pipes[0])
+    devices.discard(pipes[0])
+
+    pipes[0].feed_keys(ecodes.KEY_A)
+    pipes[1].feed_keys(ecodes.KEY_B)
+    loop = devices.read_loop()
+    device, batch = next(loop)
+    assert device is pipes[1] and batch.codes == (ecodes.KEY_B,)
+    devices.close()
@@ -0,0 +1,121 @@
+import io
+import struct
+
+import pytest
+from pytest import raises
+
+from evdev import ecodes, evemu
+from evdev.device import AbsInfo, DeviceInfo
+from evdev.eventio import EVENT_SIZE, EventBatch
+
+event_struct = struct.Struct("llHHi")
+
+if event_struct.size != EVENT_SIZE:
+    pytest.skip("unexpected input_event layout", allow_module_level=True)
+
+touchpad = b"""\
+# EVEMU 1.3
+# Kernel: 6.8.0
+# Input device name: "SynPS/2 Synaptics TouchPad"
+N: SynPS/2 Synaptics TouchPad
+I: 0011 0002 0007 01b1
+P: 05 00 00 00 00 00 00 00
+B: 00 0b 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 01 20 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 01 00 00 00 00 00 00 00 00
+B: 03 03 00 00 00 00 00 00 00
+A: 00 1278 5664 0 0 46
+A: 01 1206 4646 0 0 50
+S: 00 00 00 00 00 00 00 00
+################################
+#      Waiting for events      #
+################################
+E: 0.000000 0001 0145 0001\t# EV_KEY / BTN_TOOL_FINGER  1
+E: 0.000000 0003 0000 3085\t# EV_ABS / ABS_X  3085
+E: 0.000000 0003 0001 -3\t# EV_ABS / ABS_Y  -3
+E: 0.000000 0000 0000 0000\t# ------------ SYN_REPORT (0) ---------- +0ms
+E: 0.012417 0003 0000 3090\t# EV_ABS / ABS_X  3090
+E: 0.012417 0000 0000 0000\t# ------------ SYN_REPORT (0) ---------- +12ms
+"""
+
+
+def test_read_description():
+    description = evemu.read_description(io.BytesIO(touchpad))
+    assert description.name == "SynPS/2 Synaptics TouchPad"
+    assert description.info == DeviceInfo(0x11, 2, 7, 0x1B1)
+    assert description.input_props == [ecodes.INPUT_PROP_POINTER, ecodes.INPUT_PROP_BUTTONPAD]
+    assert description.capabilities == {
+        ecodes.EV_SYN: [ecodes.EV_SYN, ecodes.EV_KEY, ecodes.EV_ABS],
+        ecodes.EV_KEY: [ecodes.BTN_TOOL_FINGER],
+        ecodes.EV_ABS: [ecodes.ABS_X, ecodes.ABS_Y],
+    }
+    assert description.absinfo[ecodes.ABS_Y] == AbsInfo(0, 1206, 4646, 0, 0, 50)
+
+    with raises(ValueError):
+        evemu.read_description(io.BytesIO(b"E: 0.000000 0000 0000 0000\n"))
+
+
+def test_description_roundtrip(tmp_path):
+    description = evemu.read_description(io.BytesIO(touchpad))
+    path = tmp_path / "touchpad.evemu"
+    evemu.write_description(path, description)
+    assert evemu.read_description(path) == description
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1 << 20])
+def test_read_events(chunk_size):
+    batches = list(evemu.read_events(io.BytesIO(touchpad), chunk_size))
+    events = [event for batch in batches for event in batch]
+    assert [(e.sec, e.usec, e.type, e.code, e.value) for e in events] == [
+        (0, 0, ecodes.EV_KEY, ecodes.BTN_TOOL_FINGER, 1),
+        (0, 0, ecodes.EV_ABS, ecodes.ABS_X, 3085),
+        (0, 0, ecodes.EV_ABS, ecodes.ABS_Y, -3),
+        (0, 0, ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+        (0, 12417, ecodes.EV_ABS, ecodes.ABS_X, 3090),
+        (0, 12417, ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+    ]
+
+
+def test_events_roundtrip(tmp_path):
+    values = [0, 1, -1, 2**31 - 1, -(2**31)]
+    data = b"".join(event_struct.pack(i, i * 7, ecodes.EV_ABS, i, v) for i, v in enumerate(values))
+    path = tmp_path / "touchpad.evemu"
+    evemu.write_description(path, evemu.read_description(io.BytesIO(touchpad)))
+    evemu.write_events(path, EventBatch(data))
+    evemu.write_events(path, data)
+
+    assert b"E: 4.000028 0003 0004 -2147483648\n" in path.read_bytes()
+    assert b"".join(bytes(batch) for batch in evemu.read_events(path)) == data * 2
+
+
+def test_write_events_unaligned():
+    # Events at an odd offset of a bytes-like object are formatted all the same.
+    data = event_struct.pack(1, 2, ecodes.EV_KEY, ecodes.KEY_A, 1)
+    out = io.BytesIO()
+    evemu.write_events(out, memoryview(b"x" + data)[1:])
+    assert out.getvalue() == b"E: 1.000002 0001 001e 1\n"
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b"E: 0.000000 0003 0000",
+        b"E: 0 0003 0000 1",
+        b"E: 0.0 00003 0000 1",
+        b"E: 0.0 0003 0000 2147483648",
+        b"E: 0.0 0 0 1x",
+    ],
+)
+def test_malformed_events(line):
+    with raises(ValueError):
+        list(evemu.read_events(io.BytesIO(b"N: test\n" + line + b"\n")))
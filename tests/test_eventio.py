@@ -0,0 +1,490 @@
+import asyncio
+import contextlib
+import gc
+
+import pytest
+from conftest import AsyncPipeIO, event_struct
+from pytest import fixture, raises
+
+from evdev import ecodes
+from evdev.eventio import EvdevError, EventBatch, EventDispatcher, EventFilter, EVENT_SIZE, coalesce, pack_events
+from evdev.events import InputEvent
+
+# -----------------------------------------------------------------------------
+if event_struct.size != EVENT_SIZE:
+    pytest.skip("unexpected input_event layout", allow_module_level=True)
+
+
+@fixture
+def io(pipe):
+    return pipe
+
+
+key_tap = [
+    (1, 100, ecodes.EV_KEY, ecodes.KEY_A, 1),
+    (1, 100, ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+    (1, 200, ecodes.EV_KEY, ecodes.KEY_A, 0),
+    (1, 200, ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+]
+
+
+# -----------------------------------------------------------------------------
+def test_read(io):
+    io.feed(*key_tap)
+    evs = list(io.read())
+    assert [(e.sec, e.usec, e.type, e.code, e.value) for e in evs] == key_tap
+
+
+def test_read_into(io):
+    io.feed(*key_tap)
+    buf = bytearray(EVENT_SIZE * 3)
+    assert io.read_into(buf) == 3
+    assert [event_struct.unpack_from(buf, i * EVENT_SIZE) for i in range(3)] == key_tap[:3]
+
+    buf = memoryview(bytearray(EVENT_SIZE * 8))
+    assert io.read_into(buf) == 1
+    assert event_struct.unpack_from(buf) == key_tap[3]
+
+    with raises(BlockingIOError):
+        io.read_into(buf)
+
+
+def test_read_into_small_buffer(io):
+    with raises(ValueError):
+        io.read_into(bytearray(EVENT_SIZE - 1))
+
+    with raises(TypeError):
+        io.read_into(bytes(EVENT_SIZE))
+
+
+def test_read_max_events(io):
+    io.feed(*key_tap)
+    assert len(list(io.read(max_events=3))) == 3
+    assert len(list(io.read(max_events=3))) == 1
+
+    with raises(BlockingIOError):
+        list(io.read())
+
+    with raises(ValueError):
+        list(io.read(max_events=0))
+
+
+def test_read_drain(io):
+    io.feed(*key_tap * 50)
+    evs = list(io.read(max_events=3, drain=True))
+    assert len(evs) == 200
+    assert [(e.sec, e.usec, e.type, e.code, e.value) for e in evs[-4:]] == key_tap
+
+
+def test_read_loop(io):
+    io.feed(*key_tap * 2)
+    loop = io.read_loop(max_events=4)
+    evs = [next(loop) for _ in range(8)]
+    assert [e.value for e in evs] == [e[4] for e in key_tap * 2]
+
+
+def test_read_array(io):
+    numpy = pytest.importorskip("numpy")
+    from evdev.eventio import event_dtype
+
+    assert event_dtype().itemsize == EVENT_SIZE
+
+    io.feed(*key_tap)
+    events = io.read_array()
+    assert len(events) == 4
+    assert events["code"].tolist() == [e[3] for e in key_tap]
+    assert events[2].tolist() == key_tap[2]
+    assert numpy.count_nonzero(events["type"] == ecodes.EV_SYN) == 2
+
+
+def test_read_batch(io):
+    io.feed(*key_tap)
+    batch = io.read_batch()
+    assert len(batch) == 4
+    assert not batch.more
+    assert batch.types == tuple(e[2] for e in key_tap)
+    assert batch.codes == tuple(e[3] for e in key_tap)
+    assert batch.values == tuple(e[4] for e in key_tap)
+    assert batch.secs == (1, 1, 1, 1)
+    assert batch.usecs == (100, 100, 200, 200)
+
+    ev = batch[-2]
+    assert isinstance(ev, InputEvent)
+    assert (ev.sec, ev.usec, ev.type, ev.code, ev.value) == key_tap[2]
+    assert [e.value for e in batch] == [1, 0, 0, 0]
+
+    with raises(IndexError):
+        batch[4]
+
+
+def test_read_batch_more(io):
+    io.feed(*key_tap)
+    assert io.read_batch(max_events=4).more
+    with raises(BlockingIOError):
+        io.read_batch()
+
+
+def test_batch_slice_and_buffer(io):
+    io.feed(*key_tap)
+    batch = io.read_batch()
+
+    assert bytes(batch) == b"".join(event_struct.pack(*e) for e in key_tap)
+    assert len(memoryview(batch)) == 4 * EVENT_SIZE
+
+    head = batch[1:3]
+    assert isinstance(head, EventBatch)
+    assert head.codes == (ecodes.SYN_REPORT, ecodes.KEY_A)
+    assert bytes(head) == bytes(batch)[EVENT_SIZE : 3 * EVENT_SIZE]
+
+    assert batch[::2].types == (ecodes.EV_KEY, ecodes.EV_KEY)
+    assert len(batch[3:1]) == 0
+    del batch
+    assert head.values == (0, 0)
+
+
+def test_batch_from_buffer():
+    raw = bytearray(b"".join(event_struct.pack(*e) for e in key_tap))
+    batch = EventBatch(raw)
+    assert batch.codes == tuple(e[3] for e in key_tap)
+
+    with raises(ValueError):
+        EventBatch(raw[:-1])
+
+
+def test_write_events(make_pipe):
+    out = make_pipe(writer=True)
+    out.writable = True
+    events = [(ecodes.EV_KEY, ecodes.KEY_A, 1), InputEvent(5, 6, ecodes.EV_KEY, ecodes.KEY_B, -1)]
+    assert out.write_many(events) == 2
+    assert out.write_frame(iter(events)) == 3
+    assert out.write_frame(EventBatch(event_struct.pack(1, 2, ecodes.EV_KEY, ecodes.KEY_C, 1))) == 2
+    assert out.write_many([]) == 0
+
+    batch = out.received()
+    assert batch.codes == (30, 48, 30, 48, 0, 46, 0)
+    assert batch.values == (1, -1, 1, -1, 0, 1, 0)
+
+    with raises(TypeError):
+        out.write_many([(ecodes.EV_KEY, ecodes.KEY_A)])
+    with raises(ValueError):
+        out.write_frame([(ecodes.EV_KEY, 0x10000, 1)])
+    with raises(ValueError):
+        out.write_many(b"\0")
+    with raises(ValueError):
+        out.write_frame(b"\0")
+    with raises(BlockingIOError):
+        out.received()
+
+
+def test_write_access(io):
+    io.path = "pipe"
+    # The access mode of the read end of the pipe is looked up.
+    with raises(EvdevError):
+        io.write(ecodes.EV_KEY, ecodes.KEY_A, 1)
+
+    io.writable = False
+    with raises(EvdevError):
+        io.write_frame([(ecodes.EV_KEY, ecodes.KEY_A, 1)])
+
+    # The recorded access mode is trusted, so the write is attempted.
+    io.writable = True
+    with raises(OSError):
+        io.write(ecodes.EV_KEY, ecodes.KEY_A, 1)
+
+
+def test_filter(io):
+    presses = EventFilter({ecodes.EV_KEY: [ecodes.KEY_A, ecodes.KEY_B]}, values=[1])
+    assert presses.match(ecodes.EV_KEY, ecodes.KEY_A, 1)
+    assert not presses.match(ecodes.EV_KEY, ecodes.KEY_A, 0)
+    assert not presses.match(ecodes.EV_KEY, ecodes.KEY_C, 1)
+    assert not presses.match(ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+
+    io.feed(*key_tap)
+    batch = io.read_batch(max_events=4, filter=presses)
+    assert batch.codes == (ecodes.KEY_A,)
+    assert batch.more
+
+    io.feed(*key_tap)
+    assert [e.value for e in io.read(filter=EventFilter({ecodes.EV_KEY: None}))] == [1, 0]
+
+    io.feed(*key_tap)
+    batch = io.read_batch()
+    assert EventFilter().apply(batch).codes == batch.codes
+    assert EventFilter({ecodes.EV_SYN: None}).apply(batch).codes == (ecodes.SYN_REPORT,) * 2
+    assert len(EventFilter({ecodes.EV_REL: None}).apply(batch)) == 0
+
+    with raises(ValueError):
+        EventFilter({ecodes.EV_KEY: [ecodes.KEY_MAX + 1]})
+    with raises(TypeError):
+        io.read_batch(filter=object())
+
+
+def test_dispatcher(io):
+    pressed = []
+    dispatcher = EventDispatcher({(ecodes.EV_KEY, ecodes.KEY_A): pressed.append}, values=(1,))
+
+    io.feed(*key_tap, *key_tap)
+    assert dispatcher.dispatch(io.read_batch(filter=dispatcher.filter)) == 2
+    assert [(e.type, e.code, e.value) for e in pressed] == [(ecodes.EV_KEY, ecodes.KEY_A, 1)] * 2
+
+
+def motion(usec, *events):
+    return [(0, usec, *event) for event in events] + [(0, usec, ecodes.EV_SYN, ecodes.SYN_REPORT, 0)]
+
+
+def test_pack_events():
+    batch = pack_events([InputEvent(1, 2, ecodes.EV_KEY, ecodes.KEY_A, 1), (ecodes.EV_SYN, ecodes.SYN_REPORT, 0)], 3, 4)
+    assert bytes(batch) == event_struct.pack(1, 2, ecodes.EV_KEY, ecodes.KEY_A, 1) + event_struct.pack(3, 4, 0, 0, 0)
+    assert len(pack_events(iter([]))) == 0
+
+    with raises(TypeError):
+        pack_events([(ecodes.EV_KEY, ecodes.KEY_A)])
+    with raises(ValueError):
+        pack_events([(ecodes.EV_KEY, 0x10000, 1)])
+
+
+def test_coalesce(io):
+    rel_x, rel_y = (ecodes.EV_REL, ecodes.REL_X), (ecodes.EV_REL, ecodes.REL_Y)
+    events = [
+        *motion(100, (*rel_x, 1), (*rel_y, 2), (*rel_x, 3)),
+        *motion(200, (*rel_x, 4), (ecodes.EV_ABS, ecodes.ABS_X, 7), (ecodes.EV_ABS, ecodes.ABS_X, 8)),
+        *motion(300, (*rel_y, 5), (ecodes.EV_KEY, ecodes.BTN_LEFT, 1)),
+        *motion(400, (*rel_x, 6)),
+        *motion(2000, (*rel_x, 7)),
+        (0, 2100, *rel_y, 8),
+        (0, 2100, *rel_y, 9),
+    ]
+    raw = b"".join(event_struct.pack(*event) for event in events)
+
+    def unpack(batch):
+        return [(e.usec, e.type, e.code, e.value) for e in batch]
+
+    syn = (ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+    assert unpack(coalesce(raw)) == [
+        (100, *rel_x, 4),
+        (100, *rel_y, 2),
+        (100, *syn),
+        (200, *rel_x, 4),
+        (200, ecodes.EV_ABS, ecodes.ABS_X, 8),
+        (200, *syn),
+        (300, *rel_y, 5),
+        (300, ecodes.EV_KEY, ecodes.BTN_LEFT, 1),
+        (300, *syn),
+        (400, *rel_x, 6),
+        (400, *syn),
+        (2000, *rel_x, 7),
+        (2000, *syn),
+        (2100, *rel_y, 17),
+    ]
+
+    # Frames of motion are merged across until a key event or the end of the window.
+    assert unpack(coalesce(raw, 0.001)) == [
+        (200, *rel_x, 8),
+        (100, *rel_y, 2),
+        (200, ecodes.EV_ABS, ecodes.ABS_X, 8),
+        (200, *syn),
+        (300, *rel_y, 5),
+        (300, ecodes.EV_KEY, ecodes.BTN_LEFT, 1),
+        (300, *syn),
+        (400, *rel_x, 6),
+        (400, *syn),
+        (2000, *rel_x, 7),
+        (2000, *syn),
+        (2100, *rel_y, 17),
+    ]
+
+    batch = EventBatch(raw)
+    for window in (0, 0.001, 1):
+        merged = coalesce(batch, window)
+        for code in (ecodes.REL_X, ecodes.REL_Y):
+            assert sum(e.value for e in merged if e.code == code and e.type == ecodes.EV_REL) == sum(
+                e.value for e in batch if e.code == code and e.type == ecodes.EV_REL
+            )
+
+    io.feed(*events)
+    assert unpack(io.read_batch(coalesce=0.001)) == unpack(coalesce(raw, 0.001))
+
+    with raises(ValueError):
+        coalesce(raw, -1)
+
+
+def test_read_frames(io):
+    io.feed(*key_tap[:3])
+    frames = list(io.read_frames())
+    assert len(frames) == 1
+    assert frames[0].codes == (ecodes.KEY_A, ecodes.SYN_REPORT)
+    assert (frames[0].sec, frames[0].usec) == (1, 100)
+    assert frames[0].timestamp() == 1.0001
+    assert frames[0].timestamp_ns() == 1000100000
+
+    # The key release is held back until its SYN_REPORT arrives.
+    io.feed(key_tap[3], *key_tap)
+    frames = list(io.read_frames(max_events=2))
+    assert [frame.values for frame in frames] == [(0, 0)]
+    frames = list(io.read_frames())
+    assert [frame.values for frame in frames] == [(1, 0), (0, 0)]
+    assert frames[1].usec == 200
+
+    with raises(BlockingIOError):
+        list(io.read_frames())
+
+
+@fixture
+def aio(make_pipe):
+    return make_pipe(AsyncPipeIO)
+
+
+def test_async_read_frames(aio):
+    async def read():
+        aio.feed(*key_tap)
+        return list(await aio.async_read_frames())
+
+    frames = asyncio.run(read())
+    assert [frame.codes for frame in frames] == [(ecodes.KEY_A, ecodes.SYN_REPORT)] * 2
+
+
+def test_async_read_loop(aio):
+    async def read():
+        events = []
+        aio.feed(*key_tap)
+        async for event in aio.async_read_loop():
+            events.append((event.sec, event.usec, event.type, event.code, event.value))
+            if len(events) == 4:
+                aio.feed(*key_tap[:2])
+            if len(events) == 6:
+                return events
+
+    assert asyncio.run(read()) == key_tap + key_tap[:2]
+
+
+def test_async_read_loop_break(aio):
+    async def first():
+        aio.feed(*key_tap[:2])
+        async for event in aio.async_read_loop():
+            return event.code
+
+    async def second():
+        codes = []
+        async for event in aio.async_read_loop():
+            codes.append(event.code)
+            if len(codes) == 2:
+                return codes
+
+    async def read():
+        assert await first() == ecodes.KEY_A
+        # The first iterator is gone and must no longer take events from the device.
+        aio.feed(*key_tap[2:])
+        await asyncio.sleep(0.01)
+        return await asyncio.wait_for(second(), 1)
+
+    assert asyncio.run(read()) == [ecodes.KEY_A, ecodes.SYN_REPORT]
+
+
+def test_async_read_loop_aclose(aio):
+    async def read():
+        async with contextlib.aclosing(aio.async_read_loop()) as events:
+            aio.feed(*key_tap[:2])
+            assert (await anext(events)).code == ecodes.KEY_A
+            reader = events
+        assert not reader._reading
+
+    asyncio.run(read())
+
+
+def test_async_read_loop_backpressure(aio):
+    async def read():
+        it = aio.async_read_loop(batches=True, max_events=2, max_pending=3)
+        aio.feed(*key_tap)
+        batch = await anext(it)
+        assert len(batch) == 4
+
+        aio.feed(*key_tap)
+        await asyncio.sleep(0.01)
+        assert not it._reading
+
+        # Once the queued batch is taken, reading resumes.
+        aio.feed(*key_tap[:1])
+        assert len(await anext(it)) == 4
+        assert it._reading
+        assert len(await anext(it)) == 1
+        it.close()
+
+    asyncio.run(read())
+
+
+def test_async_read_loop_coalesce(aio):
+    async def read():
+        it = aio.async_read_loop(batches=True, coalesce=1)
+        aio.feed(*motion(100, (ecodes.EV_REL, ecodes.REL_X, 1)), *motion(200, (ecodes.EV_REL, ecodes.REL_X, 2)))
+        batch = await anext(it)
+        it.close()
+        return batch
+
+    batch = asyncio.run(read())
+    assert (batch.codes, batch.values) == ((ecodes.REL_X, ecodes.SYN_REPORT), (3, 0))
+
+
+def test_merge(make_pipe):
+    from evdev import merge
+
+    devices = [make_pipe(AsyncPipeIO) for _ in range(3)]
+    devices[0].feed((2, 0, ecodes.EV_KEY, ecodes.KEY_A, 1))
+    devices[1].feed((1, 0, ecodes.EV_KEY, ecodes.KEY_B, 1), (3, 0, ecodes.EV_KEY, ecodes.KEY_B, 0))
+    devices[2].feed((1, 5, ecodes.EV_KEY, ecodes.KEY_C, 1))
+
+    async def read():
+        merged = merge(devices, window=0.01)
+        result = [await anext(merged) for _ in range(3)]
+
+        # A batch that arrives within the window is ordered before a later one.
+        devices[0].feed((5, 0, ecodes.EV_KEY, ecodes.KEY_A, 0))
+        await asyncio.sleep(0)
+        devices[2].feed((4, 0, ecodes.EV_KEY, ecodes.KEY_C, 0))
+        result += [await anext(merged) for _ in range(2)]
+        merged.close()
+        return result
+
+    result = asyncio.run(read())
+    assert [(devices.index(device), batch.codes) for device, batch in result] == [
+        (1, (ecodes.KEY_B, ecodes.KEY_B)),
+        (2, (ecodes.KEY_C,)),
+        (0, (ecodes.KEY_A,)),
+        (2, (ecodes.KEY_C,)),
+        (0, (ecodes.KEY_A,)),
+    ]
+
+
+def test_merge_break(make_pipe):
+    from evdev import merge
+
+    devices = [make_pipe(AsyncPipeIO) for _ in range(2)]
+
+    async def read():
+        for device in devices:
+            device.feed(*key_tap)
+        async for device, batch in merge(devices):
+            break
+        gc.collect()
+        await asyncio.sleep(0)
+        # The iterator unregistered the devices when it was collected.
+        loop = asyncio.get_running_loop()
+        return [loop.remove_reader(device.fileno()) for device in devices]
+
+    assert asyncio.run(read()) == [False, False]
+
+
+def test_merge_aclose(make_pipe):
+    from evdev import merge
+
+    devices = [make_pipe(AsyncPipeIO) for _ in range(2)]
+
+    async def read():
+        devices[0].feed(*key_tap)
+        async with contextlib.aclosing(merge(devices)) as merged:
+            async for device, batch in merged:
+                break
+            assert merged._heap == []
+        loop = asyncio.get_running_loop()
+        return [loop.remove_reader(device.fileno()) for device in devices]
+
+    assert asyncio.run(read()) == [False, False]
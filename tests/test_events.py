@@ -25,3 +25,9 @@ def test_keyevent():
     assert k.event == e
     assert k.scancode == ecodes.KEY_A
     assert k.keycode == "KEY_A"  # :todo:
+
+
+def test_timestamp_ns():
+    e = events.InputEvent(1036996631, 984417, ecodes.EV_KEY, ecodes.KEY_A, 2)
+    assert e.timestamp_ns() == 1036996631984417000
+    assert isinstance(e.timestamp_ns(), int)
@@ -0,0 +1,82 @@
+import struct
+
+from pytest import raises
+
+from evdev import ecodes
+from evdev.eventio import EventBatch
+from evdev.mt import SlotTracker
+
+event_struct = struct.Struct("llHHi")
+
+
+def pack(*events, sec=1, usec=0):
+    return b"".join(event_struct.pack(sec, usec, *event) for event in events)
+
+
+def abs_event(code, value):
+    return (ecodes.EV_ABS, code, value)
+
+
+syn = (ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+
+
+def test_tracker():
+    tracker = SlotTracker(2)
+    assert tracker.codes == (ecodes.ABS_MT_TRACKING_ID, ecodes.ABS_MT_POSITION_X, ecodes.ABS_MT_POSITION_Y)
+    assert tracker.num_slots == 2
+
+    frames = tracker.feed(
+        EventBatch(
+            pack(
+                abs_event(ecodes.ABS_MT_TRACKING_ID, 10),
+                abs_event(ecodes.ABS_MT_POSITION_X, 100),
+                abs_event(ecodes.ABS_MT_POSITION_Y, 200),
+                syn,
+                abs_event(ecodes.ABS_MT_SLOT, 1),
+                abs_event(ecodes.ABS_MT_TRACKING_ID, 11),
+                abs_event(ecodes.ABS_MT_POSITION_X, 300),
+                (ecodes.EV_KEY, ecodes.BTN_TOUCH, 1),
+                syn,
+            )
+        )
+    )
+
+    assert len(frames) == 2
+    assert frames[0].contacts == ((0, 10, 100, 200),)
+    contact = frames[1].contacts[1]
+    assert (contact.slot, contact.tracking_id, contact.position_x, contact.position_y) == (1, 11, 300, 0)
+    assert tracker.slot == 1
+
+
+def test_tracker_release():
+    tracker = SlotTracker(2, [ecodes.ABS_MT_PRESSURE])
+    tracker.feed(pack(abs_event(ecodes.ABS_MT_TRACKING_ID, 1), abs_event(ecodes.ABS_MT_PRESSURE, 5)))
+
+    # Events without a SYN_REPORT update the slots, but produce no frame.
+    assert tracker.contact(0).pressure == 5
+
+    frames = tracker.feed(pack(abs_event(ecodes.ABS_MT_TRACKING_ID, -1), syn, usec=7))
+    assert frames[0].contacts == ()
+    assert frames[0].usec == 7
+
+
+def test_tracker_errors():
+    with raises(ValueError):
+        SlotTracker(0)
+
+    with raises(ValueError):
+        SlotTracker(2, [ecodes.ABS_X])
+
+    with raises(ValueError):
+        SlotTracker(2).feed(b"x")
+
+    with raises(IndexError):
+        SlotTracker(2).contact(2)
+
+
+def test_tracker_load_error(pipe):
+    # The slots of something that is not an input device cannot be loaded.
+    tracker = SlotTracker(2)
+    with raises(OSError):
+        tracker.load(pipe.fd)
+    assert tracker.contact(1).tracking_id == -1
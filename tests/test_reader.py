@@ -0,0 +1,73 @@
+import threading
+import time
+
+from pytest import raises
+
+from evdev import ecodes
+from evdev.reader import DeviceReader
+
+
+def test_read_loop(make_pipe):
+    pipes = [make_pipe(blocking=True) for _ in range(5)]
+    with DeviceReader(pipes, workers=2) as reader:
+        for pipe in pipes:
+            pipe.feed_keys(ecodes.KEY_A, ecodes.KEY_B)
+        batches = {device: batch.codes for device, batch in reader.read_loop(timeout=0.5)}
+
+    assert batches == {pipe: (ecodes.KEY_A, ecodes.KEY_B) for pipe in pipes}
+
+
+def test_handler(make_pipe):
+    pipe = make_pipe(blocking=True)
+    done = threading.Event()
+    threads = []
+
+    def handler(device, batch):
+        threads.append(threading.current_thread())
+        if batch.codes[-1] == ecodes.KEY_Q:
+            raise ValueError("stop")
+        done.set()
+
+    reader = DeviceReader([pipe], handler)
+    reader.start()
+    pipe.feed_keys(ecodes.KEY_A)
+    assert done.wait(1)
+    assert threads[0] is not threading.current_thread()
+
+    # The worker stops on an exception in the handler and stop() re-raises it.
+    pipe.feed_keys(ecodes.KEY_Q)
+    reader._threads[0].join(1)
+    with raises(ValueError):
+        reader.stop()
+
+
+def test_blocking_read_releases_gil(make_pipe):
+    pipe = make_pipe(blocking=True)
+    result = []
+    thread = threading.Thread(target=lambda: result.append(pipe.read_batch()))
+    thread.start()
+    # The reader thread is blocked in read(), which must not hold the GIL.
+    thread.join(0.1)
+    assert thread.is_alive()
+    pipe.feed_keys(ecodes.KEY_A)
+    thread.join(1)
+    assert result[0].codes == (ecodes.KEY_A,)
+
+
+def test_stop_with_full_queue(make_pipe):
+    pipe = make_pipe(blocking=True)
+    reader = DeviceReader([pipe], max_pending=1)
+    reader.start()
+    pipe.feed_keys(ecodes.KEY_A)
+    deadline = time.monotonic() + 1
+    while reader._queue.qsize() < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # The worker reads the next batch and waits for room in the full queue.
+    pipe.feed_keys(ecodes.KEY_B)
+    time.sleep(0.1)
+    stopper = threading.Thread(target=reader.stop, daemon=True)
+    stopper.start()
+    stopper.join(1)
+    assert not stopper.is_alive()
+    assert [batch.codes for device, batch in reader.read_loop(timeout=0)] == [(ecodes.KEY_A,)]
@@ -0,0 +1,208 @@
+import os
+import struct
+
+import pytest
+from pytest import raises
+
+from evdev import _input, ecodes
+from evdev.device import AbsInfo, DeviceInfo
+from evdev.eventio import EVENT_SIZE, EventBatch
+from evdev.events import InputEvent
+from evdev.recording import DeviceDescription, Recording, RecordingError, RecordingWriter
+
+event_struct = struct.Struct("llHHi")
+
+if event_struct.size != EVENT_SIZE:
+    pytest.skip("unexpected input_event layout", allow_module_level=True)
+
+description = DeviceDescription(
+    name="test-py-evdev-recording",
+    phys="usb-0000:00:14.0-1/input0",
+    uniq="",
+    info=DeviceInfo(3, 0x1100, 0x2200, 0x3300),
+    capabilities={ecodes.EV_SYN: [0, 1, 3], ecodes.EV_KEY: [ecodes.KEY_A], ecodes.EV_ABS: [ecodes.ABS_X]},
+    absinfo={ecodes.ABS_X: AbsInfo(0, 0, 255, 0, 0, 0)},
+    input_props=[],
+)
+
+
+def key_taps(count):
+    for i in range(count):
+        yield (i, 100, ecodes.EV_KEY, ecodes.KEY_A, i % 2)
+        yield (i, 100, ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+
+
+def test_roundtrip(tmp_path):
+    path = tmp_path / "session.evrec"
+    events = list(key_taps(100))
+
+    with RecordingWriter(path, description) as writer:
+        writer.write(EventBatch(b"".join(event_struct.pack(*e) for e in events[:50])))
+        writer.write(bytearray(b"".join(event_struct.pack(*e) for e in events[50:150])))
+        writer.write_events(InputEvent(*e) for e in events[150:])
+        assert writer.count == 200
+
+    with Recording(path) as recording:
+        assert recording.description == description
+        assert len(recording) == 200
+        assert [(e.sec, e.usec, e.type, e.code, e.value) for e in recording] == events
+        assert recording.events.codes == tuple(e[3] for e in events)
+        assert [len(batch) for batch in recording.batches(64)] == [64, 64, 64, 8]
+        assert recording.batches(64).__next__().values[:2] == (0, 0)
+
+
+def test_truncated(tmp_path):
+    path = tmp_path / "session.evrec"
+    with open(path, "wb") as file:
+        # A writer that is never closed leaves no index behind.
+        writer = RecordingWriter(file, description)
+        writer.write_events(InputEvent(*e) for e in key_taps(2))
+        file.write(b"\0" * (EVENT_SIZE // 2))
+
+    with Recording(path) as recording:
+        assert len(recording) == 4
+        assert recording.seek(1) == 2
+
+
+def touch_frames(count, rate=120):
+    for i in range(count):
+        usec = i * 1000000 // rate
+        for event in (ecodes.ABS_X, i), (ecodes.ABS_Y, -i):
+            yield (1000 + usec // 1000000, usec % 1000000, ecodes.EV_ABS, *event)
+        yield (1000 + usec // 1000000, usec % 1000000, ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+
+
+@pytest.mark.parametrize("closed", [True, False])
+def test_time_index(tmp_path, closed):
+    path = tmp_path / "session.evrec"
+    events = list(touch_frames(30000))
+    data = b"".join(event_struct.pack(*e) for e in events)
+
+    with open(path, "wb") as file:
+        writer = RecordingWriter(file, description, index_interval=2.0)
+        # Split frames across writes.
+        for offset in range(0, len(data), EVENT_SIZE * 1000):
+            writer.write(data[offset : offset + EVENT_SIZE * 1000])
+        if closed:
+            writer.close()
+        assert len(writer._index) == 125
+
+    with Recording(path) as recording:
+        assert recording._times == [(1000 + i * 2) * 10**9 for i in range(125)]
+        assert recording.start == 1000.0
+        assert recording.end == events[-1][0] + events[-1][1] / 1000000
+
+        assert recording.seek(0) == 0
+        assert recording.seek(1000 + 47.0) == 47 * 120 * 3
+        assert recording.seek(1000 + 47.001) == (47 * 120 + 1) * 3
+        assert recording.seek(2000) == len(events)
+
+        batch = recording.slice(1001, 1002)
+        assert len(batch) == 120 * 3
+        assert batch[0].timestamp() == 1001.0
+        assert batch.values[-3:] == (239, -239, 0)
+
+        frames = list(recording.frames())
+        assert len(frames) == 30000
+        assert all(frame.codes == (ecodes.ABS_X, ecodes.ABS_Y, ecodes.SYN_REPORT) for frame in frames)
+        assert frames[-1].values == (29999, -29999, 0)
+
+        frames = list(recording.frames(1010, 1011))
+        assert [frame.values[0] for frame in frames] == list(range(1200, 1320))
+
+
+def test_incomplete_last_frame(tmp_path):
+    path = tmp_path / "session.evrec"
+    with RecordingWriter(path, description) as writer:
+        writer.write_events(InputEvent(*e) for e in [*key_taps(2), (3, 0, ecodes.EV_KEY, ecodes.KEY_A, 1)])
+
+    with Recording(path) as recording:
+        assert [len(frame) for frame in recording.frames()] == [2, 2, 1]
+
+
+def test_empty(tmp_path):
+    path = tmp_path / "session.evrec"
+    RecordingWriter(path, description).close()
+
+    with Recording(path) as recording:
+        assert len(recording) == 0
+        assert list(recording) == []
+
+
+def test_batches_outlive_recording(tmp_path):
+    path = tmp_path / "session.evrec"
+    with RecordingWriter(path, description) as writer:
+        writer.write_events(InputEvent(*e) for e in key_taps(2))
+
+    recording = Recording(path)
+    batch = recording.events[1:3]
+    recording.close()
+    assert batch.codes == (ecodes.SYN_REPORT, ecodes.KEY_A)
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "session.evrec"
+    path.write_bytes(b"not a recording")
+    with raises(RecordingError):
+        Recording(path)
+
+    with raises(ValueError):
+        RecordingWriter(tmp_path / "other.evrec", description).write(b"\0")
+
+
+def test_delta_encoding(tmp_path):
+    raw, delta = tmp_path / "raw.evrec", tmp_path / "delta.evrec"
+    events = list(touch_frames(30000))
+    data = b"".join(event_struct.pack(*e) for e in events)
+
+    for path, encoding in (raw, "raw"), (delta, "delta"):
+        with RecordingWriter(path, description, index_interval=2.0, encoding=encoding, block_size=1000) as writer:
+            for offset in range(0, len(data), EVENT_SIZE * 700):
+                writer.write(data[offset : offset + EVENT_SIZE * 700])
+
+    assert os.path.getsize(delta) * 5 < os.path.getsize(raw)
+
+    with Recording(raw) as expected, Recording(delta) as recording:
+        assert recording.encoding == "delta"
+        assert len(recording) == len(events)
+        assert bytes(recording.events) == data
+        assert recording.start == expected.start and recording.end == expected.end
+        # Blocks end with a frame.
+        assert all(position % 3 == 0 for position in recording._positions)
+        assert all(len(batch) <= 1002 for batch in recording.batches(4096))
+
+        for timestamp in 0, 1000, 1047.0, 1047.001, 1100.5, 2000:
+            assert recording.seek(timestamp) == expected.seek(timestamp)
+        assert bytes(recording.slice(1001, 1002)) == bytes(expected.slice(1001, 1002))
+        frames = list(recording.frames(1010, 1011))
+        assert [frame.values[0] for frame in frames] == list(range(1200, 1320))
+
+
+def test_delta_values():
+    values = [0, -1, 2**31 - 1, -(2**31), 5, 5]
+    data = b"".join(
+        event_struct.pack(sec, usec, ecodes.EV_ABS, ecodes.ABS_X, value)
+        for (sec, usec), value in zip([(5, 999999), (6, 0), (4, 0), (6, 1), (2**31 - 1, 0), (0, 0)], values)
+    )
+    block = _input.encode_block(data)
+    assert _input.block_header(block)[1:] == (6, 5999999)
+    assert bytes(_input.decode_block(block)) == data
+
+    with raises(ValueError):
+        _input.decode_block(block[:-1])
+
+
+def test_delta_truncated(tmp_path):
+    path = tmp_path / "session.evrec"
+    with open(path, "wb") as file:
+        writer = RecordingWriter(file, description, encoding="delta", block_size=4)
+        writer.write_events(InputEvent(*e) for e in key_taps(10))
+        writer.flush()
+        # The events that were not written out as a block yet are lost.
+        writer.write_events(InputEvent(*e) for e in key_taps(10))
+        assert writer.count == 40
+        file.write(_input.encode_block(event_struct.pack(*next(key_taps(1))))[:-1])
+
+    with Recording(path) as recording:
+        assert len(recording) == 36
+        assert [len(frame) for frame in recording.frames()] == [2] * 18
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+from conftest import event_struct
+from pytest import fixture, raises
+
+from evdev import ecodes
+from evdev.device import DeviceInfo
+from evdev.eventio import EVENT_SIZE, EventBatch
+from evdev.events import InputEvent
+from evdev.recording import DeviceDescription, Recording, RecordingWriter
+from evdev.replay import replay
+
+if event_struct.size != EVENT_SIZE:
+    pytest.skip("unexpected input_event layout", allow_module_level=True)
+
+
+@fixture
+def pipe(make_pipe):
+    # Replays into the write end of a pipe instead of a uinput device.
+    return make_pipe(writer=True)
+
+
+def clicks(count, interval_ms):
+    for i in range(count):
+        sec, usec = divmod(1000 + i * interval_ms * 1000, 1000000)
+        yield InputEvent(sec, usec, ecodes.EV_KEY, ecodes.BTN_LEFT, i % 2)
+        yield InputEvent(sec, usec, ecodes.EV_REL, ecodes.REL_X, i)
+        yield InputEvent(sec, usec, ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+
+
+def test_replay_timing(pipe):
+    start = time.monotonic()
+    stats = replay(pipe, clicks(20, 10), speed=2.0)
+    elapsed = time.monotonic() - start
+
+    # 19 intervals of 10 ms at twice the speed.
+    assert 0.095 <= elapsed < 0.5
+    assert stats.frames == 20 and stats.events == 60
+    assert 0 <= stats.lateness_p50_ns <= stats.lateness_p99_ns <= stats.lateness_max_ns
+
+    received = pipe.received()
+    assert received.codes == tuple(e.code for e in clicks(20, 10))
+    assert received.values[-2] == 19
+
+
+def test_replay_sources(pipe, tmp_path):
+    events = list(clicks(100, 1000))
+    data = b"".join(event_struct.pack(e.sec, e.usec, e.type, e.code, e.value) for e in events)
+
+    path = tmp_path / "session.evrec"
+    description = DeviceDescription("test", "", "", DeviceInfo(3, 1, 1, 1), {}, {}, [])
+    with RecordingWriter(path, description) as writer:
+        writer.write(data)
+
+    with Recording(path) as recording:
+        for source in recording, EventBatch(data), iter(events):
+            start = time.monotonic()
+            stats = replay(pipe, source, speed=None)
+            assert time.monotonic() - start < 0.5
+            assert stats.frames == 100 and stats.lateness_p50_ns is None
+            assert pipe.received().codes == tuple(e.code for e in events)
+
+
+def test_replay_empty(pipe):
+    stats = replay(pipe, [])
+    assert (stats.frames, stats.events, stats.lateness_max_ns) == (0, 0, None)
+
+    with raises(ValueError):
+        replay(pipe, [], speed=0)
@@ -0,0 +1,238 @@
+import os
+import threading
+
+import pytest
+
+from evdev import _input, ecodes
+from evdev.device import InputDevice
+from evdev.eventio import EVENT_SIZE, pack_events
+from evdev.state import DeviceState
+
+capabilities = {
+    ecodes.EV_KEY: [ecodes.KEY_A, ecodes.KEY_B, ecodes.BTN_TOUCH],
+    ecodes.EV_LED: [ecodes.LED_CAPSL],
+    ecodes.EV_ABS: [
+        ecodes.ABS_X,
+        ecodes.ABS_MT_SLOT,
+        ecodes.ABS_MT_POSITION_X,
+        ecodes.ABS_MT_TRACKING_ID,
+    ],
+}
+
+
+def test_update():
+    state = DeviceState(capabilities, num_slots=2)
+    assert state.abs == {ecodes.ABS_X: 0}
+    assert state.slots == [{ecodes.ABS_MT_POSITION_X: 0, ecodes.ABS_MT_TRACKING_ID: -1}] * 2
+
+    state.update(ecodes.EV_KEY, ecodes.KEY_A, 2)
+    state.update(ecodes.EV_ABS, ecodes.ABS_X, 10)
+    state.update(ecodes.EV_ABS, ecodes.ABS_MT_SLOT, 1)
+    state.update(ecodes.EV_ABS, ecodes.ABS_MT_POSITION_X, 20)
+
+    assert state.keys[ecodes.KEY_A] == 1
+    assert state.abs[ecodes.ABS_X] == 10
+    assert state.slot == 1
+    assert state.slots[1][ecodes.ABS_MT_POSITION_X] == 20
+    assert state.slots[0][ecodes.ABS_MT_POSITION_X] == 0
+
+
+def test_update_batch():
+    state = DeviceState(capabilities)
+    batch = pack_events(
+        [
+            (ecodes.EV_KEY, ecodes.KEY_A, 1),
+            (ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+            (ecodes.EV_SYN, ecodes.SYN_DROPPED, 0),
+            (ecodes.EV_KEY, ecodes.KEY_B, 1),
+        ]
+    )
+    assert state.update_batch(batch) == 2
+    assert state.keys[ecodes.KEY_A] == 1
+    assert state.keys[ecodes.KEY_B] == 0
+    assert state.update_batch(batch[:2]) is None
+
+
+def test_update_batch_slots():
+    state = DeviceState(capabilities, num_slots=2)
+    batch = pack_events(
+        [
+            (ecodes.EV_ABS, ecodes.ABS_MT_SLOT, 1),
+            (ecodes.EV_ABS, ecodes.ABS_MT_TRACKING_ID, 4),
+            (ecodes.EV_ABS, ecodes.ABS_MT_POSITION_X, 20),
+            (ecodes.EV_ABS, ecodes.ABS_X, 20),
+            (ecodes.EV_LED, ecodes.LED_CAPSL, 1),
+            (ecodes.EV_SW, ecodes.SW_LID, 1),
+            (ecodes.EV_ABS, ecodes.ABS_MT_SLOT, 5),
+            (ecodes.EV_ABS, ecodes.ABS_MT_POSITION_X, 30),
+            (ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+        ]
+    )
+    assert state.update_batch(batch) is None
+    assert state.slots == [
+        {ecodes.ABS_MT_POSITION_X: 0, ecodes.ABS_MT_TRACKING_ID: -1},
+        {ecodes.ABS_MT_POSITION_X: 20, ecodes.ABS_MT_TRACKING_ID: 4},
+    ]
+    assert state.slot == 5
+    assert state.abs == {ecodes.ABS_X: 20}
+    assert state.active(ecodes.EV_LED) == [ecodes.LED_CAPSL]
+    assert state.active(ecodes.EV_SW) == []
+
+
+def test_changes():
+    before = DeviceState(capabilities, num_slots=2)
+    before.update(ecodes.EV_KEY, ecodes.KEY_A, 1)
+    before.update(ecodes.EV_ABS, ecodes.ABS_MT_TRACKING_ID, 5)
+
+    after = DeviceState(capabilities, num_slots=2)
+    after.update(ecodes.EV_KEY, ecodes.KEY_B, 1)
+    after.update(ecodes.EV_LED, ecodes.LED_CAPSL, 1)
+    after.update(ecodes.EV_ABS, ecodes.ABS_X, 3)
+    after.update(ecodes.EV_ABS, ecodes.ABS_MT_TRACKING_ID, 6)
+    after.update(ecodes.EV_ABS, ecodes.ABS_MT_POSITION_X, 7)
+    after.update(ecodes.EV_ABS, ecodes.ABS_MT_SLOT, 1)
+
+    assert before.changes(after) == [
+        (ecodes.EV_KEY, ecodes.KEY_A, 0),
+        (ecodes.EV_KEY, ecodes.KEY_B, 1),
+        (ecodes.EV_LED, ecodes.LED_CAPSL, 1),
+        (ecodes.EV_ABS, ecodes.ABS_X, 3),
+        (ecodes.EV_ABS, ecodes.ABS_MT_SLOT, 0),
+        (ecodes.EV_ABS, ecodes.ABS_MT_TRACKING_ID, -1),
+        (ecodes.EV_ABS, ecodes.ABS_MT_POSITION_X, 7),
+        (ecodes.EV_ABS, ecodes.ABS_MT_TRACKING_ID, 6),
+        (ecodes.EV_ABS, ecodes.ABS_MT_SLOT, 1),
+    ]
+    assert after.changes(after) == []
+
+    for event in before.changes(after):
+        before.update(*event)
+    assert before.changes(after) == []
+
+
+def test_queries():
+    state = DeviceState(capabilities)
+    state.update(ecodes.EV_KEY, ecodes.KEY_B, 1)
+    state.update(ecodes.EV_KEY, ecodes.BTN_TOUCH, 1)
+    state.update(ecodes.EV_LED, ecodes.LED_CAPSL, 1)
+    state.update(ecodes.EV_ABS, ecodes.ABS_X, -4)
+
+    assert state.is_pressed(ecodes.KEY_B)
+    assert not state.is_pressed(ecodes.KEY_A)
+    assert state.is_on(ecodes.EV_LED, ecodes.LED_CAPSL)
+    assert state.abs_value(ecodes.ABS_X) == -4
+
+    assert state.active(ecodes.EV_KEY) == [ecodes.KEY_B, ecodes.BTN_TOUCH]
+    assert state.active(ecodes.EV_LED) == [ecodes.LED_CAPSL]
+    assert state.active(ecodes.EV_SW) == []
+
+    snapshot = state.snapshot(ecodes.EV_KEY)
+    state.update(ecodes.EV_KEY, ecodes.KEY_B, 0)
+    assert len(snapshot) == ecodes.KEY_CNT
+    assert snapshot[ecodes.KEY_B] == 1
+    assert state.active(ecodes.EV_KEY) == [ecodes.BTN_TOUCH]
+
+
+@pytest.fixture
+def device(pipe):
+    # An InputDevice that tracks state and reads from a pipe instead of a device node.
+    device = InputDevice.__new__(InputDevice)
+    device.fd, device.wfd = pipe.fd, pipe.wfd
+    device._lock = threading.Lock()
+    device._pending = None
+    device._resync = False
+    device.state = DeviceState(capabilities, num_slots=2)
+    return device
+
+
+def feed(device, *events):
+    os.write(device.wfd, bytes(pack_events(events)))
+
+
+def test_read_paths_track_state(device):
+    feed(device, (ecodes.EV_KEY, ecodes.KEY_A, 1), (ecodes.EV_SYN, ecodes.SYN_REPORT, 0))
+    assert device.read_one().code == ecodes.KEY_A
+    assert device.state.is_pressed(ecodes.KEY_A)
+    assert device.read_one().code == ecodes.SYN_REPORT
+    assert device.read_one() is None
+
+    feed(
+        device,
+        (ecodes.EV_KEY, ecodes.KEY_A, 0),
+        (ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+        (ecodes.EV_KEY, ecodes.KEY_B, 1),
+    )
+    frames = list(device.read_frames())
+    assert [frame.codes for frame in frames] == [(ecodes.KEY_A, ecodes.SYN_REPORT)]
+    assert device.state.active(ecodes.EV_KEY) == [ecodes.KEY_B]
+
+    # The incomplete frame is completed by the next read.
+    feed(device, (ecodes.EV_SYN, ecodes.SYN_REPORT, 0))
+    assert [frame.codes for frame in device.read_frames()] == [(ecodes.KEY_B, ecodes.SYN_REPORT)]
+
+    feed(device, (ecodes.EV_ABS, ecodes.ABS_X, 7), (ecodes.EV_SYN, ecodes.SYN_REPORT, 0))
+    buffer = bytearray(EVENT_SIZE * 4)
+    assert device.read_into(buffer) == 2
+    assert device.state.abs_value(ecodes.ABS_X) == 7
+    with pytest.raises(ValueError):
+        device.read_into(bytearray(EVENT_SIZE - 1))
+
+
+@pytest.fixture
+def kernel_state(monkeypatch):
+    # What the ioctls report for the device after the drop.
+    state = {"keys": [ecodes.KEY_B], "abs": {ecodes.ABS_X: 5}}
+
+    def slots(fd, code, num_slots):
+        return [-1 if code == ecodes.ABS_MT_TRACKING_ID else 0] * num_slots
+
+    monkeypatch.setattr(_input, "ioctl_EVIOCG_bits", lambda fd, etype: state["keys"] if etype == ecodes.EV_KEY else [])
+    monkeypatch.setattr(_input, "ioctl_EVIOCGABS", lambda fd, code: (state["abs"].get(code, 0), 0, 0, 0, 0, 0))
+    monkeypatch.setattr(_input, "ioctl_EVIOCGMTSLOTS", slots)
+    return state
+
+
+def test_resync(device, kernel_state):
+    device._resync = True
+
+    # Two events are left in the queue once the first four are read.
+    dropped = [
+        (ecodes.EV_KEY, ecodes.KEY_A, 1),
+        (ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+        (ecodes.EV_SYN, ecodes.SYN_DROPPED, 0),
+        (ecodes.EV_KEY, ecodes.KEY_A, 0),
+        (ecodes.EV_ABS, ecodes.ABS_X, 1),
+        (ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+    ]
+    os.write(device.wfd, b"".join(bytes(pack_events([event], 10, i)) for i, event in enumerate(dropped)))
+
+    batch = device.read_batch(max_events=4)
+    assert list(zip(batch.types, batch.codes, batch.values)) == dropped[:3] + [
+        (ecodes.EV_KEY, ecodes.KEY_A, 0),
+        (ecodes.EV_KEY, ecodes.KEY_B, 1),
+        (ecodes.EV_ABS, ecodes.ABS_X, 5),
+        (ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+    ]
+    # The synthetic events carry the timestamp of the SYN_DROPPED.
+    assert [event.usec for event in batch] == [0, 1, 2, 2, 2, 2, 2]
+    assert device.state.active(ecodes.EV_KEY) == [ecodes.KEY_B]
+    assert device.state.abs_value(ecodes.ABS_X) == 5
+
+    # The events that followed the drop were discarded with it.
+    with pytest.raises(BlockingIOError):
+        device.read_batch()
+
+
+def test_resync_read_one(device, kernel_state):
+    device._resync = True
+    feed(device, (ecodes.EV_SYN, ecodes.SYN_DROPPED, 0), (ecodes.EV_KEY, ecodes.KEY_A, 1))
+
+    events = []
+    while (event := device.read_one()) is not None:
+        events.append((event.type, event.code, event.value))
+    assert events == [
+        (ecodes.EV_SYN, ecodes.SYN_DROPPED, 0),
+        (ecodes.EV_KEY, ecodes.KEY_B, 1),
+        (ecodes.EV_ABS, ecodes.ABS_X, 5),
+        (ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+    ]
@@ -0,0 +1,91 @@
+# Reading from and writing to a device that is shared between threads. These
+# tests run on any build, but are meant for free-threaded ones.
+
+import os
+import select
+import threading
+
+from conftest import event_struct
+
+from evdev import _uinput, ecodes
+
+NUM_THREADS = 4
+NUM_EVENTS = 2000
+
+
+def run_threads(*targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def make_reader(pipe, total, read):
+    """Return a list of results and a reader that appends to it until total items have been read."""
+    results = []
+    lock = threading.Lock()
+
+    def reader():
+        while True:
+            with lock:
+                if sum(map(len, results)) >= total:
+                    return
+            select.select([pipe.fd], [], [], 0.05)
+            try:
+                items = read()
+            except BlockingIOError:
+                continue
+            with lock:
+                results.append(items)
+
+    return results, reader
+
+
+def test_concurrent_read_write(pipe):
+
+    def writer(n):
+        def write():
+            for value in range(NUM_EVENTS):
+                _uinput.write(pipe.wfd, ecodes.EV_MSC, n, value)
+
+        return write
+
+    results, reader = make_reader(pipe, NUM_THREADS * NUM_EVENTS, lambda: list(pipe.read_batch(16)))
+    run_threads(*(writer(n) for n in range(NUM_THREADS)), *([reader] * NUM_THREADS))
+
+    # Every event arrives intact and exactly once.
+    events = [event for batch in results for event in batch]
+    assert all(event.type == ecodes.EV_MSC for event in events)
+    for n in range(NUM_THREADS):
+        assert sorted(event.value for event in events if event.code == n) == list(range(NUM_EVENTS))
+
+
+def test_concurrent_read_frames(pipe):
+
+    def writer():
+        for value in range(NUM_EVENTS):
+            frame = [
+                (0, value, ecodes.EV_REL, ecodes.REL_X, value),
+                (0, value, ecodes.EV_REL, ecodes.REL_Y, value),
+                (0, value, ecodes.EV_SYN, ecodes.SYN_REPORT, 0),
+            ]
+            # Split frames across writes, so that reads see partial frames.
+            data = b"".join(event_struct.pack(*event) for event in frame)
+            os.write(pipe.wfd, data[: event_struct.size])
+            os.write(pipe.wfd, data[event_struct.size :])
+
+    results, reader = make_reader(pipe, NUM_EVENTS, lambda: list(pipe.read_frames(5)))
+    run_threads(writer, *([reader] * NUM_THREADS))
+
+    frames = [frame for batch in results for frame in batch]
+    assert sorted(frame.usec for frame in frames) == list(range(NUM_EVENTS))
+    for frame in frames:
+        assert frame.codes == (ecodes.REL_X, ecodes.REL_Y, ecodes.SYN_REPORT)
+        assert frame.values == (frame.usec, frame.usec, 0)
+
+
+def test_lock_per_instance(make_pipe):
+    first, second = make_pipe(), make_pipe()
+    assert first._lock is first._lock
+    assert first._lock is not second._lock
@@ -1,6 +1,7 @@
 # encoding: utf-8
 import os
 import stat
+import time
 from select import select
 from unittest.mock import patch
 
@@ -8,6 +9,7 @@ import pytest
 from pytest import raises, fixture
 
 from evdev import uinput, ecodes, device, UInputError
+from evdev.recording import DeviceDescription
 
 # -----------------------------------------------------------------------------
 uinput_options = {
@@ -100,6 +102,24 @@ def test_abs_values(c):
         assert c[e.EV_ABS] == list((0, 1))
 
 
+def test_from_description(c):
+    e = ecodes
+    description = DeviceDescription(
+        name=c["name"],
+        phys="",
+        uniq="",
+        info=device.DeviceInfo(c["bustype"], c["vendor"], c["product"], c["version"]),
+        capabilities={e.EV_SYN: [e.EV_SYN, e.EV_KEY, e.EV_ABS], e.EV_KEY: [e.BTN_LEFT], e.EV_ABS: [e.ABS_X]},
+        absinfo={e.ABS_X: device.AbsInfo(0, 10, 200, 0, 0, 0)},
+        input_props=[],
+    )
+
+    with uinput.UInput.from_description(description) as ui:
+        assert device_exists(c["bustype"], c["vendor"], c["product"], c["version"])
+        assert ui.capabilities()[e.EV_ABS] == [(e.ABS_X, device.AbsInfo(0, 10, 200, 0, 0, 0))]
+        assert ui.capabilities()[e.EV_KEY] == [e.BTN_LEFT]
+
+
 def test_write(c):
     with uinput.UInput(**c) as ui:
         d = ui.device
@@ -129,6 +149,54 @@ def test_write(c):
                 break
 
 
+def test_clock(c):
+    with uinput.UInput(**c) as ui:
+        d = device.InputDevice(ui.device.path, clock="monotonic")
+        try:
+            assert d.clock == time.CLOCK_MONOTONIC
+            ui.write(ecodes.EV_KEY, ecodes.KEY_P, 1)
+            ui.syn()
+            select([d], [], [])
+
+            batch = d.read_batch()
+            assert 0 <= d.latency_ns(batch) < 10 * 1000000000
+            assert batch.timestamp_ns() <= time.monotonic_ns()
+        finally:
+            d.close()
+
+
+def test_clock_unknown():
+    # The name is checked before the device is touched.
+    d = device.InputDevice.__new__(device.InputDevice)
+    d.fd = -1
+    with raises(ValueError, match="unknown clock 'tai'"):
+        d.set_clock("tai")
+
+
+def test_event_mask(c):
+    c["events"] = {ecodes.EV_KEY: [ecodes.KEY_P, ecodes.KEY_A], ecodes.EV_REL: [ecodes.REL_X]}
+    with uinput.UInput(**c) as ui:
+        d = device.InputDevice(ui.device.path)
+        try:
+            d.set_event_mask({ecodes.EV_KEY: [ecodes.KEY_A]})
+            assert d.get_event_mask() == {ecodes.EV_KEY: [ecodes.KEY_A]}
+
+            ui.write(ecodes.EV_KEY, ecodes.KEY_P, 1)
+            ui.write(ecodes.EV_KEY, ecodes.KEY_A, 1)
+            ui.write(ecodes.EV_REL, ecodes.REL_X, 10)
+            ui.syn()
+            select([d], [], [])
+            assert d.read_batch().codes == (ecodes.KEY_A, ecodes.SYN_REPORT)
+
+            d.set_event_mask(None)
+            assert d.get_event_mask() == {
+                ecodes.EV_KEY: [ecodes.KEY_P, ecodes.KEY_A],
+                ecodes.EV_REL: [ecodes.REL_X],
+            }
+        finally:
+            d.close()
+
+
 @patch.object(stat, 'S_ISCHR', return_value=False)
 def test_not_a_character_device(ischr_mock, c):
     with pytest.raises(UInputError, match='not a character device file'):
@@ -145,3 +213,50 @@ def test_not_a_character_device_2(stat_mock, ischr_mock, c):
 def test_not_a_character_device_3(stat_mock, ischr_mock, c):
     with pytest.raises(UInputError, match='not a character device file'):
         uinput.UInput(**c)
+
+
+def test_write_array(c):
+    numpy = pytest.importorskip("numpy")
+    from evdev.eventio import event_dtype
+
+    events = numpy.zeros(3, dtype=event_dtype())
+    events[0] = (0, 0, ecodes.EV_KEY, ecodes.KEY_P, 1)
+    events[1] = (0, 0, ecodes.EV_KEY, ecodes.KEY_P, 0)
+    events[2] = (0, 0, ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+
+    with uinput.UInput(**c) as ui:
+        ui.write_array(events)
+        select([ui.device], [], [])
+
+        evs = ui.device.read_array()
+        assert evs["code"].tolist() == [ecodes.KEY_P, ecodes.KEY_P, ecodes.SYN_REPORT]
+        assert evs["value"].tolist() == [1, 0, 0]
+
+
+def test_write_frame(c):
+    with uinput.UInput(**c) as ui:
+        assert ui.write_frame([(ecodes.EV_KEY, ecodes.KEY_P, 1)]) == 2
+        assert ui.write_many([(ecodes.EV_KEY, ecodes.KEY_P, 0), (ecodes.EV_SYN, ecodes.SYN_REPORT, 0)]) == 2
+        select([ui.device], [], [])
+        time.sleep(0.1)
+
+        batch = ui.device.read_batch()
+        assert batch.codes == (ecodes.KEY_P, ecodes.SYN_REPORT, ecodes.KEY_P, ecodes.SYN_REPORT)
+        assert batch.values == (1, 0, 0, 0)
+
+
+def test_enable_events_errors():
+    with raises(TypeError):
+        uinput._uinput.enable_events(0, [(ecodes.EV_KEY, [ecodes.KEY_A])])
+
+    fd = os.open("/dev/null", os.O_RDWR)
+    with raises(ValueError):
+        uinput._uinput.enable_events(fd, {ecodes.EV_KEY: [ecodes.KEY_CNT]})
+    with raises(ValueError):
+        uinput._uinput.enable_events(fd, {ecodes.EV_CNT: []})
+
+    # The ioctls fail on anything but a uinput device, which is closed then.
+    with raises(OSError):
+        uinput._uinput.enable_events(fd, {ecodes.EV_KEY: b"\xff"})
+    with raises(OSError):
+        os.close(fd)